@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+"""Analyse positions given as FEN/EPD lines.
+
+Usage:
+    python analyse.py [FILE] [--workers N] [--chunk-size N] [--best-move-depth N]
+
+Reads FILE (stdin by default) and writes one JSON object per input line to stdout, in input
+order: legal move count, check, status (ongoing, checkmate, stalemate, ...) and optionally the
+best move. Empty lines and lines starting with '#' are skipped.
+"""
+
+import argparse
+import json
+import sys
+
+from engine.analysis import PositionAnalyser
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", help="FEN/EPD file, stdin by default")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="0 = no pool, default = CPU count"
+    )
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument(
+        "--best-move-depth", type=int, default=0, help="search depth, 0 = no search"
+    )
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") if args.file else sys.stdin as lines:
+        positions = (
+            line.strip()
+            for line in lines
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+        analyser = PositionAnalyser(
+            best_move_depth=args.best_move_depth,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        for analysis in analyser.analyse(positions):
+            print(json.dumps(analysis.to_dict()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+
+"""Fixed corpus of positions used by benchmarks.
+
+Positions are given as move sequences from the start position, so the corpus exercises the same
+code paths (history, castling rights, counters) as real games. Changing the corpus invalidates
+stored baselines.
+"""
+
+from typing import Dict, List
+
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.move import Move
+
+CORPUS: Dict[str, List[str]] = {
+    "start": [],
+    "open_game": "e2e4 e7e5 g1f3 b8c6".split(),
+    "ruy_lopez": "e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4 g8f6 e1g1 f8e7".split(),
+    "sicilian": "e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6 c1e3 e7e5".split(),
+    "queens_gambit": (
+        "d2d4 d7d5 c2c4 e7e6 b1c3 g8f6 c1g5 f8e7 e2e3 e8g8 g1f3 b8d7 a1c1 c7c6"
+    ).split(),
+    "open_middlegame": (
+        "e2e4 e7e5 g1f3 b8c6 f1c4 f8c5 c2c3 g8f6 d2d4 e5d4 c3d4 c5b4 b1c3 f6e4 "
+        "e1g1 e4c3 b2c3 b4c3 d1b3 d7d5 c4d5 e8g8"
+    ).split(),
+    "check": "e2e4 e7e5 f1c4 d7d6 c4f7".split(),
+    "queen_mate": "e2e4 f7f6 d2d4 g7g5 d1h5".split(),
+    "fools_mate": "f2f3 e7e5 g2g4 d8h4".split(),
+    "opposite_castling": (
+        "e2e4 d7d5 e4d5 d8d5 b1c3 d5a5 d2d4 c7c6 g1f3 c8f5 f1c4 e7e6 c1d2 a5c7 "
+        "d1e2 f8b4 e1c1 b8d7 c3e4 b4d2 d1d2 f5e4 e2e4 g8f6 e4e2 e8c8"
+    ).split(),
+}
+
+
+def corpus_games() -> Dict[str, Game]:
+    """Return games reached by replaying every corpus line. Illegal lines raise ValueError."""
+
+    games = {}
+    for name, line in CORPUS.items():
+        game = Game.create_start_game()
+        for text in line:
+            move = Move.from_uci(text)
+            if move not in GameLogic.legal_moves(game):
+                raise ValueError(f"Corpus line {name!r}: illegal move {text}.")
+            game = GameLogic.make_move(move, game)
+        games[name] = game
+    return games
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+
+"""Guard engine import latency.
+
+Every measurement runs in a fresh interpreter, because imports are cached per process.
+
+Usage:
+    python -m benchmarks.import_time [--repeat 7] [--max-ms 150]
+
+Exit code is 1 if the median import time exceeds --max-ms, or if importing the engine pulls in
+PyQt5 or builds hash keys.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import engine.logic, engine.position_cache, gui.light_chess_app
+elapsed = time.perf_counter() - start
+from entities.zobrist import Zobrist
+print(json.dumps({
+    "ms": elapsed * 1000,
+    "pyqt_imported": "PyQt5" in sys.modules,
+    "zobrist_loaded": Zobrist.is_loaded(),
+}))
+"""
+
+
+def measure(repeat: int) -> List[dict]:
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            cwd=_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--max-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    median_ms = statistics.median(result["ms"] for result in results)
+    report = {
+        "benchmark": "import_time",
+        "median_ms": round(median_ms, 3),
+        "max_ms": args.max_ms,
+        "pyqt_imported": any(result["pyqt_imported"] for result in results),
+        "zobrist_loaded": any(result["zobrist_loaded"] for result in results),
+    }
+    print(json.dumps(report))
+    failed = (
+        median_ms > args.max_ms or report["pyqt_imported"] or report["zobrist_loaded"]
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
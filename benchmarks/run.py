@@ -0,0 +1,298 @@
+#!/usr/bin/python3
+
+"""Micro and macro benchmarks of the engine on a fixed corpus of positions.
+
+Usage:
+    python -m benchmarks.run [--filter SUBSTRING] [--repeat 5] [--min-time 0.05]
+                             [--output results.json]
+                             [--baseline benchmarks/baseline.json] [--tolerance 0.15]
+                             [--save-baseline]
+
+Results are printed as JSON (time per operation in nanoseconds). If a baseline is given, every
+benchmark is compared with it and the exit code is 1 if any of them is slower than
+baseline * (1 + tolerance). Baselines are machine specific: regenerate them with
+--save-baseline on the machine which runs the comparison.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.corpus import corpus_games
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.piece_moves import PieceMoves
+from engine.positions_under_threat import PositionsUnderThreat
+from entities.board import Board
+from entities.colour import Colour
+from entities.pieces import PieceType
+from entities.position import Position
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+# Benchmark setup takes corpus games and returns a callable which does the work once and returns
+# the number of operations done.
+Benchmark = Callable[[Dict[str, Game]], Callable[[], int]]
+
+_BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(setup: Benchmark) -> Benchmark:
+        _BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _pieces(games: Dict[str, Game]) -> List[Tuple[Position, object, Board]]:
+    """Return (position, piece, board) for every piece of every corpus position."""
+
+    pieces = []
+    for game in games.values():
+        for colour in [Colour.WHITE, Colour.BLACK]:
+            for pos in game.board.get_positions_for_side(colour):
+                pieces.append((pos, game.board.get_piece(pos), game.board))
+    return pieces
+
+
+@benchmark("board.set_piece")
+def _set_piece(games):
+    pieces = _pieces(games)
+
+    def run():
+        board = Board()
+        for pos, piece, _ in pieces:
+            board.set_piece(pos, piece)
+        return len(pieces)
+
+    return run
+
+
+@benchmark("board.get_piece")
+def _get_piece(games):
+    boards = [game.board for game in games.values()]
+    positions = [Position(x, y) for x in range(8) for y in range(8)]
+
+    def run():
+        for board in boards:
+            for pos in positions:
+                board.get_piece(pos)
+        return len(boards) * len(positions)
+
+    return run
+
+
+def _threat_benchmark(piece_type: PieceType, method: Callable) -> Benchmark:
+    def setup(games):
+        pieces = [
+            (pos, piece.colour, board)
+            for pos, piece, board in _pieces(games)
+            if piece.type == piece_type
+        ]
+
+        def run():
+            for pos, colour, board in pieces:
+                method(pos, colour, board)
+            return len(pieces)
+
+        return run
+
+    return setup
+
+
+for _type, _method in [
+    (PieceType.KING, PositionsUnderThreat.positions_under_king_threat),
+    (PieceType.QUEEN, PositionsUnderThreat.positions_under_queen_threat),
+    (PieceType.BISHOP, PositionsUnderThreat.positions_under_bishop_threat),
+    (PieceType.KNIGHT, PositionsUnderThreat.positions_under_knight_threat),
+    (PieceType.ROOK, PositionsUnderThreat.positions_under_rook_threat),
+    (PieceType.PAWN, PositionsUnderThreat.positions_under_pawn_threat),
+]:
+    benchmark(f"threat.positions_under_{_type.name.lower()}_threat")(
+        _threat_benchmark(_type, _method)
+    )
+
+
+@benchmark("piece_moves.all_moves")
+def _all_moves(games):
+    def run():
+        for game in games.values():
+            PieceMoves.all_moves(game)
+        return len(games)
+
+    return run
+
+
+@benchmark("logic.make_move")
+def _make_move(games):
+    # First few legal moves of every position.
+    cases = [
+        (move, game)
+        for game in games.values()
+        for move in list(GameLogic.legal_moves(game))[:4]
+    ]
+
+    def run():
+        for move, game in cases:
+            GameLogic.make_move(move, game)
+        return len(cases)
+
+    return run
+
+
+@benchmark("logic.is_check")
+def _is_check(games):
+    def run():
+        for game in games.values():
+            GameLogic.is_check(game.board, game.turn)
+        return len(games)
+
+    return run
+
+
+@benchmark("logic.is_mate")
+def _is_mate(games):
+    def run():
+        for game in games.values():
+            GameLogic.is_mate(game)
+        return len(games)
+
+    return run
+
+
+@benchmark("macro.game_status")
+def _game_status(games):
+    def run():
+        for game in games.values():
+            GameLogic.game_status(game)
+        return len(games)
+
+    return run
+
+
+@benchmark("macro.legal_moves")
+def _legal_moves(games):
+    def run():
+        for game in games.values():
+            list(GameLogic.legal_moves(game))
+        return len(games)
+
+    return run
+
+
+@benchmark("macro.replay_corpus")
+def _replay_corpus(_games):
+    def run():
+        return len(corpus_games())
+
+    return run
+
+
+def measure(run: Callable[[], int], repeat: int, min_time: float) -> Dict:
+    """Time <run>. Every sample repeats it until <min_time> seconds pass."""
+
+    samples = []
+    for _ in range(repeat):
+        ops = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time or ops == 0:
+            ops += run()
+            elapsed = time.perf_counter() - start
+        samples.append(elapsed * 1e9 / ops)
+    return {
+        "ns_per_op": round(min(samples), 1),
+        "median_ns_per_op": round(statistics.median(samples), 1),
+        "samples": repeat,
+    }
+
+
+def run_benchmarks(name_filter: str, repeat: int, min_time: float) -> Dict:
+    games = corpus_games()
+    results = {}
+    for name, setup in _BENCHMARKS.items():
+        if name_filter in name:
+            results[name] = measure(setup(games), repeat, min_time)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "corpus_size": len(games),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> Dict[str, Dict]:
+    """Compare results with baseline. Status is 'regression', 'improvement' or 'ok'."""
+
+    comparison = {}
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["ns_per_op"] / base["ns_per_op"]
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 - tolerance:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[name] = {"ratio": round(ratio, 3), "status": status}
+    return comparison
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="run benchmarks containing it")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--output", help="write JSON results to the file")
+    parser.add_argument(
+        "--baseline", help=f"compare with baseline, e.g. {DEFAULT_BASELINE}"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help=f"write results to --baseline (default {DEFAULT_BASELINE})",
+    )
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.filter, args.repeat, args.min_time)
+    exit_code = 0
+    if args.save_baseline:
+        with open(
+            args.baseline or DEFAULT_BASELINE, "w", encoding="utf-8"
+        ) as baseline_file:
+            json.dump(current, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        current["comparison"] = compare(current, baseline, args.tolerance)
+        current["tolerance"] = args.tolerance
+        for name, result in current["comparison"].items():
+            print(
+                f"{name:48} x{result['ratio']:<6} {result['status']}", file=sys.stderr
+            )
+            if result["status"] == "regression":
+                exit_code = 1
+
+    text = json.dumps(current, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(text + "\n")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import functools
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from engine.fen import Fen
+from engine.game import Game
+from engine.game_collection import GameCollection
+from engine.logic import GameLogic
+from engine.search import Search
+from entities.game_status import GameStatus
+from entities.move import Move
+
+PositionInput = Union[str, Game]
+
+
+class PositionAnalysis(NamedTuple):
+    """Analysis of one position. <error> is set instead of other fields if the position
+    cannot be parsed or analysed.
+    """
+
+    index: int
+    fen: str
+    legal_moves: int = 0
+    is_check: bool = False
+    status: Optional[GameStatus] = None
+    best_move: Optional[Move] = None
+    score: Optional[int] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "fen": self.fen,
+            "legal_moves": self.legal_moves,
+            "check": self.is_check,
+            "status": self.status.name.lower() if self.status is not None else None,
+            "best_move": self.best_move.to_uci() if self.best_move else None,
+            "score": self.score,
+            "error": self.error,
+        }
+
+
+class PositionAnalyser:
+    """Analysis of large collections of positions.
+
+    Positions are split into chunks which are analysed by a process pool. At most
+    <max_chunks_in_flight> chunks are submitted at any time, so memory stays bounded however
+    long the input is, and results are yielded in input order.
+    """
+
+    def __init__(
+        self,
+        best_move_depth: int = 0,
+        workers: Optional[int] = None,
+        chunk_size: int = 32,
+        max_chunks_in_flight: Optional[int] = None,
+    ) -> None:
+        """<best_move_depth> = 0 disables search. <workers> = 0 analyses in the calling process,
+        None uses one process per CPU.
+        """
+
+        self._best_move_depth = best_move_depth
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._max_chunks_in_flight = max_chunks_in_flight
+
+    def analyse(self, positions: Iterable[PositionInput]) -> Iterator[PositionAnalysis]:
+        for analysed in GameCollection.map_chunks(
+            functools.partial(_analyse_chunk, best_move_depth=self._best_move_depth),
+            enumerate(positions),
+            self._chunk_size,
+            self._workers,
+            self._max_chunks_in_flight,
+        ):
+            yield from analysed
+
+    @staticmethod
+    def analyse_position(
+        position: PositionInput, index: int = 0, best_move_depth: int = 0
+    ) -> PositionAnalysis:
+        """Analyse one position given as FEN/EPD line or Game."""
+
+        fen = position if isinstance(position, str) else ""
+        try:
+            game = Fen.parse(position) if isinstance(position, str) else position
+            fen = fen or Fen.dump(game)
+            legal_moves = list(GameLogic.legal_moves(game))
+            is_check = GameLogic.is_check(game.board, game.turn)
+            status = GameLogic.game_status(game)
+            best_move = score = None
+            if best_move_depth > 0 and legal_moves:
+                result = Search().search(game, best_move_depth)
+                best_move, score = result.best_move, result.score
+            return PositionAnalysis(
+                index, fen.strip(), len(legal_moves), is_check, status, best_move, score
+            )
+        except (ValueError, IndexError, KeyError) as exc:
+            return PositionAnalysis(index, fen.strip(), error=str(exc))
+
+
+def _analyse_chunk(
+    chunk: List[Tuple[int, PositionInput]], best_move_depth: int
+) -> List[PositionAnalysis]:
+    return [
+        PositionAnalyser.analyse_position(position, index, best_move_depth)
+        for index, position in chunk
+    ]
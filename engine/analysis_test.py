@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.analysis import PositionAnalyser
+from engine.fen import START_FEN
+from engine.game import Game
+from entities.game_status import GameStatus
+from entities.move import Move
+
+POSITIONS = [
+    START_FEN,
+    "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1",
+    "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3",
+    "garbage",
+    "r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4 bm Qxf7#;",
+]
+
+
+class TestPositionAnalyser(unittest.TestCase):
+    """Test of PositionAnalyser class."""
+
+    def check_results(self, results):
+        assert [result.index for result in results] == list(range(len(POSITIONS)))
+        assert results[0].legal_moves == 20
+        assert results[0].status == GameStatus.ONGOING
+        assert results[1].status == GameStatus.STALEMATE
+        assert results[2].status == GameStatus.CHECKMATE
+        assert results[2].is_check
+        assert results[3].error is not None
+        assert results[4].legal_moves == 43
+
+    def test_analyse_in_process(self):
+        """Test of analyse() method without process pool."""
+
+        analyser = PositionAnalyser(workers=0, chunk_size=2)
+        self.check_results(list(analyser.analyse(iter(POSITIONS))))
+
+    def test_analyse_with_pool(self):
+        """Test of analyse() method with process pool: results keep input order."""
+
+        analyser = PositionAnalyser(workers=2, chunk_size=1, max_chunks_in_flight=2)
+        self.check_results(list(analyser.analyse(iter(POSITIONS))))
+
+    def test_analyse_position(self):
+        """Test of analyse_position() method with Game and best move."""
+
+        result = PositionAnalyser.analyse_position(Game.create_start_game())
+        assert result.fen == START_FEN
+        result = PositionAnalyser.analyse_position(POSITIONS[4], best_move_depth=1)
+        assert result.best_move == Move.from_uci("h5f7")
+        assert result.to_dict()["best_move"] == "h5f7"
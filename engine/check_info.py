@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+from engine.positions_under_threat import PositionsUnderThreat
+from entities.board import Board
+from entities.colour import Colour
+from entities.pieces import PieceType
+from entities.position import Position
+
+
+class CheckInfo(NamedTuple):
+    """Check and pin information of <colour> side, computed once per position.
+
+    <checkers> are enemy pieces giving check. With a single checker a piece other than the
+    king must move to one of <block_positions> (the checker or a position between it and the
+    king). <pins> maps a pinned piece to the positions it may move to without exposing the
+    king: the line between the king and the pinner, pinner included.
+    """
+
+    colour: Colour
+    king: Position
+    checkers: List[Position]
+    block_positions: FrozenSet[Position]
+    pins: Dict[Position, FrozenSet[Position]]
+
+    @staticmethod
+    def of(board: Board, colour: Colour) -> CheckInfo:
+        king = board.king_position(colour)
+        enemy = Colour.change_colour(colour)
+        checkers = PositionsUnderThreat.attackers(king, enemy, board)
+        block_positions: FrozenSet[Position] = frozenset()
+        if len(checkers) == 1:
+            block_positions = frozenset([checkers[0]])
+        pins = {}
+        geometry = board.geometry
+        for rays, slider_type in [
+            (geometry.rook_rays[king], PieceType.ROOK),
+            (geometry.bishop_rays[king], PieceType.BISHOP),
+        ]:
+            for ray in rays:
+                pinned: Optional[Position] = None
+                for index, pos in enumerate(ray):
+                    piece = board.get_piece(pos)
+                    if piece is None:
+                        continue
+                    if piece.colour == colour:
+                        if pinned is not None:
+                            break
+                        pinned = pos
+                        continue
+                    if piece.type in [slider_type, PieceType.QUEEN]:
+                        line = frozenset(ray[: index + 1])
+                        if pinned is not None:
+                            pins[pinned] = line
+                        elif len(checkers) == 1:
+                            # The only checker is this slider: block the line or capture it.
+                            block_positions = line
+                    break
+        return CheckInfo(colour, king, checkers, block_positions, pins)
+
+    def is_check(self) -> bool:
+        return bool(self.checkers)
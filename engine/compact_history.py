@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import gc
+import sys
+from array import array
+from enum import Enum
+from types import FunctionType, ModuleType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from engine.fen import Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.move_history import MoveHistory
+from entities.board_geometry import BoardGeometry
+from entities.move import Move
+
+
+class _PackedMoves(Sequence):
+    """Moves packed[start:stop] (see Move.pack()) unpacked on access. The array is only
+    appended to, so the view never changes.
+    """
+
+    __slots__ = ["_packed", "_range"]
+
+    def __init__(self, packed: array, start: int, stop: int) -> None:
+        self._packed = packed
+        self._range = range(start, stop)
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Move.unpack(self._packed[i]) for i in self._range[index]]
+        return Move.unpack(self._packed[self._range[index]])
+
+
+class CompactHistory(Sequence):
+    """Record of a game with random access to the position at any ply.
+
+    Moves are stored packed (see Move.pack()) in a 32-bit array, position hashes in a 64-bit
+    array, and every <checkpoint_interval> plies the position is stored as a FEN line.
+    position_at() restores the nearest checkpoint at or before the ply and replays at most
+    <checkpoint_interval> - 1 moves, so jumping anywhere in a long game costs the same. A
+    record takes about two dozen bytes per ply and one position, a small fraction of a list
+    of moves.
+
+    Restored games have the full history of moves, the castling rights, the halfmove clock
+    and the position counts, so game_status() detects repetitions at any ply. History is a
+    view of the packed moves (see MoveHistory.over()), so no move is kept twice. Counts are
+    rebuilt from the hashes of at most the last 100 plies: positions before the last capture
+    or pawn move cannot repeat.
+    """
+
+    def __init__(
+        self, start: Optional[Game] = None, checkpoint_interval: int = 16
+    ) -> None:
+        """Start a record from <start> position, the standard start position by default."""
+
+        if checkpoint_interval <= 0:
+            raise ValueError(
+                f"Checkpoint interval must be positive, got {checkpoint_interval}."
+            )
+        start = start if start is not None else Game.create_start_game()
+        self._interval = checkpoint_interval
+        self._start_counts = start.position_counts
+        # Moves of the start position history followed by the recorded ones.
+        self._packed = array("I", [move.pack() for move in start.history_moves])
+        self._start_length = len(self._packed)
+        # Hash of the position after every ply, from ply 0.
+        self._hashes = array("Q", [GameLogic.position_hash(start)])
+        self._checkpoints: List[str] = [Fen.dump(start)]
+        # The last restored position, continued by the next call if possible.
+        self._last: Tuple[int, Game] = (
+            0,
+            start._replace(history_moves=self._history(0)),
+        )
+
+    @staticmethod
+    def of_moves(
+        moves: Sequence[Move],
+        start: Optional[Game] = None,
+        checkpoint_interval: int = 16,
+    ) -> CompactHistory:
+        history = CompactHistory(start, checkpoint_interval)
+        for move in moves:
+            history.append(move)
+        return history
+
+    def append(self, move: Move) -> None:
+        """Make <move> in the last position. The move is not checked."""
+
+        game = GameLogic.make_move(move, self.game())
+        self._packed.append(move.pack())
+        self._hashes.append(GameLogic.position_hash(game))
+        if len(self) % self._interval == 0:
+            self._checkpoints.append(Fen.dump(game))
+        self._last = (len(self), game._replace(history_moves=self._history(len(self))))
+
+    def game(self) -> Game:
+        """Return the last position."""
+
+        return self.position_at(len(self))
+
+    def position_at(self, ply: int) -> Game:
+        """Return game after the first <ply> moves, 0 <= ply <= len()."""
+
+        if not 0 <= ply <= len(self):
+            raise IndexError(f"ply {ply} is out of range 0..{len(self)}")
+        if self._last[0] == ply:
+            return self._last[1]
+        checkpoint = ply // self._interval
+        start_ply = checkpoint * self._interval
+        if start_ply <= self._last[0] <= ply:
+            start_ply, game = self._last
+        else:
+            game = Fen.parse(self._checkpoints[checkpoint])
+            game = game._replace(
+                history_moves=self._history(start_ply),
+                position_counts=self._position_counts(start_ply, game.halfmove_clock),
+            )
+        for index in range(start_ply, ply):
+            game = GameLogic.make_move(self[index], game)
+        game = game._replace(history_moves=self._history(ply))
+        self._last = (ply, game)
+        return game
+
+    def _history(self, ply: int) -> MoveHistory:
+        """Return history of moves of the position after <ply> moves."""
+
+        return MoveHistory.over(_PackedMoves(self._packed, 0, self._start_length + ply))
+
+    def _position_counts(self, ply: int, halfmove_clock: int) -> Dict[int, int]:
+        """Return position counts of the position after <ply> moves (see Game)."""
+
+        first = max(ply - min(halfmove_clock, 100), 0)
+        counts: Dict[int, int] = {}
+        if first == 0 and self._start_counts is not None:
+            counts = dict(self._start_counts)
+            first = 1
+        for position_hash in self._hashes[first : ply + 1]:
+            counts[position_hash] = counts.get(position_hash, 0) + 1
+        return counts
+
+    def memory_size(self) -> int:
+        """Return approximate number of bytes taken by the record: moves, hashes,
+        checkpoints and the last restored position. Tables shared by all boards of a size
+        are not counted.
+        """
+
+        return _deep_size(self)
+
+    def __len__(self) -> int:
+        return len(self._packed) - self._start_length
+
+    def __getitem__(self, index):
+        return _PackedMoves(self._packed, self._start_length, len(self._packed))[index]
+
+
+def _deep_size(root: object) -> int:
+    """Return size of <root> and all objects reachable from it except classes, functions,
+    modules, enumeration members and board geometries (see BoardGeometry.of()).
+    """
+
+    seen = set()
+    size = 0
+    pending = [root]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(
+            obj, (type, ModuleType, FunctionType, Enum, BoardGeometry)
+        ):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return size
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.compact_history import CompactHistory
+from engine.fen import Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.game_status import GameStatus
+from entities.move import Move
+from entities.pieces import PieceType
+
+# Game with castling, en passant and promotion.
+MOVES = (
+    "e2e4 g8f6 e4e5 d7d5 e5d6 e7e6 g1f3 f8e7 f1e2 e8g8 e1g1 a7a6 d6c7 d8d7 c7b8n a8b8"
+).split()
+
+
+class TestCompactHistory(unittest.TestCase):
+    """Test of CompactHistory class."""
+
+    def setUp(self) -> None:
+        """Replay MOVES keeping every position."""
+
+        self.moves = [Move.from_uci(text) for text in MOVES]
+        self.games = [Game.create_start_game()]
+        for move in self.moves:
+            self.games.append(GameLogic.make_move(move, self.games[-1]))
+
+    def test_position_at(self):
+        """Test of position_at() method: the same positions as replay gives, in any order."""
+
+        history = CompactHistory.of_moves(self.moves, checkpoint_interval=3)
+        assert len(history) == len(self.moves)
+        assert list(history) == self.moves
+        for ply in [7, 16, 0, 5, 6, 15, 9, 10, 3]:
+            game = history.position_at(ply)
+            expected = self.games[ply]
+            assert GameLogic.position_hash(game) == GameLogic.position_hash(expected)
+            assert GameLogic.castling_rights(game) == GameLogic.castling_rights(
+                expected
+            )
+            assert game.halfmove_clock == expected.halfmove_clock
+            assert list(game.history_moves) == self.moves[:ply]
+        self.assertRaises(IndexError, history.position_at, len(self.moves) + 1)
+
+    def test_packing(self):
+        """Test of packed moves: promotion is kept."""
+
+        history = CompactHistory.of_moves(self.moves)
+        assert history[14].promotion == PieceType.KNIGHT
+        assert history[-1] == self.moves[-1]
+        assert history[2:4] == self.moves[2:4]
+
+    def test_memory_size(self):
+        """Test of memory_size() method: a record grows by about two dozen bytes per ply."""
+
+        moves = [Move.from_uci(text) for text in "g1f3 g8f6 f3g1 f6g8".split()]
+        short = CompactHistory.of_moves(moves * 50)
+        long = CompactHistory.of_moves(moves * 100)
+        assert long.game().history_moves == moves * 100
+        assert 0 < long.memory_size() - short.memory_size() < 30 * 200
+
+    def test_start_position(self):
+        """Test of position_at() method for a record starting from FEN."""
+
+        start = Fen.parse("4k3/8/8/8/3p4/8/4P3/4K3 w - - 0 1")
+        moves = [Move.from_uci(text) for text in ["e2e4", "d4e3", "e1e2"]]
+        history = CompactHistory.of_moves(moves, start, checkpoint_interval=1)
+        game = history.position_at(2)
+        assert game.board.get_piece(moves[1].finish).type == PieceType.PAWN
+        assert game.board.is_position_empty(moves[0].finish)
+        assert history.position_at(0).board.zobrist_key == start.board.zobrist_key
+        assert history.game().history_moves[-1] == moves[-1]
+
+    def test_repetition(self):
+        """Test of position_at() method: position counts are restored."""
+
+        moves = [
+            Move.from_uci(text)
+            for text in "g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1 f6g8 e2e4 e7e5".split()
+        ]
+        history = CompactHistory.of_moves(moves, checkpoint_interval=3)
+        games = [Game.create_start_game()]
+        for move in moves:
+            games.append(GameLogic.make_move(move, games[-1]))
+        for ply in [8, 2, 10, 7, 0, 9]:
+            game = history.position_at(ply)
+            if games[ply].position_counts is not None:
+                assert game.position_counts == games[ply].position_counts
+            assert GameLogic.repetition_count(game) == GameLogic.repetition_count(
+                games[ply]
+            )
+            assert GameLogic.game_status(game) == GameLogic.game_status(games[ply])
+        assert (
+            GameLogic.game_status(history.position_at(8))
+            == GameStatus.THREEFOLD_REPETITION
+        )
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Optional
+
+from engine.game import Game
+from engine.pawn_structure import PawnHashTable
+from entities.board import Board
+from entities.colour import Colour
+from entities.pieces import PieceType
+
+
+class Evaluation:
+    """Static evaluation of a position in centipawns."""
+
+    PIECE_VALUES = {
+        PieceType.KING: 0,
+        PieceType.QUEEN: 900,
+        PieceType.ROOK: 500,
+        PieceType.BISHOP: 330,
+        PieceType.KNIGHT: 320,
+        PieceType.PAWN: 100,
+    }
+
+    @staticmethod
+    def evaluate(game: Game) -> int:
+        """Return score from the point of view of <game.turn> side."""
+
+        score = Evaluation.material(game.board, Colour.WHITE)
+        return score if game.turn == Colour.WHITE else -score
+
+    @staticmethod
+    def material(board: Board, colour: Colour) -> int:
+        """Return material balance from the point of view of <colour> side."""
+
+        score = 0
+        for side in [Colour.WHITE, Colour.BLACK]:
+            sign = 1 if side == colour else -1
+            for pos in board.get_positions_for_side(side):
+                score += sign * Evaluation.PIECE_VALUES[board.get_piece(pos).type]
+        return score
+
+
+class StructureEvaluation:
+    """Material and pawn structure (see PawnStructure) in centipawns. Instances are callable
+    like Evaluation.evaluate and can be passed to Search. Pawn terms are cached in
+    <pawn_table>, which may be shared between evaluations.
+    """
+
+    def __init__(self, pawn_table: Optional[PawnHashTable] = None) -> None:
+        self.pawn_table = pawn_table if pawn_table is not None else PawnHashTable()
+
+    def __call__(self, game: Game) -> int:
+        """Return score from the point of view of <game.turn> side."""
+
+        score = Evaluation.material(game.board, Colour.WHITE) + self.pawn_table.score(
+            game.board
+        )
+        return score if game.turn == Colour.WHITE else -score
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Optional
+
+from engine.evaluation import Evaluation
+from engine.positions_under_threat import PositionsUnderThreat
+from entities.board import Board
+from entities.colour import Colour
+from entities.move import Move
+from entities.pieces import Piece, PieceType
+from entities.position import Position
+
+# Value of the king in exchanges: the king may take last only, nothing can be worth losing it.
+KING_EXCHANGE_VALUE = 20000
+
+
+class StaticExchange:
+    """Static exchange evaluation (SEE): outcome of a capture sequence on one position.
+
+    Both sides capture on the target position with their least valuable attacker and may stop
+    whenever continuing would lose material. Attackers are taken from PositionsUnderThreat,
+    pieces which already captured are removed, so x-ray attackers behind them join in.
+    No moves are made. Pins and checks are ignored.
+    """
+
+    @staticmethod
+    def piece_value(piece_type: PieceType) -> int:
+        if piece_type == PieceType.KING:
+            return KING_EXCHANGE_VALUE
+        return Evaluation.PIECE_VALUES[piece_type]
+
+    @staticmethod
+    def captured_piece(board: Board, move: Move) -> Optional[Piece]:
+        """Return piece captured by <move>, including pawn captured en passant."""
+
+        victim = board.get_piece(move.finish)
+        attacker = board.get_piece(move.start)
+        if (
+            victim is None
+            and attacker is not None
+            and attacker.type == PieceType.PAWN
+            and move.start.x != move.finish.x
+        ):
+            return board.get_piece(Position(move.finish.x, move.start.y))
+        return victim
+
+    @staticmethod
+    def evaluate(board: Board, move: Move) -> int:
+        """Return material won by the side making <move> (negative if it loses material)
+        when the exchange on <move.finish> is played out.
+        """
+
+        attacker = board.get_piece(move.start)
+        victim = StaticExchange.captured_piece(board, move)
+        gains = [StaticExchange.piece_value(victim.type) if victim is not None else 0]
+        piece_type = attacker.type
+        if move.promotion is not None:
+            gains[0] += StaticExchange.piece_value(
+                move.promotion
+            ) - StaticExchange.piece_value(PieceType.PAWN)
+            piece_type = move.promotion
+        # Value of the piece standing on the target position after the last capture.
+        target_value = StaticExchange.piece_value(piece_type)
+        removed = {move.start}
+        if victim is not None and board.get_piece(move.finish) is None:
+            removed.add(Position(move.finish.x, move.start.y))
+        colour = Colour.change_colour(attacker.colour)
+        while True:
+            attackers = PositionsUnderThreat.attackers(
+                move.finish, colour, board, removed
+            )
+            if not attackers:
+                break
+            attacker_pos = min(
+                attackers,
+                key=lambda pos: StaticExchange.piece_value(board.get_piece(pos).type),
+            )
+            gains.append(target_value - gains[-1])
+            target_value = StaticExchange.piece_value(
+                board.get_piece(attacker_pos).type
+            )
+            removed.add(attacker_pos)
+            colour = Colour.change_colour(colour)
+
+        # Every side captures only if it does not lose material compared to stopping.
+        for index in range(len(gains) - 1, 0, -1):
+            gains[index - 1] = -max(-gains[index - 1], gains[index])
+        return gains[0]
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.exchange import StaticExchange
+from engine.fen import Fen
+from entities.move import Move
+
+
+class TestStaticExchange(unittest.TestCase):
+    """Test of StaticExchange class."""
+
+    def test_undefended_capture(self):
+        """Capture of an undefended piece wins the whole piece."""
+
+        board = Fen.parse("4k3/8/8/3p4/8/8/3Q4/4K3 w - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("d2d5")) == 100
+
+    def test_defended_capture(self):
+        """Queen taking a defended pawn loses the queen for a pawn."""
+
+        board = Fen.parse("4k3/8/2p5/3p4/8/8/3Q4/4K3 w - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("d2d5")) == 100 - 900
+
+    def test_x_ray(self):
+        """Rook behind the first rook recaptures: exchange of pawn and rook for rook."""
+
+        board = Fen.parse("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("d2d5")) == 100
+        board = Fen.parse("3rk3/3r4/8/3p4/8/8/3R4/4K3 w - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("d2d5")) == 100 - 500
+
+    def test_king_recapture(self):
+        """King recaptures only on a position which is not defended."""
+
+        board = Fen.parse("8/8/8/8/8/4k3/3p4/2QK4 b - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("d2c1q")) == 900 + 800 - 900
+        board = Fen.parse("8/8/8/8/8/8/1k1p4/3QK3 w - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("e1d2")) == 100
+        board = Fen.parse("8/8/8/8/8/2k5/3p4/4K3 w - - 0 1").board
+        assert StaticExchange.evaluate(board, Move.from_uci("e1d2")) < 0
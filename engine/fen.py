@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.board import Board
+from entities.castling_rights import CastlingRights
+from entities.colour import Colour
+from entities.move import Move
+from entities.pieces import Piece, PieceType
+from entities.position import Position
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+class InvalidFenException(ValueError):
+    def __init__(self, fen: str, reason: str) -> None:
+        message = f"Invalid FEN {fen!r}: {reason}."
+        super().__init__(message)
+        self._fen = fen
+
+    def fen(self) -> str:
+        return self._fen
+
+
+class Fen:
+    """Conversion between Game and Forsyth-Edwards Notation.
+    EPD lines are accepted too: operations after the 4th field are ignored.
+    """
+
+    @staticmethod
+    def parse(fen: str) -> Game:
+        """Create game from FEN or EPD line.
+        En passant square is represented in history by the pawn double move which made it.
+        """
+
+        fields = fen.split()
+        if len(fields) < 4:
+            raise InvalidFenException(fen, "expected at least 4 fields")
+        placement, turn, castling, en_passant = fields[:4]
+        halfmove_clock = (
+            int(fields[4]) if len(fields) > 4 and fields[4].isdigit() else 0
+        )
+
+        # Board size is taken from the placement: number of rows and length of the first one.
+        rows = [_ROW_TOKEN.findall(row) for row in placement.split("/")]
+        width = sum(int(token) if token.isdigit() else 1 for token in rows[0])
+        try:
+            board = Board(width, len(rows))
+        except ValueError as exc:
+            raise InvalidFenException(fen, str(exc)) from exc
+        for row_index, row in enumerate(rows):
+            y = board.y_corners["max"] - row_index
+            x = board.x_corners["min"]
+            for token in row:
+                if token.isdigit():
+                    x += int(token)
+                    continue
+                piece = _PIECES.get(token)
+                if piece is None:
+                    raise InvalidFenException(fen, f"unknown piece {token!r}")
+                if x > board.x_corners["max"]:
+                    break
+                board.set_piece(Position(x, y), piece)
+                x += 1
+            if x != board.x_corners["max"] + 1:
+                raise InvalidFenException(fen, f"row {''.join(row)!r} has wrong length")
+        for colour in [Colour.WHITE, Colour.BLACK]:
+            if len(board.get_positions_for_piece(Piece(PieceType.KING, colour))) != 1:
+                raise InvalidFenException(fen, f"expected one {colour.name} king")
+
+        if turn not in _TURNS:
+            raise InvalidFenException(fen, f"unknown side to move {turn!r}")
+        colour = _TURNS[turn]
+
+        castling_rights = CastlingRights.NONE
+        if castling != "-":
+            for letter in castling:
+                if letter not in _CASTLING:
+                    raise InvalidFenException(fen, f"unknown castling right {letter!r}")
+                castling_rights |= _CASTLING[letter]
+
+        history_moves = []
+        if en_passant != "-":
+            try:
+                square = Position.from_algebraic(en_passant)
+            except ValueError as exc:
+                raise InvalidFenException(fen, "wrong en passant square") from exc
+            # Pawn of the opposite side jumped over <square> on the last move.
+            direction = 1 if colour == Colour.BLACK else -1
+            history_moves.append(
+                Move(
+                    Position(square.x, square.y - direction),
+                    Position(square.x, square.y + direction),
+                )
+            )
+
+        return Game(board, colour, history_moves, halfmove_clock, castling_rights)
+
+    @staticmethod
+    def dump(game: Game, fullmove_number: Optional[int] = None) -> str:
+        """Return FEN of the game.
+        En passant square is written only if en passant capture is possible.
+        """
+
+        board = game.board
+        rows = []
+        for y in range(board.y_corners["max"], board.y_corners["min"] - 1, -1):
+            row = ""
+            empty = 0
+            for x in range(board.x_corners["min"], board.x_corners["max"] + 1):
+                piece = board.get_piece(Position(x, y))
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                row += _LETTERS[piece]
+            if empty:
+                row += str(empty)
+            rows.append(row)
+
+        castling_rights = GameLogic.castling_rights(game)
+        castling = "".join(
+            letter for letter, right in _CASTLING.items() if castling_rights & right
+        )
+
+        en_passant = "-"
+        en_passant_file = GameLogic.en_passant_file(game)
+        if en_passant_file is not None:
+            last_move = game.history_moves[-1]
+            en_passant = Position(
+                en_passant_file, (last_move.start.y + last_move.finish.y) // 2
+            ).to_algebraic()
+
+        if fullmove_number is None:
+            fullmove_number = 1 + len(game.history_moves) // 2
+        return " ".join(
+            [
+                "/".join(rows),
+                "w" if game.turn == Colour.WHITE else "b",
+                castling or "-",
+                en_passant,
+                str(game.halfmove_clock),
+                str(fullmove_number),
+            ]
+        )
+
+
+_PIECES = {
+    "K": Piece(PieceType.KING, Colour.WHITE),
+    "Q": Piece(PieceType.QUEEN, Colour.WHITE),
+    "B": Piece(PieceType.BISHOP, Colour.WHITE),
+    "N": Piece(PieceType.KNIGHT, Colour.WHITE),
+    "R": Piece(PieceType.ROOK, Colour.WHITE),
+    "P": Piece(PieceType.PAWN, Colour.WHITE),
+    "k": Piece(PieceType.KING, Colour.BLACK),
+    "q": Piece(PieceType.QUEEN, Colour.BLACK),
+    "b": Piece(PieceType.BISHOP, Colour.BLACK),
+    "n": Piece(PieceType.KNIGHT, Colour.BLACK),
+    "r": Piece(PieceType.ROOK, Colour.BLACK),
+    "p": Piece(PieceType.PAWN, Colour.BLACK),
+}
+_LETTERS = {piece: letter for letter, piece in _PIECES.items()}
+# Row of placement: counts of empty positions (may have several digits) and piece letters.
+_ROW_TOKEN = re.compile(r"\d+|.")
+_TURNS = {"w": Colour.WHITE, "b": Colour.BLACK}
+_CASTLING = {
+    "K": CastlingRights.WHITE_SHORT,
+    "Q": CastlingRights.WHITE_LONG,
+    "k": CastlingRights.BLACK_SHORT,
+    "q": CastlingRights.BLACK_LONG,
+}
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.fen import START_FEN, Fen, InvalidFenException
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.castling_rights import CastlingRights
+from entities.colour import Colour
+from entities.move import Move
+from entities.pieces import Pieces
+from entities.position import Position
+
+
+class TestFen(unittest.TestCase):
+    """Test of Fen class."""
+
+    def test_parse_start_position(self):
+        """Start FEN gives the same position as create_start_game()."""
+
+        game = Fen.parse(START_FEN)
+        assert game.turn == Colour.WHITE
+        assert game.castling_rights == CastlingRights.ALL
+        assert GameLogic.position_hash(game) == GameLogic.position_hash(
+            Game.create_start_game()
+        )
+
+    def test_parse(self):
+        """Test of parse() method with en passant and partial castling rights."""
+
+        game = Fen.parse("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3")
+        assert game.board.get_piece(Position(5, 4)) == Pieces.BLACK_PAWN
+        assert game.castling_rights == (
+            CastlingRights.WHITE_SHORT | CastlingRights.BLACK_LONG
+        )
+        assert game.history_moves == [Move(Position(5, 6), Position(5, 4))]
+        assert GameLogic.en_passant_file(game) == 5
+
+    def test_parse_invalid(self):
+        """Test of parse() method with invalid lines."""
+
+        for fen in [
+            "",
+            "8/8/8/8/8/8/8/8 w - -",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq -",
+            "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNZ w KQkq -",
+            "k2/3/3/K2 w - -",
+        ]:
+            self.assertRaises(InvalidFenException, Fen.parse, fen)
+
+    def test_dump(self):
+        """Test of dump() method: parse and dump give the same line."""
+
+        for fen in [
+            START_FEN,
+            "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3",
+            "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+            # Boards of other sizes.
+            "rnbnqknbnr/pppppppppp/10/10/10/10/PPPPPPPPPP/RNBNQKNBNR w KQkq - 0 1",
+            "rnqknr/pppppp/6/6/PPPPPP/RNQKNR w Qq - 0 1",
+        ]:
+            assert Fen.dump(Fen.parse(fen), int(fen.split()[-1])) == fen
+
+    def test_rules(self):
+        """Number of move sequences of known positions (perft)."""
+
+        def perft(game, depth):
+            moves = list(GameLogic.legal_moves(game))
+            if depth == 1:
+                return len(moves)
+            return sum(
+                perft(GameLogic.make_move(move, game), depth - 1) for move in moves
+            )
+
+        # Castling, en passant and promotions.
+        assert (
+            perft(
+                Fen.parse(
+                    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -"
+                ),
+                1,
+            )
+            == 48
+        )
+        assert (
+            perft(
+                Fen.parse("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"),
+                1,
+            )
+            == 44
+        )
+        assert perft(Fen.parse("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -"), 2) == 191
@@ -2,19 +2,37 @@
 
 from __future__ import annotations
 
-from typing import List, NamedTuple
+from typing import Dict, NamedTuple, Optional, Sequence
 
+from engine.move_history import MoveHistory
 from entities.board import Board
+from entities.castling_rights import CastlingRights
 from entities.colour import Colour
 from entities.move import Move
 
 
 class Game(NamedTuple):
+    """Game state.
+
+    Games are persistent: make_move() returns a new game which shares the board (copy-on-write,
+    see Board.snapshot()) and history (see MoveHistory) with the previous one, so games can be
+    branched cheaply and read from many threads. Lists are accepted as history_moves too.
+
+    halfmove_clock - number of halfmoves since the last capture or pawn move.
+    castling_rights - castling rights which are still available. None means unknown: rights are
+    derived from history_moves on demand.
+    position_counts - mapping from position hash to number of its occurrences since the last
+    capture or pawn move. None means only the current position is known.
+    """
+
     board: Board
     turn: Colour
-    history_moves: List[Move] = []
+    history_moves: Sequence[Move] = MoveHistory()
+    halfmove_clock: int = 0
+    castling_rights: Optional[CastlingRights] = None
+    position_counts: Optional[Dict[int, int]] = None
 
     @staticmethod
-    def create_start_game() -> Game:
-        start_board = Board.create_start_board()
-        return Game(start_board, Colour.WHITE)
+    def create_start_game(width: int = 8, height: int = 8) -> Game:
+        start_board = Board.create_start_board(width, height)
+        return Game(start_board, Colour.WHITE, MoveHistory(), 0, CastlingRights.ALL)
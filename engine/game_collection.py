@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.move import Move
+
+# Results ending a game line: 1 (white won), 0 (draw) or -1 (black won).
+RESULTS = {"1-0": 1, "0-1": -1, "1/2-1/2": 0}
+
+
+class GameLine(NamedTuple):
+    """Game given as a line of UCI moves from the start position, optionally ended by the
+    result.
+    """
+
+    line: str
+    moves: List[Move]
+    result: Optional[int]
+
+
+class GameCollection:
+    """Processing of large collections of games or positions.
+
+    Items are split into chunks which are processed by a process pool. At most
+    <max_chunks_in_flight> chunks are submitted at any time, so memory stays bounded however
+    long the input is, and results are yielded in input order.
+    """
+
+    @staticmethod
+    def parse_line(line: str) -> GameLine:
+        tokens = line.split()
+        result = RESULTS.get(tokens[-1]) if tokens else None
+        moves = [Move.from_uci(token) for token in tokens if token not in RESULTS]
+        return GameLine(line, moves, result)
+
+    @staticmethod
+    def replay(game_line: GameLine) -> Iterator[Tuple[Game, Optional[Move]]]:
+        """Yield positions of <game_line> from the start position with the move played in
+        each, None in the final one. An illegal move raises ValueError before its position
+        is yielded.
+        """
+
+        game = Game.create_start_game()
+        for move in game_line.moves:
+            if move not in GameLogic.legal_moves(game):
+                raise ValueError(
+                    f"Illegal move {move.to_uci()} in game {game_line.line!r}"
+                )
+            yield game, move
+            game = GameLogic.make_move(move, game)
+        yield game, None
+
+    @staticmethod
+    def chunks(items: Iterable, size: int) -> Iterator[list]:
+        iterator = iter(items)
+        while True:
+            chunk = list(itertools.islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def map_chunks(
+        function: Callable[[list], object],
+        items: Iterable,
+        chunk_size: int,
+        workers: Optional[int] = None,
+        max_chunks_in_flight: Optional[int] = None,
+    ) -> Iterator:
+        """Yield <function> of every chunk of <items> in order. <function> must be
+        picklable. <workers> = 0 processes chunks in the calling process, None uses one
+        process per CPU. <max_chunks_in_flight> defaults to twice the number of workers.
+        """
+
+        chunks = GameCollection.chunks(items, chunk_size)
+        if workers == 0:
+            for chunk in chunks:
+                yield function(chunk)
+            return
+
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = max_chunks_in_flight or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight: Deque[Future] = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(function, chunk))
+                if len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
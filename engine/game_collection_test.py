@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.game_collection import GameCollection
+from entities.move import Move
+
+
+class TestGameCollection(unittest.TestCase):
+    """Test of GameCollection class."""
+
+    def test_parse_line(self):
+        """Moves and the optional result are parsed."""
+
+        game_line = GameCollection.parse_line("e2e4 e7e5 1/2-1/2")
+        assert game_line.moves == [Move.from_uci("e2e4"), Move.from_uci("e7e5")]
+        assert game_line.result == 0
+        assert GameCollection.parse_line("e2e4").result is None
+        assert GameCollection.parse_line("").moves == []
+
+    def test_replay(self):
+        """Every position is yielded with the move played in it."""
+
+        replayed = list(GameCollection.replay(GameCollection.parse_line("e2e4 e7e5")))
+        assert [move for _, move in replayed] == [
+            Move.from_uci("e2e4"),
+            Move.from_uci("e7e5"),
+            None,
+        ]
+        assert len(replayed[-1][0].history_moves) == 2
+        with self.assertRaises(ValueError):
+            list(GameCollection.replay(GameCollection.parse_line("e2e5")))
+        # The position of an illegal move is not yielded.
+        replayed = []
+        with self.assertRaises(ValueError):
+            for _, move in GameCollection.replay(
+                GameCollection.parse_line("e2e4 e7e5 e4e5")
+            ):
+                replayed.append(move)
+        assert replayed == [Move.from_uci("e2e4"), Move.from_uci("e7e5")]
+
+    def test_map_chunks(self):
+        """Chunks are processed in order with and without the pool."""
+
+        for workers in [0, 2]:
+            assert list(
+                GameCollection.map_chunks(
+                    sum, range(10), 3, workers=workers, max_chunks_in_flight=1
+                )
+            ) == [3, 12, 21, 9]
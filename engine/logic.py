@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-import copy
+from typing import FrozenSet, Iterator, Optional
 
+from engine.check_info import CheckInfo
 from engine.game import Game
+from engine.move_history import MoveHistory
 from engine.piece_moves import PieceMoves
 from engine.positions_under_threat import PositionsUnderThreat
 from entities.board import Board
+from entities.castling_rights import CastlingRights
 from entities.colour import Colour
+from entities.game_status import GameStatus
 from entities.move import Move
 from entities.pieces import Piece, PieceType
 from entities.position import Position
+from entities.zobrist import Zobrist
 
 
 class GameLogic:
@@ -26,12 +31,19 @@ class GameLogic:
         mate = check without possibility to defend own king
         """
 
-        if GameLogic.is_check(game.board, game.turn):
-            for move in PieceMoves.all_moves(game):
-                if GameLogic.is_move_possible(game, move):
-                    return False
-            return True
-        return False
+        return GameLogic.is_check(
+            game.board, game.turn
+        ) and not GameLogic.has_legal_move(game)
+
+    @staticmethod
+    def is_stalemate(game: Game) -> bool:
+        """Check if <game.turn> side got stalemate.
+        stalemate = no check and no possibility to make a move
+        """
+
+        return not GameLogic.is_check(
+            game.board, game.turn
+        ) and not GameLogic.has_legal_move(game)
 
     @staticmethod
     def is_check(board: Board, colour: Colour) -> bool:
@@ -39,12 +51,201 @@ class GameLogic:
         check = at least one opponent piece aims at own king
         """
 
-        # Retrieve king position
-        king_pos = board.get_positions_for_piece(Piece(PieceType.KING, colour))[0]
-        return king_pos in PositionsUnderThreat.all_positions_under_threat_for_side(
-            colour, board
+        return PositionsUnderThreat.is_position_under_threat(
+            board.king_position(colour), colour, board
         )
 
+    @staticmethod
+    def legal_moves(game: Game) -> Iterator[Move]:
+        """Lazily yield all <game.turn> moves which do not leave own king under check."""
+
+        for move in PieceMoves.all_moves(game):
+            if GameLogic.is_king_safe_after_move(game, move):
+                yield move
+
+    @staticmethod
+    def has_legal_move(game: Game) -> bool:
+        """Check if <game.turn> side is able to make at least one move.
+        Stop at the first legal move found.
+        """
+
+        for pos in game.board.get_positions_for_side(game.turn):
+            piece = game.board.get_piece(pos)
+            for move in PieceMoves.moves(piece.type, pos, game):
+                if GameLogic.is_king_safe_after_move(game, move):
+                    return True
+        return False
+
+    @staticmethod
+    def legal_destinations(
+        game: Game, pos: Position, check_info: Optional[CheckInfo] = None
+    ) -> FrozenSet[Position]:
+        """Return positions the piece on <pos> can legally move to (promotions give one
+        position). Empty if there is no <game.turn> piece on <pos>.
+
+        Moves of pieces other than the king are filtered by <check_info> (computed if not
+        given; pass it to share between queries in one position) without making them. King
+        moves and en passant, which may uncover the king in other ways, are checked by
+        is_king_safe_after_move().
+        """
+
+        piece = game.board.get_piece(pos)
+        if piece is None or piece.colour != game.turn:
+            return frozenset()
+        moves = PieceMoves.moves(piece.type, pos, game)
+        if piece.type == PieceType.KING:
+            return frozenset(
+                move.finish
+                for move in moves
+                if GameLogic.is_king_safe_after_move(game, move)
+            )
+        if check_info is None:
+            check_info = CheckInfo.of(game.board, game.turn)
+        if len(check_info.checkers) > 1:
+            return frozenset()
+        allowed = check_info.pins.get(pos)
+        destinations = set()
+        for move in moves:
+            if (
+                piece.type == PieceType.PAWN
+                and game.board.is_position_empty(move.finish)
+                and move.finish.x != pos.x
+            ):
+                # En passant.
+                if GameLogic.is_king_safe_after_move(game, move):
+                    destinations.add(move.finish)
+                continue
+            if allowed is not None and move.finish not in allowed:
+                continue
+            if check_info.checkers and move.finish not in check_info.block_positions:
+                continue
+            destinations.add(move.finish)
+        return frozenset(destinations)
+
+    @staticmethod
+    def is_king_safe_after_move(game: Game, move: Move) -> bool:
+        """Check if move from PieceMoves does not leave own king under check.
+        Only the board is copied: history and counters are not needed to answer the question.
+        Castling is checked as a king move: PieceMoves already verified the squares king passes.
+        """
+
+        board = game.board.snapshot()
+        piece = board.get_piece(move.start)
+        # Remove pawn captured en passant.
+        if (
+            piece.type == PieceType.PAWN
+            and move.start.x != move.finish.x
+            and board.is_position_empty(move.finish)
+        ):
+            board.remove_piece(Position(move.finish.x, move.start.y))
+        board.set_piece(move.finish, piece)
+        board.remove_piece(move.start)
+        return not GameLogic.is_check(board, piece.colour)
+
+    @staticmethod
+    def game_status(game: Game) -> GameStatus:
+        """Return status of the game for <game.turn> side.
+        Mate and stalemate are detected by searching for the first legal move. Repetitions and
+        fifty-move rule are read from the counters kept by make_move(), so history is never
+        replayed.
+        """
+
+        if GameLogic.is_insufficient_material(game.board):
+            return GameStatus.INSUFFICIENT_MATERIAL
+        if not GameLogic.has_legal_move(game):
+            if GameLogic.is_check(game.board, game.turn):
+                return GameStatus.CHECKMATE
+            return GameStatus.STALEMATE
+        if GameLogic.repetition_count(game) >= 3:
+            return GameStatus.THREEFOLD_REPETITION
+        if game.halfmove_clock >= 100:
+            return GameStatus.FIFTY_MOVE_RULE
+        return GameStatus.ONGOING
+
+    @staticmethod
+    def is_insufficient_material(board: Board) -> bool:
+        """Check if neither side is able to mate.
+        Covered cases: king against king, king and minor piece against king, kings and bishops
+        standing on positions of the same colour.
+        """
+
+        minor_pieces = []
+        for colour in [Colour.WHITE, Colour.BLACK]:
+            for pos in board.get_positions_for_side(colour):
+                piece_type = board.get_piece(pos).type
+                if piece_type in [PieceType.QUEEN, PieceType.ROOK, PieceType.PAWN]:
+                    return False
+                if piece_type != PieceType.KING:
+                    minor_pieces.append((piece_type, pos))
+        if len(minor_pieces) <= 1:
+            return True
+        return (
+            all(piece_type == PieceType.BISHOP for piece_type, _ in minor_pieces)
+            and len({(pos.x + pos.y) % 2 for _, pos in minor_pieces}) == 1
+        )
+
+    @staticmethod
+    def castling_rights(game: Game) -> CastlingRights:
+        """Return castling rights of the game.
+        Rights are kept by make_move(). If they are unknown, derive them from history.
+        """
+
+        if game.castling_rights is not None:
+            return game.castling_rights
+        rights = CastlingRights.ALL
+        for move in game.history_moves:
+            rights &= ~game.board.geometry.castling_rights_lost_by_touching(move.start)
+            rights &= ~game.board.geometry.castling_rights_lost_by_touching(move.finish)
+        return rights
+
+    @staticmethod
+    def en_passant_file(game: Game) -> Optional[int]:
+        """Return file of the pawn which can be captured en passant by <game.turn> side.
+        Return None if en passant is not possible.
+        """
+
+        if not game.history_moves:
+            return None
+        last_move = game.history_moves[-1]
+        piece = game.board.get_piece(last_move.finish)
+        if (
+            piece is None
+            or piece.type != PieceType.PAWN
+            or abs(last_move.start.y - last_move.finish.y) != 2
+        ):
+            return None
+        own_pawn = Piece(PieceType.PAWN, game.turn)
+        for shift_x in [-1, 1]:
+            pos = Position(last_move.finish.x + shift_x, last_move.finish.y)
+            if game.board.get_piece(pos) == own_pawn:
+                return last_move.finish.x
+        return None
+
+    @staticmethod
+    def position_hash(game: Game) -> int:
+        """Return Zobrist hash of the position.
+        Two positions have equal hashes if they have the same pieces on the same positions, the
+        same side to move, the same castling rights and the same en passant possibility.
+        """
+
+        position_hash = (
+            game.board.zobrist_key
+            ^ Zobrist.turn_key(game.turn)
+            ^ Zobrist.castling_key(GameLogic.castling_rights(game))
+        )
+        en_passant_file = GameLogic.en_passant_file(game)
+        if en_passant_file is not None:
+            position_hash ^= Zobrist.en_passant_key(en_passant_file)
+        return position_hash
+
+    @staticmethod
+    def repetition_count(game: Game) -> int:
+        """Return how many times the current position occurred."""
+
+        if game.position_counts is None:
+            return 1
+        return game.position_counts.get(GameLogic.position_hash(game), 1)
+
     @staticmethod
     def make_move(move: Move, game: Game) -> Game:
         """Make move.
@@ -52,35 +253,78 @@ class GameLogic:
         Attention: no checking of check after move. Technically move can be not valid!!!
         """
 
-        # Copy game (pass by value)
-        game = copy.deepcopy(game)
+        # Nothing of <game> is changed: board is a copy-on-write snapshot, history is persistent
+        # and position counts are copied before update.
+        board = game.board.snapshot()
+        history_moves = MoveHistory.of(game.history_moves)
+        halfmove_clock = game.halfmove_clock
+        castling_rights = GameLogic.castling_rights(game)
+        position_counts = game.position_counts
         # Retrieve piece at start position
-        piece = game.board.get_piece(move.start)
+        piece = board.get_piece(move.start)
+        # Promote to queen if promotion piece is not specified.
+        if (
+            piece.type == PieceType.PAWN
+            and move.promotion is None
+            and move.finish.y == PieceMoves.pawn_last_rank(piece.colour, board)
+        ):
+            move = Move(move.start, move.finish, PieceType.QUEEN)
         # Get possible moves
         possible_moves = PieceMoves.moves(piece.type, move.start, game)
         # Check if move satisfies
         if move in possible_moves:
+            # Update counters. Capture or pawn move makes all previous positions unreachable.
+            if piece.type == PieceType.PAWN or not board.is_position_empty(move.finish):
+                halfmove_clock = 0
+                position_counts = {}
+            else:
+                halfmove_clock += 1
+                if position_counts is None:
+                    position_counts = {GameLogic.position_hash(game): 1}
+                else:
+                    position_counts = dict(position_counts)
+            geometry = board.geometry
+            castling_rights &= ~geometry.castling_rights_lost_by_touching(move.start)
+            castling_rights &= ~geometry.castling_rights_lost_by_touching(move.finish)
             # Check if castling occurs
             if move in PieceMoves.castling_moves(move.start, game):
-                game.board.set_piece(
+                board.set_piece(
                     Position(int((move.finish.x + move.start.x) / 2), move.start.y),
                     Piece(PieceType.ROOK, game.turn),
                 )
-                # Short castling
-                if move.finish.x - move.start.x > 0:
-                    game.board.remove_piece(Position(7, move.start.y))
-                # Long castling
-                else:
-                    game.board.remove_piece(Position(0, move.start.y))
+                # Short castling to the right, long castling to the left.
+                short = move.finish.x > move.start.x
+                board.remove_piece(
+                    Position(geometry.castling_rook_x(short), move.start.y)
+                )
             # Check if en passant occurs
             if move in PieceMoves.en_passant_moves(move.start, game):
-                game.board.remove_piece(Position(move.finish.x, move.start.y))
+                board.remove_piece(Position(move.finish.x, move.start.y))
             # Update board
-            game.board.set_piece(move.finish, piece)
-            game.board.remove_piece(move.start)
+            if move.promotion is not None:
+                piece = Piece(move.promotion, piece.colour)
+            board.set_piece(move.finish, piece)
+            board.remove_piece(move.start)
             # Update history
-            game.history_moves.append(move)
-        return Game(game.board, Colour.change_colour(game.turn), game.history_moves)
+            further_game = Game(
+                board,
+                Colour.change_colour(game.turn),
+                history_moves.appended(move),
+                halfmove_clock,
+                castling_rights,
+                position_counts,
+            )
+            further_hash = GameLogic.position_hash(further_game)
+            position_counts[further_hash] = position_counts.get(further_hash, 0) + 1
+            return further_game
+        return Game(
+            board,
+            Colour.change_colour(game.turn),
+            history_moves,
+            halfmove_clock,
+            castling_rights,
+            position_counts,
+        )
 
     @staticmethod
     def is_move_possible(game: Game, move: Move) -> bool:
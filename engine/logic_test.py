@@ -2,10 +2,13 @@
 
 import unittest
 
+from engine.fen import Fen
 from engine.game import Game
 from engine.logic import GameLogic
 from entities.board import Board
+from entities.castling_rights import CastlingRights
 from entities.colour import Colour
+from entities.game_status import GameStatus
 from entities.move import Move
 from entities.pieces import Piece, Pieces, PieceType
 from entities.position import Position
@@ -111,3 +114,180 @@ class TestGameLogic(unittest.TestCase):
         assert GameLogic.is_move_possible(
             self.game, Move(Position(4, 0), Position(6, 0))
         )
+
+    def test_game_status_ongoing(self):
+        """Test of game_status() method for the start position."""
+
+        assert GameLogic.game_status(Game.create_start_game()) == GameStatus.ONGOING
+
+    def test_game_status_checkmate(self):
+        """Test of game_status() method for mate."""
+
+        board = Board()
+        board.set_piece(Position(0, 1), Pieces.WHITE_PAWN)
+        board.set_piece(Position(1, 1), Pieces.WHITE_PAWN)
+        board.set_piece(Position(0, 0), Pieces.WHITE_KING)
+        board.set_piece(Position(2, 0), Pieces.BLACK_ROOK)
+        board.set_piece(Position(7, 7), Pieces.BLACK_KING)
+        game = Game(board, Colour.WHITE, [])
+        assert GameLogic.game_status(game) == GameStatus.CHECKMATE
+
+    def test_game_status_stalemate(self):
+        """Test of game_status() and is_stalemate() methods for stalemate."""
+
+        board = Board()
+        board.set_piece(Position(0, 7), Pieces.BLACK_KING)
+        board.set_piece(Position(1, 5), Pieces.WHITE_QUEEN)
+        board.set_piece(Position(2, 6), Pieces.WHITE_KING)
+        game = Game(board, Colour.BLACK, [])
+        assert GameLogic.is_stalemate(game)
+        assert not GameLogic.is_mate(game)
+        assert GameLogic.game_status(game) == GameStatus.STALEMATE
+
+    def test_game_status_insufficient_material(self):
+        """Test of game_status() method for insufficient material."""
+
+        board = Board()
+        board.set_piece(Position(0, 0), Pieces.WHITE_KING)
+        board.set_piece(Position(2, 2), Pieces.WHITE_BISHOP)
+        board.set_piece(Position(7, 7), Pieces.BLACK_KING)
+        board.set_piece(Position(5, 5), Pieces.BLACK_BISHOP)
+        game = Game(board, Colour.WHITE, [])
+        assert GameLogic.game_status(game) == GameStatus.INSUFFICIENT_MATERIAL
+        board.set_piece(Position(5, 5), Pieces.BLACK_KNIGHT)
+        assert GameLogic.game_status(game) == GameStatus.ONGOING
+
+    def test_game_status_threefold_repetition(self):
+        """Test of game_status() method for repetition. Knights go back and forth twice."""
+
+        game = Game.create_start_game()
+        shuffle = [
+            Move(Position(6, 0), Position(5, 2)),
+            Move(Position(6, 7), Position(5, 5)),
+            Move(Position(5, 2), Position(6, 0)),
+            Move(Position(5, 5), Position(6, 7)),
+        ]
+        for move in shuffle:
+            game = GameLogic.make_move(move, game)
+        assert GameLogic.repetition_count(game) == 2
+        assert GameLogic.game_status(game) == GameStatus.ONGOING
+        for move in shuffle:
+            game = GameLogic.make_move(move, game)
+        assert GameLogic.repetition_count(game) == 3
+        assert GameLogic.game_status(game) == GameStatus.THREEFOLD_REPETITION
+        assert game.halfmove_clock == 8
+
+    def test_game_status_fifty_move_rule(self):
+        """Test of game_status() method for fifty-move rule."""
+
+        self.board.set_piece(Position(7, 7), Pieces.BLACK_KING)
+        game = GameLogic.make_move(
+            Move(Position(0, 0), Position(0, 1)), self.game._replace(halfmove_clock=99)
+        )
+        assert game.halfmove_clock == 100
+        assert GameLogic.game_status(game) == GameStatus.FIFTY_MOVE_RULE
+        # Pawn move resets the clock.
+        game = GameLogic.make_move(
+            Move(Position(4, 4), Position(4, 5)), self.game._replace(halfmove_clock=99)
+        )
+        assert game.halfmove_clock == 0
+
+    def test_position_hash(self):
+        """Test of position_hash() method. Hash depends on turn and castling rights."""
+
+        game = Game.create_start_game()
+        assert GameLogic.position_hash(game) == GameLogic.position_hash(
+            Game(Board.create_start_board(), Colour.WHITE, [])
+        )
+        assert GameLogic.position_hash(game) != GameLogic.position_hash(
+            game._replace(turn=Colour.BLACK)
+        )
+        # King goes forward and back: same pieces, but castling rights are lost.
+        moves = [
+            Move(Position(4, 1), Position(4, 3)),
+            Move(Position(4, 6), Position(4, 4)),
+            Move(Position(4, 0), Position(4, 1)),
+            Move(Position(4, 7), Position(4, 6)),
+            Move(Position(4, 1), Position(4, 0)),
+            Move(Position(4, 6), Position(4, 7)),
+        ]
+        for move in moves:
+            game = GameLogic.make_move(move, game)
+        assert game.castling_rights == CastlingRights.NONE
+        assert GameLogic.repetition_count(game) == 1
+
+    def test_make_move_promotion(self):
+        """Test of make_move() method with promotion. Queen is the default."""
+
+        self.board.set_piece(Position(6, 6), Pieces.WHITE_PAWN)
+        game = GameLogic.make_move(
+            Move(Position(6, 6), Position(6, 7), PieceType.KNIGHT), self.game
+        )
+        assert game.board.get_piece(Position(6, 7)) == Pieces.WHITE_KNIGHT
+        game = GameLogic.make_move(Move(Position(6, 6), Position(6, 7)), self.game)
+        assert game.board.get_piece(Position(6, 7)) == Pieces.WHITE_QUEEN
+        assert game.history_moves[-1].promotion == PieceType.QUEEN
+
+    def test_make_move_does_not_change_game(self):
+        """Test of make_move() method: source game stays the same, branches are independent."""
+
+        game = Game.create_start_game()
+        first = GameLogic.make_move(Move(Position(4, 1), Position(4, 3)), game)
+        second = GameLogic.make_move(Move(Position(3, 1), Position(3, 3)), game)
+        assert game.board.get_piece(Position(4, 1)) == Pieces.WHITE_PAWN
+        assert game.board.get_piece(Position(3, 1)) == Pieces.WHITE_PAWN
+        assert not game.history_moves
+        assert first.board.get_piece(Position(3, 1)) == Pieces.WHITE_PAWN
+        assert second.board.get_piece(Position(4, 1)) == Pieces.WHITE_PAWN
+        assert first.history_moves == [Move(Position(4, 1), Position(4, 3))]
+        assert second.history_moves == [Move(Position(3, 1), Position(3, 3))]
+
+    def test_variant_board_sizes(self):
+        """Test of legal_moves() and make_move() methods on 10x8 and 6x6 boards."""
+
+        game = Game.create_start_game(10, 8)
+        # 2 moves of every pawn and 2 moves of every of 4 knights.
+        assert len(list(GameLogic.legal_moves(game))) == 28
+        # 6x6 board has no bishops: 2 moves of every pawn and of both knights.
+        assert len(list(GameLogic.legal_moves(Game.create_start_game(6, 6)))) == 16
+
+        # Castling on 10x8: king goes from file 5 two files towards the rook.
+        board = Board(10, 8)
+        board.set_piece(Position(5, 0), Pieces.WHITE_KING)
+        board.set_piece(Position(0, 0), Pieces.WHITE_ROOK)
+        board.set_piece(Position(9, 0), Pieces.WHITE_ROOK)
+        board.set_piece(Position(5, 7), Pieces.BLACK_KING)
+        game = Game(board, Colour.WHITE, [], 0, CastlingRights.ALL)
+        legal_moves = list(GameLogic.legal_moves(game))
+        assert Move(Position(5, 0), Position(7, 0)) in legal_moves
+        assert Move(Position(5, 0), Position(3, 0)) in legal_moves
+        game = GameLogic.make_move(Move(Position(5, 0), Position(3, 0)), game)
+        assert game.board.get_piece(Position(4, 0)) == Pieces.WHITE_ROOK
+        assert game.board.get_piece(Position(0, 0)) is None
+        assert game.castling_rights == (
+            CastlingRights.BLACK_SHORT | CastlingRights.BLACK_LONG
+        )
+
+        # Long castling is not possible while any position up to the rook is occupied.
+        board.set_piece(Position(1, 0), Pieces.WHITE_KNIGHT)
+        game = Game(board, Colour.WHITE, [], 0, CastlingRights.ALL)
+        assert Move(Position(5, 0), Position(3, 0)) not in GameLogic.legal_moves(game)
+
+    def test_legal_destinations(self):
+        """Test of legal_destinations() method: the same positions as legal moves give."""
+
+        for fen in [
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+            # Pinned pawn, rook pinned along its line and en passant uncovering the king.
+            "8/8/8/KPp4r/8/8/8/7k w - c6 0 2",
+            "4k3/4r3/8/8/1b6/8/3N4/4K3 w - - 0 1",
+            # Check which can be blocked and double check.
+            "4k3/8/8/8/8/8/2N1r3/R3K3 w - - 0 1",
+            "4k3/8/8/8/1b6/8/2N1r3/R3K3 w - - 0 1",
+        ]:
+            game = Fen.parse(fen)
+            legal_moves = list(GameLogic.legal_moves(game))
+            for pos in game.board.get_positions_for_side(game.turn):
+                assert GameLogic.legal_destinations(game, pos) == {
+                    move.finish for move in legal_moves if move.start == pos
+                }
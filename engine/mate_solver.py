@@ -0,0 +1,264 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.mate_status import MateStatus
+from entities.move import Move
+
+# Proof and disproof number of a node which can never be proven (disproven).
+INFINITE_PROOF = 1 << 30
+
+
+class MateResult(NamedTuple):
+    """Result of MateSolver.solve(). <moves> is the mating line, moves of the attacker and
+    replies of the defender, empty unless <status> is MATE. The defender replies with the
+    longest resistance.
+    """
+
+    status: MateStatus
+    moves: List[Move]
+    nodes: int
+
+    def mate_in(self) -> Optional[int]:
+        """Return number of attacker moves till mate, None if no mate is found."""
+
+        if self.status != MateStatus.MATE:
+            return None
+        return (len(self.moves) + 1) // 2
+
+
+class MateSolver:
+    """Search of forced mates by proof-number search.
+
+    The side to move (attacker) tries to mate within N moves. Tree nodes where the attacker
+    moves need one proven child (OR nodes), nodes where the defender moves need all children
+    proven (AND nodes). Proof and disproof numbers, the least number of leaves to prove or
+    disprove a node, direct the search to the most-proving leaf, so forcing lines with few
+    replies are examined first and wide quiet trees are not searched at all.
+
+    Mates are searched for 1, 2, ..., N moves in turn, so the first mate found is the
+    shortest one. Attacker checks are expanded before quiet moves. Attacker moves which do
+    not give check are skipped on the last move (they cannot mate) and with <checks_only> on
+    every move. Mates needing a quiet move are not found then, so solve() returns UNKNOWN
+    instead of NO_MATE if any quiet move was skipped. Mate and check are determined by
+    GameLogic.is_mate() and GameLogic.is_check(); draw rules are not applied.
+
+    <max_nodes> and <time_limit> (seconds) bound the whole solve() call: once exceeded the
+    result is UNKNOWN.
+    """
+
+    def __init__(
+        self,
+        max_nodes: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        checks_only: bool = False,
+    ) -> None:
+        self._max_nodes = max_nodes
+        self._time_limit = time_limit
+        self._checks_only = checks_only
+        self._deadline: Optional[float] = None
+        # Were attacker moves which might mate skipped by <checks_only>.
+        self._skipped_moves = False
+        self.nodes = 0
+
+    def solve(self, game: Game, moves: int) -> MateResult:
+        """Find mate of <game.turn> side in at most <moves> moves."""
+
+        self.nodes = 0
+        self._skipped_moves = False
+        self._deadline = (
+            time.monotonic() + self._time_limit
+            if self._time_limit is not None
+            else None
+        )
+        for depth in range(1, moves + 1):
+            root = _Node(game, None, None, True, depth)
+            self._evaluate(root)
+            if not self._prove(root):
+                return MateResult(MateStatus.UNKNOWN, [], self.nodes)
+            if root.proof == 0:
+                return MateResult(MateStatus.MATE, _mating_line(root), self.nodes)
+        if self._skipped_moves:
+            return MateResult(MateStatus.UNKNOWN, [], self.nodes)
+        return MateResult(MateStatus.NO_MATE, [], self.nodes)
+
+    def _prove(self, root: _Node) -> bool:
+        """Search till <root> is proven or disproven. Return False if the budget ran out."""
+
+        while root.proof != 0 and root.disproof != 0:
+            if self._is_budget_exhausted():
+                return False
+            node = root
+            while node.children:
+                node = _most_proving_child(node)
+            self._expand(node)
+            while node is not None:
+                _update_numbers(node)
+                node = node.parent
+        return True
+
+    def _is_budget_exhausted(self) -> bool:
+        return (self._max_nodes is not None and self.nodes >= self._max_nodes) or (
+            self._deadline is not None and time.monotonic() >= self._deadline
+        )
+
+    def _evaluate(self, node: _Node) -> None:
+        """Set initial proof and disproof numbers of a new node."""
+
+        self.nodes += 1
+        game = node.game
+        if not node.attacker_to_move and node.depth == 0:
+            # The attacker has no moves left: only mate on the board counts.
+            node.set_result(GameLogic.is_mate(game))
+            return
+        node.moves = list(GameLogic.legal_moves(game))
+        if not node.moves:
+            # Mate or stalemate on the board.
+            node.set_result(
+                not node.attacker_to_move and GameLogic.is_check(game.board, game.turn)
+            )
+        elif node.attacker_to_move:
+            node.proof, node.disproof = 1, len(node.moves)
+        else:
+            node.proof, node.disproof = len(node.moves), 1
+
+    def _expand(self, node: _Node) -> None:
+        """Create and evaluate children of <node>. Creation stops once the result of <node>
+        is known: at a proven child of OR node or at a disproven child of AND node.
+        """
+
+        for move, child_game in self._children(node):
+            child = _Node(
+                child_game,
+                move,
+                node,
+                not node.attacker_to_move,
+                node.depth - 1 if node.attacker_to_move else node.depth,
+            )
+            self._evaluate(child)
+            node.children.append(child)
+            if (child.proof if node.attacker_to_move else child.disproof) == 0:
+                break
+        node.moves = None
+        if not node.children:
+            # No checking move.
+            node.set_result(False)
+
+    def _children(self, node: _Node) -> Iterable[Tuple[Move, Game]]:
+        """Return moves of <node> with the games after them. Attacker checks go first, so
+        the most forcing moves are tried first among the equally proving ones. Quiet
+        attacker moves are left out on the last move and with <checks_only>.
+        """
+
+        children = (
+            (move, GameLogic.make_move(move, node.game)) for move in node.moves or []
+        )
+        if not node.attacker_to_move:
+            return children
+        checks, quiet = [], []
+        for move, child_game in children:
+            if GameLogic.is_check(child_game.board, child_game.turn):
+                checks.append((move, child_game))
+            else:
+                quiet.append((move, child_game))
+        if node.depth == 1:
+            return checks
+        if self._checks_only:
+            self._skipped_moves = self._skipped_moves or bool(quiet)
+            return checks
+        return checks + quiet
+
+
+# Node is a plain record with slots: every attribute is a field of the tree node.
+class _Node:  # pylint: disable=too-many-instance-attributes
+    """Node of proof-number search tree. <depth> is the number of attacker moves left."""
+
+    __slots__ = [
+        "game",
+        "move",
+        "parent",
+        "attacker_to_move",
+        "depth",
+        "moves",
+        "children",
+        "proof",
+        "disproof",
+    ]
+
+    def __init__(
+        self,
+        game: Game,
+        move: Optional[Move],
+        parent: Optional[_Node],
+        attacker_to_move: bool,
+        depth: int,
+    ) -> None:
+        self.game = game
+        self.move = move
+        self.parent = parent
+        self.attacker_to_move = attacker_to_move
+        self.depth = depth
+        # Legal moves of unexpanded node.
+        self.moves: Optional[List[Move]] = None
+        self.children: List[_Node] = []
+        self.proof = 1
+        self.disproof = 1
+
+    def set_result(self, is_proven: bool) -> None:
+        if is_proven:
+            self.proof, self.disproof = 0, INFINITE_PROOF
+        else:
+            self.proof, self.disproof = INFINITE_PROOF, 0
+
+
+def _most_proving_child(node: _Node) -> _Node:
+    if node.attacker_to_move:
+        return min(node.children, key=lambda child: child.proof)
+    return min(node.children, key=lambda child: child.disproof)
+
+
+def _update_numbers(node: _Node) -> None:
+    if not node.children:
+        return
+    proofs = [child.proof for child in node.children]
+    disproofs = [child.disproof for child in node.children]
+    if node.attacker_to_move:
+        node.proof = min(proofs)
+        node.disproof = min(sum(disproofs), INFINITE_PROOF)
+    else:
+        node.proof = min(sum(proofs), INFINITE_PROOF)
+        node.disproof = min(disproofs)
+
+
+def _mate_length(node: _Node) -> int:
+    """Return number of plies till mate in the proof tree of proven <node>."""
+
+    if not node.children:
+        return 0
+    if node.attacker_to_move:
+        return 1 + min(
+            _mate_length(child) for child in node.children if child.proof == 0
+        )
+    return 1 + max(_mate_length(child) for child in node.children)
+
+
+def _mating_line(root: _Node) -> List[Move]:
+    """Return the line of proven <root>: the fastest mate against the longest defence."""
+
+    line = []
+    node = root
+    while node.children:
+        if node.attacker_to_move:
+            node = min(
+                (child for child in node.children if child.proof == 0),
+                key=_mate_length,
+            )
+        else:
+            node = max(node.children, key=_mate_length)
+        line.append(node.move)
+    return line
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.fen import START_FEN, Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.mate_solver import MateSolver
+from entities.mate_status import MateStatus
+
+# Mate in 2 by knight sacrifice: 1. Nf6+ gxf6 2. Bxf7#.
+MATE_IN_2 = "r2qkb1r/pp2nppp/3p4/2pNN1B1/2BnP3/3P4/PPP2PPP/R2bK2R w KQkq - 1 1"
+# Mate in 2 with a quiet first move: 1. Ra1 Kc8 2. Ra8#.
+QUIET_MATE_IN_2 = "1k6/8/2K5/8/8/8/8/7R w - - 0 1"
+# Mate in 2 with a quiet king move: 1. Kc7 Ka7 2. Ra1#.
+QUIET_KING_MATE_IN_2 = "k7/8/2K5/8/8/8/8/1R6 w - - 0 1"
+
+
+class TestMateSolver(unittest.TestCase):
+    """Test of MateSolver class."""
+
+    def test_solve_mate_in_one(self):
+        """Test of solve() method with back rank mate."""
+
+        result = MateSolver().solve(Fen.parse("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), 3)
+        assert result.status == MateStatus.MATE
+        assert result.mate_in() == 1
+        assert [move.to_uci() for move in result.moves] == ["a1a8"]
+
+    def test_solve_mating_line(self):
+        """Test of solve() method: the line is legal and ends with mate."""
+
+        for fen, checks_only in [
+            (MATE_IN_2, False),
+            (MATE_IN_2, True),
+            (QUIET_MATE_IN_2, False),
+            (QUIET_KING_MATE_IN_2, False),
+        ]:
+            game = Fen.parse(fen)
+            result = MateSolver(checks_only=checks_only).solve(game, 2)
+            assert result.status == MateStatus.MATE
+            assert result.mate_in() == 2
+            for move in result.moves:
+                assert move in GameLogic.legal_moves(game)
+                game = GameLogic.make_move(move, game)
+            assert GameLogic.is_mate(game)
+
+    def test_solve_no_mate(self):
+        """Test of solve() method when mate is not possible within the moves."""
+
+        assert MateSolver().solve(Fen.parse(START_FEN), 1).status == MateStatus.NO_MATE
+        # Side to move is mated already.
+        game = Fen.parse("R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1")
+        assert MateSolver().solve(game, 2).status == MateStatus.NO_MATE
+
+    def test_solve_checks_only(self):
+        """Test of solve() method: absence of mate is not proven if quiet moves were
+        skipped.
+        """
+
+        for fen in [QUIET_MATE_IN_2, QUIET_KING_MATE_IN_2]:
+            result = MateSolver(checks_only=True).solve(Fen.parse(fen), 2)
+            assert result.status == MateStatus.UNKNOWN
+            assert not result.moves and result.mate_in() is None
+        # Quiet moves skipped on the last move cannot mate.
+        game = Fen.parse(START_FEN)
+        assert MateSolver(checks_only=True).solve(game, 1).status == MateStatus.NO_MATE
+
+    def test_solve_budget(self):
+        """Test of solve() method: result is unknown once the budget runs out."""
+
+        game = Game.create_start_game()
+        result = MateSolver(max_nodes=10).solve(game, 3)
+        assert result.status == MateStatus.UNKNOWN
+        assert result.nodes >= 10
+        assert MateSolver(time_limit=0).solve(game, 3).status == MateStatus.UNKNOWN
@@ -0,0 +1,349 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import deque
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from engine.evaluation import Evaluation
+from engine.exchange import StaticExchange
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.game_status import GameStatus
+from entities.move import Move
+
+# Values of <first_child> of nodes without children.
+UNEXPANDED = -1
+# Terminal nodes: the side to move is mated, or the game is drawn.
+LOST = -2
+DRAWN = -3
+# Evaluation in centipawns mapped to value tanh(score / VALUE_SCALE) in (-1, 1).
+VALUE_SCALE = 400
+# Priors are softmax of the material won by a move (centipawns) / PRIOR_TEMPERATURE.
+PRIOR_TEMPERATURE = 200
+# Tree is pruned before a simulation if fewer free nodes are left: a position has fewer
+# legal moves.
+MAX_CHILDREN = 256
+
+
+class MctsResult(NamedTuple):
+    """Result of MctsSearch.search(). <value> is the expected result for the side to move
+    in [-1, 1], <pv> follows the most visited children.
+    """
+
+    best_move: Optional[Move]
+    value: float
+    visits: int
+    simulations: int
+    pv: List[Move]
+
+
+class _NodePool:
+    """Node fields in flat arrays indexed by node. Children of a node are stored in
+    consecutive nodes <first_child> ... <first_child + child_count - 1>.
+    """
+
+    __slots__ = [
+        "visits",
+        "value_sums",
+        "priors",
+        "moves",
+        "first_child",
+        "child_count",
+    ]
+
+    def __init__(self, capacity: int) -> None:
+        self.visits = array("I", [0]) * capacity
+        # Sum of values from the point of view of the side which made the move into the
+        # node.
+        self.value_sums = array("d", [0.0]) * capacity
+        self.priors = array("f", [0.0]) * capacity
+        # Move into the node packed by Move.pack().
+        self.moves = array("I", [0]) * capacity
+        self.first_child = array("i", [UNEXPANDED]) * capacity
+        self.child_count = array("H", [0]) * capacity
+
+    def copy_node(self, source: _NodePool, old: int, new: int) -> None:
+        self.visits[new] = source.visits[old]
+        self.value_sums[new] = source.value_sums[old]
+        self.priors[new] = source.priors[old]
+        self.moves[new] = source.moves[old]
+
+    def byte_size(self) -> int:
+        return sum(
+            getattr(self, field).itemsize * len(getattr(self, field))
+            for field in self.__slots__
+        )
+
+
+class MctsSearch:
+    """Monte Carlo tree search with PUCT selection.
+
+    Every simulation descends from the root to a leaf choosing the child with the highest
+    Q + <c_puct> * P * sqrt(N) / (1 + n), where Q is the mean value of the child, P its prior,
+    N and n visits of the node and the child. The leaf is checked by GameLogic.game_status():
+    terminal leaves score -1 (mated) or 0 (drawn), other leaves are expanded with
+    GameLogic.legal_moves() (PieceMoves.all_moves() which keep the king safe) and valued by
+    <evaluate> mapped into (-1, 1). The value is backed up along the path.
+
+    The tree lives in two preallocated pools of <max_nodes> nodes (_NodePool): no Python
+    object is created per node, positions are replayed from the root with make_move(). When
+    the pool is nearly full the tree is pruned: it is copied into the spare pool without the
+    children of nodes visited less than a threshold, which is doubled till at most half of
+    the pool is kept. Pruned nodes keep their statistics and are expanded again if visited.
+
+    search() reuses the tree: if the game continues the previously searched one, the subtree
+    of the moves played becomes the new root, so visits spent on the expected reply are kept.
+    """
+
+    def __init__(
+        self,
+        max_nodes: int = 1 << 18,
+        c_puct: float = 1.5,
+        evaluate: Callable[[Game], int] = Evaluation.evaluate,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        if max_nodes < 2 * MAX_CHILDREN:
+            raise ValueError(f"max_nodes must be at least {2 * MAX_CHILDREN}")
+        self._capacity = max_nodes
+        self._c_puct = c_puct
+        self._evaluate = evaluate
+        self._stop = stop
+        self._pool = _NodePool(max_nodes)
+        self._spare = _NodePool(max_nodes)
+        self._size = 0
+        self._root_game: Optional[Game] = None
+        self.prunes = 0
+        # Nodes kept from the previous search by the last search() call.
+        self.reused_nodes = 0
+
+    def __len__(self) -> int:
+        """Return number of nodes in the tree."""
+
+        return self._size
+
+    def memory_size(self) -> int:
+        """Return bytes allocated for both pools."""
+
+        return self._pool.byte_size() + self._spare.byte_size()
+
+    def search(
+        self, game: Game, simulations: int, time_limit: Optional[float] = None
+    ) -> MctsResult:
+        """Run <simulations> from <game> (fewer if <time_limit> seconds pass or <stop>
+        returns True) and return the most visited move.
+        """
+
+        self._set_root(game)
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        done = 0
+        while done < simulations:
+            if (deadline is not None and time.monotonic() >= deadline) or (
+                self._stop is not None and self._stop()
+            ):
+                break
+            if self._capacity - self._size < MAX_CHILDREN:
+                self._prune()
+            self._simulate()
+            done += 1
+        return self._result(done)
+
+    def _set_root(self, game: Game) -> None:
+        root = self._find(game)
+        self.reused_nodes = 0
+        if root is None:
+            self._size = 1
+            self._clear_node(self._pool, 0)
+            self._pool.moves[0] = 0
+            self._pool.priors[0] = 1.0
+        else:
+            if root != 0:
+                self._compact(root, 0)
+            self.reused_nodes = self._size
+        self._root_game = game
+
+    def _find(self, game: Game) -> Optional[int]:
+        """Return node of <game> in the tree of the previous root, None if <game> does not
+        continue the previous root game.
+        """
+
+        previous = self._root_game
+        if previous is None:
+            return None
+        history = list(game.history_moves)
+        known = len(previous.history_moves)
+        if len(history) < known or history[:known] != list(previous.history_moves):
+            return None
+        replayed = previous
+        node = 0
+        for move in history[known:]:
+            replayed = GameLogic.make_move(move, replayed)
+            node = self._child_with_move(node, move.pack())
+            if node is None:
+                return None
+        if GameLogic.position_hash(replayed) != GameLogic.position_hash(game):
+            return None
+        return node
+
+    def _child_with_move(self, node: int, packed: int) -> Optional[int]:
+        pool = self._pool
+        first = pool.first_child[node]
+        if first < 0:
+            return None
+        for child in range(first, first + pool.child_count[node]):
+            if pool.moves[child] == packed:
+                return child
+        return None
+
+    def _simulate(self) -> None:
+        pool = self._pool
+        game = self._root_game
+        node = 0
+        path = [0]
+        while pool.first_child[node] >= 0:
+            node = self._select(node)
+            game = GameLogic.make_move(Move.unpack(pool.moves[node]), game)
+            path.append(node)
+        first = pool.first_child[node]
+        if first == LOST:
+            value = -1.0
+        elif first == DRAWN:
+            value = 0.0
+        else:
+            value = self._expand(node, game)
+        # <value> is for the side to move at the leaf, nodes store values for the side
+        # which moved into them.
+        for node in reversed(path):
+            value = -value
+            pool.visits[node] += 1
+            pool.value_sums[node] += value
+
+    def _select(self, node: int) -> int:
+        pool = self._pool
+        first = pool.first_child[node]
+        exploration = self._c_puct * math.sqrt(pool.visits[node])
+        best_child, best_score = first, -math.inf
+        for child in range(first, first + pool.child_count[node]):
+            visits = pool.visits[child]
+            score = exploration * pool.priors[child] / (1 + visits)
+            if visits:
+                score += pool.value_sums[child] / visits
+            if score > best_score:
+                best_child, best_score = child, score
+        return best_child
+
+    def _expand(self, node: int, game: Game) -> float:
+        """Expand leaf <node> of position <game>. Return value for <game.turn> side."""
+
+        pool = self._pool
+        status = GameLogic.game_status(game)
+        if status == GameStatus.CHECKMATE:
+            pool.first_child[node] = LOST
+            return -1.0
+        if status != GameStatus.ONGOING:
+            pool.first_child[node] = DRAWN
+            return 0.0
+        moves = list(GameLogic.legal_moves(game))
+        if self._size + len(moves) <= self._capacity:
+            first = self._size
+            self._size += len(moves)
+            for child, (move, prior) in enumerate(
+                zip(moves, _priors(game, moves)), first
+            ):
+                self._clear_node(pool, child)
+                pool.moves[child] = move.pack()
+                pool.priors[child] = prior
+            pool.first_child[node] = first
+            pool.child_count[node] = len(moves)
+        return math.tanh(self._evaluate(game) / VALUE_SCALE)
+
+    @staticmethod
+    def _clear_node(pool: _NodePool, node: int) -> None:
+        pool.visits[node] = 0
+        pool.value_sums[node] = 0.0
+        pool.first_child[node] = UNEXPANDED
+        pool.child_count[node] = 0
+
+    def _prune(self) -> None:
+        threshold = 1
+        while self._count_kept(threshold) > self._capacity // 2:
+            threshold *= 2
+        self._compact(0, threshold)
+        self.prunes += 1
+
+    def _count_kept(self, threshold: int) -> int:
+        pool = self._pool
+        kept = 1
+        queue = deque([0])
+        while queue:
+            node = queue.popleft()
+            first = pool.first_child[node]
+            if first >= 0 and pool.visits[node] >= threshold:
+                kept += pool.child_count[node]
+                queue.extend(range(first, first + pool.child_count[node]))
+        return kept
+
+    def _compact(self, root: int, threshold: int) -> None:
+        """Copy subtree of <root> into the spare pool and swap pools. Children of nodes
+        visited less than <threshold> times are dropped.
+        """
+
+        source, target = self._pool, self._spare
+        target.copy_node(source, root, 0)
+        size = 1
+        queue: Deque[Tuple[int, int]] = deque([(root, 0)])
+        while queue:
+            old, new = queue.popleft()
+            first = source.first_child[old]
+            count = source.child_count[old]
+            if first >= 0 and source.visits[old] >= threshold:
+                target.first_child[new] = size
+                target.child_count[new] = count
+                for offset in range(count):
+                    target.copy_node(source, first + offset, size + offset)
+                    queue.append((first + offset, size + offset))
+                size += count
+            else:
+                # Terminal marks are kept, dropped children are expanded again.
+                target.first_child[new] = first if first < UNEXPANDED else UNEXPANDED
+                target.child_count[new] = 0
+        self._pool, self._spare = target, source
+        self._size = size
+
+    def _result(self, simulations: int) -> MctsResult:
+        pool = self._pool
+        visits = pool.visits[0]
+        # Root value is stored for the opponent of the side to move.
+        value = -pool.value_sums[0] / visits if visits else 0.0
+        pv: List[Move] = []
+        node = 0
+        while pool.first_child[node] >= 0:
+            first = pool.first_child[node]
+            child = max(
+                range(first, first + pool.child_count[node]),
+                key=lambda index: pool.visits[index],
+            )
+            if pool.visits[child] == 0:
+                break
+            pv.append(Move.unpack(pool.moves[child]))
+            node = child
+        return MctsResult(pv[0] if pv else None, value, visits, simulations, pv)
+
+
+def _priors(game: Game, moves: List[Move]) -> List[float]:
+    """Return softmax of material won by <moves>: captures and promotions first."""
+
+    gains = []
+    for move in moves:
+        victim = StaticExchange.captured_piece(game.board, move)
+        gain = Evaluation.PIECE_VALUES[victim.type] if victim is not None else 0
+        if move.promotion is not None:
+            gain += Evaluation.PIECE_VALUES[move.promotion]
+        gains.append(gain)
+    top = max(gains)
+    weights = [math.exp((gain - top) / PRIOR_TEMPERATURE) for gain in gains]
+    total = sum(weights)
+    return [weight / total for weight in weights]
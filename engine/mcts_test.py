@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.fen import Fen
+from engine.logic import GameLogic
+from engine.mcts import MctsSearch
+from entities.move import Move
+
+
+class TestMctsSearch(unittest.TestCase):
+    """Test of MctsSearch class."""
+
+    def test_mate_in_one(self):
+        """Scholar's mate is found and valued as a win."""
+
+        game = Fen.parse(
+            "r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+        )
+        result = MctsSearch(max_nodes=1 << 12).search(game, 200)
+        assert result.best_move == Move.from_uci("h5f7")
+        assert result.value > 0.9
+        assert result.visits == result.simulations == 200
+
+    def test_wins_material(self):
+        """Hanging queen is captured."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = MctsSearch(max_nodes=1 << 12).search(game, 200)
+        assert result.best_move == Move.from_uci("d2d5")
+        assert result.pv[0] == result.best_move
+
+    def test_terminal(self):
+        """Mated position has no move."""
+
+        game = Fen.parse("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1")
+        result = MctsSearch(max_nodes=1 << 10).search(game, 10)
+        assert result.best_move is None
+        assert result.value == -1.0
+
+    def test_reuse(self):
+        """Subtree of the moves played is kept for the next search."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        search = MctsSearch(max_nodes=1 << 12)
+        result = search.search(game, 300)
+        for move in result.pv[:2]:
+            game = GameLogic.make_move(move, game)
+        search.search(game, 10)
+        assert search.reused_nodes > 1
+        # Unrelated position starts a new tree.
+        search.search(Fen.parse("4k3/8/8/8/8/8/3R4/4K3 w - - 0 1"), 10)
+        assert search.reused_nodes == 0
+
+    def test_prune(self):
+        """Tree is pruned to fit the pool."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        search = MctsSearch(max_nodes=512)
+        result = search.search(game, 1000)
+        assert search.prunes > 0
+        assert len(search) <= 512
+        assert result.best_move == Move.from_uci("d2d5")
+        with self.assertRaises(ValueError):
+            MctsSearch(max_nodes=100)
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+from entities.move import Move
+
+
+class MoveHistory(Sequence):
+    """Persistent list of moves.
+
+    History is a linked list from the last move to the first one. It is never changed:
+    appended() returns a new history which shares all previous moves with the old one, so
+    branching a game costs O(1) time and memory and histories can be shared between threads.
+    Indexing from the end (history[-1]) is O(k), iteration is O(n).
+
+    The first moves may be kept in any sequence instead of nodes (see over()), so a compact
+    record of a game serves as the history without a node per move.
+    """
+
+    __slots__ = ["_last", "_previous", "_length", "_base"]
+
+    def __init__(self, moves: Iterable[Move] = ()) -> None:
+        self._last: Optional[Move] = None
+        self._previous: Optional[MoveHistory] = None
+        self._length = 0
+        # Sequence of all moves of the history if it is not a node (see over()).
+        self._base: Optional[Sequence[Move]] = None
+        moves = list(moves)
+        if moves:
+            previous = MoveHistory()
+            for move in moves[:-1]:
+                previous = previous.appended(move)
+            self._last = moves[-1]
+            self._previous = previous
+            self._length = len(moves)
+
+    @staticmethod
+    def of(moves: Union[MoveHistory, Iterable[Move]]) -> MoveHistory:
+        """Return <moves> as MoveHistory. Existing MoveHistory is returned as is."""
+
+        return moves if isinstance(moves, MoveHistory) else MoveHistory(moves)
+
+    @classmethod
+    def over(cls, moves: Sequence[Move]) -> MoveHistory:
+        """Return history of <moves> which keeps <moves> instead of copying them.
+        <moves> must not be changed afterwards.
+        """
+
+        history = cls.__new__(cls)
+        history._last = None
+        history._previous = None
+        history._length = len(moves)
+        history._base = moves if moves else None
+        return history
+
+    @classmethod
+    def _node(cls, move: Move, previous: MoveHistory) -> MoveHistory:
+        history = cls.__new__(cls)
+        history._last = move
+        history._previous = previous
+        history._length = len(previous) + 1
+        history._base = None
+        return history
+
+    def appended(self, move: Move) -> MoveHistory:
+        """Return new history with <move> added to the end."""
+
+        return MoveHistory._node(move, self)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("history index out of range")
+        node = self
+        while node._base is None and node._length - 1 > index:
+            node = node._previous
+        return node._base[index] if node._base is not None else node._last
+
+    def __reversed__(self) -> Iterator[Move]:
+        node = self
+        while node._length:
+            if node._base is not None:
+                yield from reversed(node._base)
+                return
+            yield node._last
+            node = node._previous
+
+    def __iter__(self) -> Iterator[Move]:
+        return iter(self.to_list())
+
+    def to_list(self) -> List[Move]:
+        moves = list(reversed(self))
+        moves.reverse()
+        return moves
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MoveHistory, list, tuple)):
+            return len(self) == len(other) and self.to_list() == list(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(reversed(self)))
+
+    def __repr__(self) -> str:
+        return f"MoveHistory({self.to_list()!r})"
+
+    def __reduce__(self):
+        # Pickle as a flat list: recursive pickling of long chains would hit recursion limit.
+        return MoveHistory, (self.to_list(),)
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+
+import pickle
+import unittest
+
+from engine.move_history import MoveHistory
+from entities.move import Move
+
+MOVES = [Move.from_uci(text) for text in ["e2e4", "e7e5", "g1f3", "b8c6"]]
+
+
+class TestMoveHistory(unittest.TestCase):
+    """Test of MoveHistory class."""
+
+    def test_sequence(self):
+        """History behaves like a list of moves."""
+
+        history = MoveHistory(MOVES)
+        assert len(history) == 4
+        assert history[-1] == MOVES[-1]
+        assert history[0] == MOVES[0]
+        assert history[1:3] == MOVES[1:3]
+        assert list(history) == MOVES
+        assert list(reversed(history)) == MOVES[::-1]
+        assert history == MOVES
+        assert MOVES[2] in history
+        assert not MoveHistory()
+        self.assertRaises(IndexError, lambda: MoveHistory()[-1])
+
+    def test_appended(self):
+        """Branches share the common prefix and do not see each other's moves."""
+
+        history = MoveHistory(MOVES[:2])
+        first = history.appended(MOVES[2])
+        second = history.appended(MOVES[3])
+        assert history == MOVES[:2]
+        assert first == MOVES[:3]
+        assert second == [*MOVES[:2], MOVES[3]]
+
+    def test_over(self):
+        """History over a sequence is extended with nodes."""
+
+        history = MoveHistory.over(MOVES[:3]).appended(MOVES[3])
+        assert history == MOVES
+        assert [history[index] for index in range(4)] == MOVES
+        assert history[-2] == MOVES[2]
+        assert list(reversed(history)) == MOVES[::-1]
+        assert not MoveHistory.over([])
+
+    def test_pickle(self):
+        """Long histories are pickled without recursion."""
+
+        history = MoveHistory()
+        for _ in range(5000):
+            history = history.appended(MOVES[0])
+        assert pickle.loads(pickle.dumps(history)) == history
+        assert MoveHistory.of(history) is history
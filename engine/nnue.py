@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Any, List, NamedTuple, Optional
+
+from engine.evaluation import Evaluation
+from engine.game import Game
+from engine.training_export import PLANE_TYPES, SIDE
+from entities.board import Board
+from entities.colour import Colour
+from entities.pieces import Piece
+from entities.position import Position
+
+# Features of one perspective: own pieces first, then enemy ones, by PLANE_TYPES and
+# position seen from the perspective (ranks of black perspective are flipped).
+FEATURES = 2 * len(PLANE_TYPES) * SIDE * SIDE
+# Accumulator values are clipped to [0, ACTIVATION_MAX] before the hidden layer, hidden
+# layer sums are shifted right by HIDDEN_SHIFT and clipped the same way.
+ACTIVATION_MAX = 127
+HIDDEN_SHIFT = 6
+# Network output divided by this is the score in centipawns.
+OUTPUT_SCALE = 16
+
+
+class NnueWeights(NamedTuple):
+    """Quantized weights of the network: FEATURES -> accumulator (per perspective) ->
+    hidden layer -> score. Arrays are NumPy arrays.
+
+    ft_weight (FEATURES, A) int16, ft_bias (A,) int16 - feature transformer (accumulator);
+    hidden_weight (2 * A, H) int16, hidden_bias (H,) int32 - input is the accumulator of the
+    side to move followed by the other one;
+    output_weight (H,) int16, output_bias () int32.
+    """
+
+    ft_weight: Any
+    ft_bias: Any
+    hidden_weight: Any
+    hidden_bias: Any
+    output_weight: Any
+    output_bias: Any
+
+    @staticmethod
+    def load(path: str) -> NnueWeights:
+        """Load weights from .npz file with arrays named as the fields."""
+
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        with numpy.load(path) as arrays:
+            weights = NnueWeights(
+                *(
+                    arrays[field].astype(dtype)
+                    for field, dtype in zip(NnueWeights._fields, _DTYPES)
+                )
+            )
+        weights.validate()
+        return weights
+
+    @staticmethod
+    def random(accumulator: int = 128, hidden: int = 32, seed: int = 0) -> NnueWeights:
+        """Return small random weights. Useful for tests and benchmarks only."""
+
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        rng = numpy.random.default_rng(seed)
+        return NnueWeights(
+            rng.integers(-32, 32, (FEATURES, accumulator)).astype(numpy.int16),
+            rng.integers(0, 64, accumulator).astype(numpy.int16),
+            rng.integers(-8, 8, (2 * accumulator, hidden)).astype(numpy.int16),
+            rng.integers(-256, 256, hidden).astype(numpy.int32),
+            rng.integers(-64, 64, hidden).astype(numpy.int16),
+            numpy.int32(0),
+        )
+
+    def save(self, path: str) -> None:
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        numpy.savez(path, **self._asdict())
+
+    def validate(self) -> None:
+        """Raise ValueError if shapes of arrays do not match each other."""
+
+        accumulator = self.ft_bias.shape[0]
+        hidden = self.hidden_bias.shape[0]
+        if (
+            self.ft_weight.shape != (FEATURES, accumulator)
+            or self.hidden_weight.shape != (2 * accumulator, hidden)
+            or self.output_weight.shape != (hidden,)
+        ):
+            raise ValueError("Shapes of NNUE weights do not match.")
+
+
+class NnueEvaluation:
+    """Evaluation by an efficiently updatable neural network.
+
+    The first layer output (accumulator) of both perspectives is kept per board in
+    Board.evaluation_cache. Snapshots of evaluated boards log pieces set and removed after
+    they were taken (see Board.base()), so the accumulator of a board is its parent's one
+    plus and minus the weight rows of the changed features only, and a move costs a few row
+    additions instead of a full first layer. Only the small hidden and output layers run
+    per evaluation, in int16/int32 NumPy arithmetic.
+
+    Instances are callable like Evaluation.evaluate and can be passed to Search. Without
+    weights (see from_file()) or on boards other than 8x8 material evaluation is used.
+    <refreshes> and <updates> count accumulators computed anew and incrementally.
+    """
+
+    def __init__(self, weights: Optional[NnueWeights] = None) -> None:
+        self.weights = weights
+        self.refreshes = 0
+        self.updates = 0
+
+    @staticmethod
+    def from_file(path: Optional[str]) -> NnueEvaluation:
+        """Return evaluation with weights from <path>. If NumPy is not installed or the file
+        cannot be loaded, the evaluation falls back to material.
+        """
+
+        if path is None:
+            return NnueEvaluation()
+        try:
+            return NnueEvaluation(NnueWeights.load(path))
+        except (ImportError, OSError, KeyError, ValueError):
+            return NnueEvaluation()
+
+    def __call__(self, game: Game) -> int:
+        """Return score from the point of view of <game.turn> side."""
+
+        board = game.board
+        if self.weights is None or board.width != SIDE or board.height != SIDE:
+            return Evaluation.evaluate(game)
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        accumulators = self.accumulators(board)
+        own = accumulators[game.turn.value]
+        enemy = accumulators[1 - game.turn.value]
+        inputs = numpy.clip(numpy.concatenate([own, enemy]), 0, ACTIVATION_MAX).astype(
+            numpy.int32
+        )
+        hidden = inputs @ self.weights.hidden_weight + self.weights.hidden_bias
+        hidden = numpy.clip(hidden >> HIDDEN_SHIFT, 0, ACTIVATION_MAX)
+        output = hidden @ self.weights.output_weight + self.weights.output_bias
+        return int(output) // OUTPUT_SCALE
+
+    def accumulators(self, board: Board) -> Any:
+        """Return (2, A) int16 array of accumulators indexed by perspective Colour.value."""
+
+        chain: List[Board] = []
+        node = board
+        while True:
+            cache = node.evaluation_cache
+            if cache is not None and cache[0] is self.weights:
+                accumulators = cache[1]
+                break
+            base = node.base()
+            if base is None:
+                accumulators = self._refresh(node)
+                node.set_evaluation_cache((self.weights, accumulators))
+                break
+            chain.append(node)
+            node = base
+        for node in reversed(chain):
+            accumulators = accumulators.copy()
+            for added, piece, pos in node.changes:
+                for perspective in [Colour.WHITE, Colour.BLACK]:
+                    row = self.weights.ft_weight[_feature(perspective, piece, pos)]
+                    if added:
+                        accumulators[perspective.value] += row
+                    else:
+                        accumulators[perspective.value] -= row
+            node.set_evaluation_cache((self.weights, accumulators))
+            self.updates += 1
+        return accumulators
+
+    def _refresh(self, board: Board) -> Any:
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        self.refreshes += 1
+        accumulators = numpy.empty((2, self.weights.ft_bias.shape[0]), numpy.int16)
+        for perspective in [Colour.WHITE, Colour.BLACK]:
+            features = [
+                _feature(perspective, board.get_piece(pos), pos)
+                for side in [Colour.WHITE, Colour.BLACK]
+                for pos in board.get_positions_for_side(side)
+            ]
+            accumulators[perspective.value] = (
+                self.weights.ft_bias
+                + self.weights.ft_weight[features].sum(axis=0, dtype=numpy.int16)
+            )
+        return accumulators
+
+
+def _feature(perspective: Colour, piece: Piece, pos: Position) -> int:
+    y = pos.y if perspective == Colour.WHITE else SIDE - 1 - pos.y
+    enemy = 0 if piece.colour == perspective else 1
+    plane = enemy * len(PLANE_TYPES) + _TYPE_INDEX[piece.type]
+    return (plane * SIDE + y) * SIDE + pos.x
+
+
+_TYPE_INDEX = {piece_type: index for index, piece_type in enumerate(PLANE_TYPES)}
+_DTYPES = ["int16", "int16", "int16", "int32", "int16", "int32"]
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from engine.evaluation import Evaluation
+from engine.fen import Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.nnue import NnueEvaluation, NnueWeights
+from entities.move import Move
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+MOVES = "e2e4 d7d5 e4d5 g8f6 f1b5 c7c6 d5c6 d8d2 b1d2 b7c6 e1g1".split()
+
+
+class TestNnueEvaluation(unittest.TestCase):
+    """Test of NnueEvaluation class."""
+
+    def test_fallback(self):
+        """Without weights material evaluation is used."""
+
+        game = Fen.parse("4k3/8/8/8/8/8/8/R3K3 b - - 0 1")
+        for evaluate in [
+            NnueEvaluation(),
+            NnueEvaluation.from_file(None),
+            NnueEvaluation.from_file(
+                os.path.join(tempfile.gettempdir(), "missing.npz")
+            ),
+        ]:
+            assert evaluate.weights is None
+            assert evaluate(game) == Evaluation.evaluate(game)
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_incremental_accumulators(self):
+        """Accumulators updated move by move are equal to ones computed anew."""
+
+        weights = NnueWeights.random(accumulator=16, hidden=8)
+        evaluate = NnueEvaluation(weights)
+        game = Game.create_start_game()
+        evaluate(game)
+        for text in MOVES:
+            game = GameLogic.make_move(Move.from_uci(text), game)
+            # Evaluate every other position: updates go through unevaluated parents.
+            if game.turn.value == 0:
+                board = Fen.parse(Fen.dump(game)).board
+                expected = NnueEvaluation(weights).accumulators(board)
+                assert (evaluate.accumulators(game.board) == expected).all()
+        assert evaluate.refreshes == 1
+        # The last position, black to move, is not evaluated.
+        assert evaluate.updates == len(MOVES) - 1
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_load(self):
+        """Test of NnueWeights.load(): saved weights give the same evaluation."""
+
+        weights = NnueWeights.random(accumulator=16, hidden=8, seed=1)
+        game = Fen.parse(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weights.npz")
+            weights.save(path)
+            evaluate = NnueEvaluation.from_file(path)
+        assert evaluate.weights is not None
+        assert evaluate(game) == NnueEvaluation(weights)(game)
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from engine.evaluation import Evaluation
+from engine.game import Game
+from engine.search import Search, SearchResult
+from engine.transposition import TranspositionTable
+
+
+class ParallelSearch:
+    """Lazy SMP: several processes search the same root and share a transposition table.
+
+    Workers do not split the tree. Each runs a full iterative deepening Search, odd helpers
+    one ply deeper than asked, and they speed each other up through the shared table:
+    results of any worker cut off or order moves of the others. Once the main worker (index 0)
+    finishes, the helpers are stopped. The deepest completed result is returned, nodes are
+    summed over all workers.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        table_entries: int = 1 << 18,
+        evaluate: Callable[[Game], int] = Evaluation.evaluate,
+    ) -> None:
+        """<workers> = None uses one process per CPU. <evaluate> must be picklable."""
+
+        self._workers = workers or os.cpu_count() or 1
+        self._table_entries = table_entries
+        self._evaluate = evaluate
+
+    def search(self, game: Game, depth: int) -> SearchResult:
+        with TranspositionTable(self._table_entries) as table:
+            stop_event = multiprocessing.Event()
+            with ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_init_worker,
+                initargs=(table.name, stop_event, self._evaluate),
+            ) as executor:
+                futures = [
+                    executor.submit(_search, game, depth + index % 2)
+                    for index in range(self._workers)
+                ]
+                main_result = futures[0].result()
+                stop_event.set()
+                results = [main_result, *(future.result() for future in futures[1:])]
+
+        best = max(results, key=lambda result: result.depth)
+        if best.depth <= main_result.depth:
+            best = main_result
+        return best._replace(nodes=sum(result.nodes for result in results))
+
+
+# Per process state of workers, set by _init_worker: state, not constants.
+_worker_table: Optional[TranspositionTable] = None  # pylint: disable=invalid-name
+_worker_stop_event = None  # pylint: disable=invalid-name
+_worker_evaluate: Callable[[Game], int] = Evaluation.evaluate
+
+
+def _init_worker(table_name: str, stop_event, evaluate: Callable[[Game], int]) -> None:
+    # pylint: disable=global-statement
+    global _worker_table, _worker_stop_event, _worker_evaluate
+    _worker_table = TranspositionTable.attach(table_name)
+    _worker_stop_event = stop_event
+    _worker_evaluate = evaluate
+
+
+def _search(game: Game, depth: int) -> SearchResult:
+    return Search(
+        _worker_evaluate,
+        transposition_table=_worker_table,
+        stop=_worker_stop_event.is_set,
+    ).search(game, depth)
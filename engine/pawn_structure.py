@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from engine.position_cache import CacheStats
+from entities.board import Board
+from entities.colour import Colour
+from entities.pieces import Piece, PieceType
+from entities.position import Position
+
+
+class PawnStructure:
+    """Pawn structure terms of evaluation in centipawns, from the point of view of white.
+    Terms depend on pawns only (structure) or on pawns and one king (shield), so they are
+    cached by Board.pawn_key in PawnHashTable.
+    """
+
+    DOUBLED_PENALTY = 12
+    ISOLATED_PENALTY = 15
+    BACKWARD_PENALTY = 8
+    # Bonus of passed pawn by number of ranks it has advanced from its start rank.
+    PASSED_BONUS = [0, 10, 15, 25, 40, 60, 90]
+    # Bonus of own pawn in front of the king by distance from the king rank (1 or 2).
+    SHIELD_BONUS = [0, 12, 6]
+
+    @staticmethod
+    def structure(board: Board) -> int:
+        """Return score of doubled, isolated, backward and passed pawns."""
+
+        files = [_pawn_files(board, colour) for colour in [Colour.WHITE, Colour.BLACK]]
+        score = 0
+        for colour in [Colour.WHITE, Colour.BLACK]:
+            own, enemy = files[colour.value], files[1 - colour.value]
+            forward = 1 if colour == Colour.WHITE else -1
+            start_rank = 1 if colour == Colour.WHITE else board.height - 2
+            side_score = 0
+            for x, ranks in own.items():
+                side_score -= PawnStructure.DOUBLED_PENALTY * (len(ranks) - 1)
+                neighbours = own.get(x - 1, []) + own.get(x + 1, [])
+                for y in ranks:
+                    if not neighbours:
+                        side_score -= PawnStructure.ISOLATED_PENALTY
+                    elif _is_backward(x, y, forward, neighbours, enemy):
+                        side_score -= PawnStructure.BACKWARD_PENALTY
+                    if _is_passed(x, y, forward, enemy):
+                        advance = min(
+                            (y - start_rank) * forward,
+                            len(PawnStructure.PASSED_BONUS) - 1,
+                        )
+                        side_score += PawnStructure.PASSED_BONUS[max(advance, 0)]
+            score += side_score if colour == Colour.WHITE else -side_score
+        return score
+
+    @staticmethod
+    def shield(board: Board, colour: Colour, king: Position) -> int:
+        """Return bonus of <colour> pawns on the king file and the adjacent ones in front
+        of <king>. The bonus is positive for either colour.
+        """
+
+        forward = 1 if colour == Colour.WHITE else -1
+        pawn = Piece(PieceType.PAWN, colour)
+        bonus = 0
+        for x in [king.x - 1, king.x, king.x + 1]:
+            for distance in [1, 2]:
+                if board.get_piece(Position(x, king.y + distance * forward)) == pawn:
+                    bonus += PawnStructure.SHIELD_BONUS[distance]
+                    break
+        return bonus
+
+
+class PawnHashTable:
+    """Fixed-size cache of pawn structure scores indexed by Board.pawn_key.
+
+    An entry is replaced by any other pawn structure mapped to the same slot. Shield scores
+    are stored in the entry too, per king position, since they depend on the same pawns.
+    """
+
+    def __init__(self, entries: int = 1 << 14) -> None:
+        if entries <= 0 or entries & (entries - 1):
+            raise ValueError(
+                f"Number of entries must be a power of two, got {entries}."
+            )
+        self._mask = entries - 1
+        self._keys: List[Optional[int]] = [None] * entries
+        self._scores = [0] * entries
+        self._shields: List[Optional[Dict[Tuple[Colour, Position], int]]] = [
+            None
+        ] * entries
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def score(self, board: Board) -> int:
+        """Return pawn structure score of <board> and shields of both kings."""
+
+        index = self._slot(board)
+        score = self._scores[index]
+        shields = self._shields[index]
+        for colour in [Colour.WHITE, Colour.BLACK]:
+            king = board.king_position(colour)
+            if king is None:
+                continue
+            shield = shields.get((colour, king))
+            if shield is None:
+                shield = shields[(colour, king)] = PawnStructure.shield(
+                    board, colour, king
+                )
+            score += shield if colour == Colour.WHITE else -shield
+        return score
+
+    def stats(self) -> CacheStats:
+        """Return statistics of structure lookups. <size> is the number of filled slots."""
+
+        return CacheStats(
+            self._hits,
+            self._misses,
+            self._evictions,
+            sum(key is not None for key in self._keys),
+            len(self._keys),
+        )
+
+    def clear(self) -> None:
+        """Drop all entries and reset statistics."""
+
+        self._keys = [None] * len(self._keys)
+        self._scores = [0] * len(self._keys)
+        self._shields = [None] * len(self._keys)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _slot(self, board: Board) -> int:
+        """Return slot of <board> pawn structure, computing the structure on a miss."""
+
+        key = board.pawn_key
+        index = key & self._mask
+        if self._keys[index] == key:
+            self._hits += 1
+            return index
+        self._misses += 1
+        if self._keys[index] is not None:
+            self._evictions += 1
+        self._keys[index] = key
+        self._scores[index] = PawnStructure.structure(board)
+        self._shields[index] = {}
+        return index
+
+
+def _pawn_files(board: Board, colour: Colour) -> Dict[int, List[int]]:
+    """Return ranks of <colour> pawns by file."""
+
+    files: Dict[int, List[int]] = {}
+    for pos in board.get_positions_for_piece(Piece(PieceType.PAWN, colour)):
+        files.setdefault(pos.x, []).append(pos.y)
+    return files
+
+
+def _is_passed(x: int, y: int, forward: int, enemy: Dict[int, List[int]]) -> bool:
+    """Check if no enemy pawn stands in front of the pawn on its or adjacent files."""
+
+    return not any(
+        (enemy_y - y) * forward > 0
+        for file in [x - 1, x, x + 1]
+        for enemy_y in enemy.get(file, [])
+    )
+
+
+def _is_backward(
+    x: int,
+    y: int,
+    forward: int,
+    neighbours: List[int],
+    enemy: Dict[int, List[int]],
+) -> bool:
+    """Check if all pawns on adjacent files are in front of the pawn and the position in
+    front of it is attacked by an enemy pawn.
+    """
+
+    if any((neighbour_y - y) * forward <= 0 for neighbour_y in neighbours):
+        return False
+    stop_y = y + forward
+    return any(stop_y + forward in enemy.get(file, []) for file in [x - 1, x + 1])
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.evaluation import Evaluation, StructureEvaluation
+from engine.fen import Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.pawn_structure import PawnHashTable, PawnStructure
+from entities.colour import Colour
+from entities.move import Move
+from entities.position import Position
+
+
+class TestPawnStructure(unittest.TestCase):
+    """Test of PawnStructure and PawnHashTable classes."""
+
+    def test_structure(self):
+        """Test of structure() method with every term."""
+
+        def structure(fen: str) -> int:
+            return PawnStructure.structure(Fen.parse(fen).board)
+
+        assert structure("4k3/pppppppp/8/8/8/8/PPPPPPPP/4K3 w - - 0 1") == 0
+        # Isolated passed pawn advanced by 3 ranks.
+        assert structure("4k3/8/8/3P4/8/8/8/4K3 w - - 0 1") == (
+            PawnStructure.PASSED_BONUS[3] - PawnStructure.ISOLATED_PENALTY
+        )
+        # Doubled isolated pawns of black.
+        assert structure("4k3/3p4/3p4/8/8/8/3P4/4K3 w - - 0 1") == (
+            PawnStructure.DOUBLED_PENALTY + PawnStructure.ISOLATED_PENALTY
+        )
+        # Pawn on d2 is backward: c3 pawn is in front and e4 pawn attacks d3. Black e4 pawn
+        # is isolated, but not passed.
+        assert structure("4k3/8/8/8/4p3/2P5/3P4/4K3 w - - 0 1") == (
+            -PawnStructure.BACKWARD_PENALTY
+            + PawnStructure.PASSED_BONUS[1]
+            + PawnStructure.ISOLATED_PENALTY
+        )
+
+    def test_shield(self):
+        """Test of shield() method."""
+
+        board = Fen.parse("6k1/5p1p/6p1/8/8/8/5PPP/6K1 w - - 0 1").board
+        assert PawnStructure.shield(board, Colour.WHITE, Position(6, 0)) == 36
+        assert PawnStructure.shield(board, Colour.BLACK, Position(6, 7)) == 30
+
+    def test_pawn_key(self):
+        """Test of Board.pawn_key: changed by pawns only, restored by the same structure."""
+
+        game = Game.create_start_game()
+        start_key = game.board.pawn_key
+        for uci in ["g1f3", "g8f6"]:
+            game = GameLogic.make_move(Move.from_uci(uci), game)
+        assert game.board.pawn_key == start_key
+        game = GameLogic.make_move(Move.from_uci("e2e4"), game)
+        assert game.board.pawn_key != start_key
+        assert game.board.snapshot().pawn_key == game.board.pawn_key
+        fen = "rnbqkb1r/pppppppp/5n2/8/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 0 2"
+        assert Fen.parse(fen).board.pawn_key == game.board.pawn_key
+
+    def test_table(self):
+        """Test of PawnHashTable: positions with the same pawns share the entry."""
+
+        table = PawnHashTable(entries=4)
+        game = Game.create_start_game()
+        first = table.score(game.board)
+        game = GameLogic.make_move(Move.from_uci("g1f3"), game)
+        assert table.score(game.board) == first
+        stats = table.stats()
+        assert (stats.hits, stats.misses, stats.size, stats.capacity) == (1, 1, 1, 4)
+        table.clear()
+        assert table.stats().size == 0
+        self.assertRaises(ValueError, PawnHashTable, 3)
+
+    def test_structure_evaluation(self):
+        """Test of StructureEvaluation: material plus pawn terms, from the side to move."""
+
+        evaluate = StructureEvaluation()
+        game = Fen.parse("4k3/8/8/3P4/8/8/8/4K3 b - - 0 1")
+        assert evaluate(game) == Evaluation.evaluate(game) - (
+            PawnStructure.structure(game.board)
+        )
@@ -6,6 +6,8 @@ from typing import List
 
 from engine.game import Game
 from engine.positions_under_threat import PositionsUnderThreat
+from entities.board import Board
+from entities.castling_rights import CastlingRights
 from entities.colour import Colour
 from entities.move import Move
 from entities.pieces import PieceType
@@ -19,6 +21,14 @@ class PieceMoves:
     ATTENTION: not taking into account check after moves, doing it ONLY for castling!!!
     """
 
+    # Piece types pawn can be promoted to. Queen goes first: it is the default promotion.
+    PROMOTION_TYPES = [
+        PieceType.QUEEN,
+        PieceType.ROOK,
+        PieceType.BISHOP,
+        PieceType.KNIGHT,
+    ]
+
     @staticmethod
     def moves(piece_type: PieceType, position: Position, game: Game) -> List[Move]:
         """Return list of possible moves by piece from <game.turn> side."""
@@ -74,7 +84,11 @@ class PieceMoves:
             for shift_x, shift_y in shifts:
                 # Retrieve not start piece.
                 piece = game.board.get_piece(Position(pos.x + shift_x, pos.y + shift_y))
-                if piece is not None and piece.type == PieceType.PAWN:
+                if (
+                    piece is not None
+                    and piece.type == PieceType.PAWN
+                    and game.history_moves
+                ):
                     # Retrieve last_move.
                     last_move = game.history_moves[-1]
                     # Check if pawn makes the last move and if it jumps over 2 positions.
@@ -95,74 +109,84 @@ class PieceMoves:
     def castling_moves(pos: Position, game: Game) -> List[Move]:
         """Return list of <game.turn> castling moves.
         Check is taking into account!!!
+        Castling rights are taken from <game.castling_rights>. If they are unknown, rights are
+        derived from history: king and rook must be untouched.
         """
 
         # Init catling list.
         castling = []
         # Retrieve piece at start position.
         piece_start = game.board.get_piece(pos)
-        # Retrieve positions under threat (important info for castling).
-        pos_under_threat = PositionsUnderThreat.all_positions_under_threat_for_side(
-            game.turn, game.board
-        )
-        # Check if piece piece at start position King with no threat/check.
-        if (
-            piece_start is not None
-            and piece_start.type == PieceType.KING
-            and not PieceMoves.is_piece_touched(pos, game)
-            and pos not in pos_under_threat
-        ):
-            # Short castling. _1r_ means 1 pos to the right from white side.
-            is_1r_pos_avail = (
-                game.board.is_position_empty(Position(pos.x + 1, pos.y))
-                and Position(pos.x + 1, pos.y) not in pos_under_threat
-            )
-            is_2r_pos_avail = (
-                game.board.is_position_empty(Position(pos.x + 2, pos.y))
-                and Position(pos.x + 2, pos.y) not in pos_under_threat
-            )
-            is_3r_pos_rook = (
-                not game.board.is_position_empty(Position(pos.x + 3, pos.y))
-                and game.board.get_piece(Position(pos.x + 3, pos.y)).type
-                == PieceType.ROOK
+        if piece_start is None or piece_start.type != PieceType.KING:
+            return castling
+        geometry = game.board.geometry
+        # Check castling rights.
+        if game.castling_rights is None:
+            is_king_untouched = not PieceMoves.is_piece_touched(pos, game)
+            has_short_right = is_king_untouched and not PieceMoves.is_piece_touched(
+                Position(geometry.castling_rook_x(True), pos.y), game
             )
-            if (
-                is_1r_pos_avail
-                and is_2r_pos_avail
-                and is_3r_pos_rook
-                and not PieceMoves.is_piece_touched(Position(pos.x + 3, pos.y), game)
-            ):
-                move = Move(pos, Position(pos.x + 2, pos.y))
-                castling.append(move)
-            # Long castling. _1l_ means 1 pos to the left from white side.
-            is_1l_pos_avail = (
-                game.board.is_position_empty(Position(pos.x - 1, pos.y))
-                and Position(pos.x - 1, pos.y) not in pos_under_threat
+            has_long_right = is_king_untouched and not PieceMoves.is_piece_touched(
+                Position(geometry.castling_rook_x(False), pos.y), game
             )
-            is_2l_pos_avail = (
-                game.board.is_position_empty(Position(pos.x - 2, pos.y))
-                and Position(pos.x - 2, pos.y) not in pos_under_threat
-            )
-            is_4l_pos_rook = (
-                not game.board.is_position_empty(Position(pos.x - 4, pos.y))
-                and game.board.get_piece(Position(pos.x - 4, pos.y)).type
-                == PieceType.ROOK
+        else:
+            if game.turn == Colour.WHITE:
+                short_right, long_right = (
+                    CastlingRights.WHITE_SHORT,
+                    CastlingRights.WHITE_LONG,
+                )
+            else:
+                short_right, long_right = (
+                    CastlingRights.BLACK_SHORT,
+                    CastlingRights.BLACK_LONG,
+                )
+            has_short_right = bool(game.castling_rights & short_right)
+            has_long_right = bool(game.castling_rights & long_right)
+        has_short_right = has_short_right and geometry.can_castle(True)
+        has_long_right = has_long_right and geometry.can_castle(False)
+        # Check if king is under threat/check.
+        if not (has_short_right or has_long_right) or (
+            PositionsUnderThreat.is_position_under_threat(pos, game.turn, game.board)
+        ):
+            return castling
+
+        def is_pos_avail(shift_x: int) -> bool:
+            """Check if position is empty and not under threat."""
+
+            shifted_pos = Position(pos.x + shift_x, pos.y)
+            return game.board.is_position_empty(
+                shifted_pos
+            ) and not PositionsUnderThreat.is_position_under_threat(
+                shifted_pos, game.turn, game.board
             )
-            if (
-                is_1l_pos_avail
-                and is_2l_pos_avail
-                and is_4l_pos_rook
-                and game.board.is_position_empty(Position(pos.x - 3, pos.y))
-                and not PieceMoves.is_piece_touched(Position(pos.x - 4, pos.y), game)
-            ):
-                move = Move(pos, Position(pos.x - 2, pos.y))
-                castling.append(move)
+
+        def is_path_avail(short: bool) -> bool:
+            """Check if the rook is in place, positions between king and rook are empty and
+            1 and 2 positions towards the rook are not under threat.
+            """
+
+            rook_x = geometry.castling_rook_x(short)
+            piece = game.board.get_piece(Position(rook_x, pos.y))
+            if piece is None or piece.type != PieceType.ROOK:
+                return False
+            step = 1 if short else -1
+            return all(
+                game.board.is_position_empty(Position(x, pos.y))
+                for x in range(pos.x + step, rook_x, step)
+            ) and all(is_pos_avail(shift_x) for shift_x in [step, 2 * step])
+
+        # Short castling to the right from white side, long castling to the left.
+        if has_short_right and is_path_avail(True):
+            castling.append(Move(pos, Position(pos.x + 2, pos.y)))
+        if has_long_right and is_path_avail(False):
+            castling.append(Move(pos, Position(pos.x - 2, pos.y)))
         return castling
 
     @staticmethod
     def pawn_moves(pos: Position, game: Game) -> List[Move]:
         """Return list of <game.turn> pawn moves.
         pawn moves = positions_under_threat + move forward + en_passant
+        Move to the last rank is returned once per promotion piece type.
         """
 
         # Init move list
@@ -180,21 +204,48 @@ class PieceMoves:
         # Check forward move.
         shift_forward_y = 1 if game.turn == Colour.WHITE else -1
         pos_forward = Position(pos.x, pos.y + shift_forward_y)
-        if game.board.is_position_empty(pos_forward):
+        if Board.is_position_on_board(
+            pos_forward, game.board
+        ) and game.board.is_position_empty(pos_forward):
             move = Move(pos, pos_forward)
             moves.append(move)
-        # Check double move forward
+        # Check double move forward. Only pawns from start rank make it.
         shift_forward_y = 2 if game.turn == Colour.WHITE else -2
         pos_d_forward = Position(pos.x, pos.y + shift_forward_y)
         if (
-            game.board.is_position_empty(pos_forward)
+            pos.y == PieceMoves.pawn_start_rank(game.turn, game.board)
+            and Board.is_position_on_board(pos_d_forward, game.board)
+            and game.board.is_position_empty(pos_forward)
             and game.board.is_position_empty(pos_d_forward)
-            and not PieceMoves.is_piece_touched(pos, game)
         ):
             move = Move(pos, pos_d_forward)
             moves.append(move)
+        # Replace moves to the last rank with promotions.
+        last_rank = PieceMoves.pawn_last_rank(game.turn, game.board)
+        if pos.y + (1 if game.turn == Colour.WHITE else -1) == last_rank:
+            moves = [
+                Move(move.start, move.finish, promotion)
+                for move in moves
+                for promotion in PieceMoves.PROMOTION_TYPES
+            ]
         return moves
 
+    @staticmethod
+    def pawn_start_rank(colour: Colour, board: Board) -> int:
+        """Return rank (y) pawns of <colour> side start from."""
+
+        if colour == Colour.WHITE:
+            return board.y_corners["min"] + 1
+        return board.y_corners["max"] - 1
+
+    @staticmethod
+    def pawn_last_rank(colour: Colour, board: Board) -> int:
+        """Return rank (y) pawns of <colour> side are promoted on."""
+
+        if colour == Colour.WHITE:
+            return board.y_corners["max"]
+        return board.y_corners["min"]
+
     @staticmethod
     def rook_moves(pos: Position, game: Game) -> List[Move]:
         """Return list of <game.turn> rook moves.
@@ -94,3 +94,15 @@ class TestPieceMoves(unittest.TestCase):
             Move(Position(7, 1), Position(7, 2)),
             Move(Position(7, 1), Position(7, 3)),
         ]
+
+    def test_pawn_moves_promotion(self):
+        """Test of pawn_moves() method: move to the last rank is a promotion.
+        Pawn captures rook on (2, 7) or moves forward.
+        """
+
+        self.board.set_piece(Position(1, 6), Pieces.WHITE_PAWN)
+        assert PieceMoves.pawn_moves(Position(1, 6), self.game) == [
+            Move(Position(1, 6), finish, promotion)
+            for finish in [Position(2, 7), Position(1, 7)]
+            for promotion in PieceMoves.PROMOTION_TYPES
+        ]
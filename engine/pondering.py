@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+from engine.evaluation import Evaluation
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.search import Search, SearchResult
+from engine.transposition import TranspositionTable
+
+
+class PonderingPlayer:
+    """Computer opponent which thinks on the opponent's time.
+
+    play() searches the position, makes the best move with GameLogic.make_move and, if
+    <ponder> is enabled, predicts the opponent's reply (see Search.ponder_move()) and
+    starts searching the position after it in a background thread. When play() is called
+    again after a reply:
+    - ponder hit (the predicted position): the background search continues with
+      <time_limit> counted from now, and its result is played;
+    - ponder miss: the background search is stopped and the position is searched anew.
+    All searches share one transposition table, so the work of a cancelled ponder search
+    still orders moves and cuts off the next one.
+
+    Searches go till <depth> plies or <time_limit> seconds (None - no time limit). Pondering
+    has no time limit, so it stops at <depth> at the latest.
+    """
+
+    def __init__(
+        self,
+        depth: int = 4,
+        time_limit: Optional[float] = None,
+        evaluate: Callable[[Game], int] = Evaluation.evaluate,
+        ponder: bool = True,
+        table_entries: int = 1 << 16,
+    ) -> None:
+        self._depth = depth
+        self._time_limit = time_limit
+        self._evaluate = evaluate
+        self._ponder = ponder
+        self._table = TranspositionTable(table_entries)
+        self.last_result: Optional[SearchResult] = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # State of the background search: position hash it searches, result once it
+        # finishes, deadline set on ponder hit.
+        self._ponder_thread: Optional[threading.Thread] = None
+        self._ponder_stop = threading.Event()
+        self._ponder_hash: Optional[int] = None
+        self._ponder_result: Optional[SearchResult] = None
+        self._deadline: Optional[float] = None
+
+    def __enter__(self) -> PonderingPlayer:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def play(self, game: Game) -> Game:
+        """Make the best move of <game.turn> side and return the game after it. <game> must
+        have a legal move.
+        """
+
+        result = None
+        if self._ponder_thread is not None:
+            if GameLogic.position_hash(game) == self._ponder_hash:
+                self.ponder_hits += 1
+                if self._time_limit is not None:
+                    self._deadline = time.monotonic() + self._time_limit
+                self._ponder_thread.join()
+                self._ponder_thread = None
+                result = self._ponder_result
+            else:
+                self.ponder_misses += 1
+                self.stop_pondering()
+        if result is None or result.best_move is None:
+            deadline = (
+                time.monotonic() + self._time_limit
+                if self._time_limit is not None
+                else None
+            )
+            result = self._search(
+                game, lambda: deadline is not None and time.monotonic() >= deadline
+            )
+        self.last_result = result
+        further_game = GameLogic.make_move(result.best_move, game)
+        if self._ponder:
+            reply = Search(transposition_table=self._table).ponder_move(game, result)
+            if reply is not None:
+                predicted_game = GameLogic.make_move(reply, further_game)
+                if GameLogic.has_legal_move(predicted_game):
+                    self._start_pondering(predicted_game)
+        return further_game
+
+    def is_pondering(self) -> bool:
+        return self._ponder_thread is not None
+
+    def stop_pondering(self) -> None:
+        """Stop the background search if it is running and wait till it finishes."""
+
+        if self._ponder_thread is not None:
+            self._ponder_stop.set()
+            self._ponder_thread.join()
+            self._ponder_thread = None
+
+    def close(self) -> None:
+        self.stop_pondering()
+        self._table.close()
+
+    def _search(self, game: Game, stop: Callable[[], bool]) -> SearchResult:
+        return Search(
+            self._evaluate, transposition_table=self._table, stop=stop
+        ).search(game, self._depth)
+
+    def _start_pondering(self, game: Game) -> None:
+        stop_event = self._ponder_stop = threading.Event()
+        self._ponder_hash = GameLogic.position_hash(game)
+        self._ponder_result = None
+        self._deadline = None
+
+        def should_stop() -> bool:
+            return stop_event.is_set() or (
+                self._deadline is not None and time.monotonic() >= self._deadline
+            )
+
+        def run() -> None:
+            self._ponder_result = self._search(game, should_stop)
+
+        self._ponder_thread = threading.Thread(target=run, daemon=True)
+        self._ponder_thread.start()
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.fen import Fen
+from engine.logic import GameLogic
+from engine.pondering import PonderingPlayer
+from entities.move import Move
+
+FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+class TestPonderingPlayer(unittest.TestCase):
+    """Test of PonderingPlayer class."""
+
+    def test_ponder_hit(self):
+        """Predicted reply continues the background search."""
+
+        with PonderingPlayer(depth=2, table_entries=1 << 12) as player:
+            game = player.play(Fen.parse(FEN))
+            assert player.is_pondering()
+            predicted = player.last_result.pv[1]
+            game = player.play(GameLogic.make_move(predicted, game))
+            assert player.ponder_hits == 1
+            assert player.ponder_misses == 0
+            assert len(game.history_moves) == 3
+
+    def test_ponder_miss(self):
+        """Another reply cancels the background search."""
+
+        with PonderingPlayer(depth=2, table_entries=1 << 12) as player:
+            game = player.play(Fen.parse(FEN))
+            predicted = player.last_result.pv[1]
+            reply = next(
+                move for move in GameLogic.legal_moves(game) if move != predicted
+            )
+            game = GameLogic.make_move(reply, game)
+            player.play(game)
+            assert player.ponder_hits == 0
+            assert player.ponder_misses == 1
+            assert player.last_result.best_move in list(GameLogic.legal_moves(game))
+
+    def test_no_ponder(self):
+        """Pondering can be disabled."""
+
+        with PonderingPlayer(depth=1, ponder=False, table_entries=1 << 12) as player:
+            game = player.play(Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1"))
+            assert game.history_moves[-1] == Move.from_uci("d2d5")
+            assert not player.is_pondering()
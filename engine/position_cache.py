@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from engine.check_info import CheckInfo
+from engine.game import Game
+from engine.logic import GameLogic
+from entities.move import Move
+from entities.position import Position
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry:
+    """Lazily filled results for one position."""
+
+    __slots__ = ["legal_moves", "is_check", "is_mate", "check_info", "destinations"]
+
+    def __init__(self) -> None:
+        self.legal_moves: Optional[Tuple[Move, ...]] = None
+        self.is_check: Optional[bool] = None
+        self.is_mate: Optional[bool] = None
+        self.check_info: Optional[CheckInfo] = None
+        # Legal destinations of already queried positions.
+        self.destinations: Optional[Dict[Position, FrozenSet[Position]]] = None
+
+
+class PositionCache:
+    """LRU-bounded cache of legal moves, check and mate results keyed by position hash.
+
+    Invalidation: the key is GameLogic.position_hash(), which covers pieces, turn, castling rights
+    and en passant, i.e. everything the rules depend on. Any change of a board through
+    set_piece()/remove_piece() changes the key, so entries never become stale and there is
+    nothing to invalidate on moves. clear() is needed only if rules themselves change.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Cache capacity must be positive, got {capacity}.")
+        self._capacity = capacity
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def legal_moves(self, game: Game) -> List[Move]:
+        """Return all legal moves of <game.turn> side."""
+
+        return list(
+            self._lookup(
+                game, "legal_moves", lambda: tuple(GameLogic.legal_moves(game))
+            )
+        )
+
+    def legal_moves_from(self, game: Game, pos: Position) -> List[Move]:
+        """Return legal moves of the piece standing on <pos>. Used for highlighting."""
+
+        return [move for move in self.legal_moves(game) if move.start == pos]
+
+    def legal_destinations(self, game: Game, pos: Position) -> FrozenSet[Position]:
+        """Return positions the piece on <pos> can legally move to. Used for highlighting:
+        check and pin information is computed once per position and shared by all queries.
+        """
+
+        destinations = self._lookup(game, "destinations", dict)
+        result = destinations.get(pos)
+        if result is None:
+            result = destinations[pos] = GameLogic.legal_destinations(
+                game, pos, self.check_info(game)
+            )
+        return result
+
+    def check_info(self, game: Game) -> CheckInfo:
+        """Return check and pin information of <game.turn> side."""
+
+        return self._lookup(
+            game, "check_info", lambda: CheckInfo.of(game.board, game.turn)
+        )
+
+    def is_check(self, game: Game) -> bool:
+        """Check if <game.turn> side got check."""
+
+        return self._lookup(
+            game, "is_check", lambda: GameLogic.is_check(game.board, game.turn)
+        )
+
+    def is_mate(self, game: Game) -> bool:
+        """Check if <game.turn> side got mate. Reuses cached check and legal moves."""
+
+        return self._lookup(
+            game,
+            "is_mate",
+            lambda: self.is_check(game) and not self.legal_moves(game),
+        )
+
+    def is_move_legal(self, game: Game, move: Move) -> bool:
+        """Check if move is among legal moves. Used for validating submitted moves."""
+
+        return move in self.legal_moves(game)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self._capacity,
+            )
+
+    def resize(self, capacity: int) -> None:
+        """Change capacity. Least recently used entries are evicted if needed."""
+
+        if capacity <= 0:
+            raise ValueError(f"Cache capacity must be positive, got {capacity}.")
+        with self._lock:
+            self._capacity = capacity
+            self._evict()
+
+    def invalidate(self, game: Game) -> None:
+        """Drop cached results for the position of <game>."""
+
+        with self._lock:
+            self._entries.pop(GameLogic.position_hash(game), None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset statistics."""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _lookup(self, game: Game, field: str, compute: Callable):
+        key = GameLogic.position_hash(game)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                value = getattr(entry, field)
+                if value is not None:
+                    self._hits += 1
+                    return value
+            self._misses += 1
+        # Compute outside of the lock: computation may query the cache recursively.
+        value = compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+                self._evict()
+            else:
+                self._entries.move_to_end(key)
+            setattr(entry, field, value)
+        return value
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.position_cache import PositionCache
+from entities.board import Board
+from entities.colour import Colour
+from entities.move import Move
+from entities.pieces import Pieces
+from entities.position import Position
+
+
+class TestPositionCache(unittest.TestCase):
+    """Test of PositionCache class."""
+
+    def setUp(self) -> None:
+        """Create cache and start game."""
+
+        self.cache = PositionCache(capacity=2)
+        self.game = Game.create_start_game()
+
+    def test_legal_moves(self):
+        """Test of legal_moves() method. Second query is a hit."""
+
+        moves = self.cache.legal_moves(self.game)
+        assert len(moves) == 20
+        assert self.cache.legal_moves(self.game) == moves
+        assert sorted(self.cache.legal_moves_from(self.game, Position(6, 0))) == [
+            Move(Position(6, 0), Position(5, 2)),
+            Move(Position(6, 0), Position(7, 2)),
+        ]
+        stats = self.cache.stats()
+        assert stats.misses == 1
+        assert stats.hits == 2
+        assert stats.size == 1
+
+    def test_legal_destinations(self):
+        """Test of legal_destinations() method. Check info is computed once per position."""
+
+        assert self.cache.legal_destinations(self.game, Position(6, 0)) == {
+            Position(5, 2),
+            Position(7, 2),
+        }
+        assert self.cache.legal_destinations(self.game, Position(4, 1)) == {
+            Position(4, 2),
+            Position(4, 3),
+        }
+        assert not self.cache.legal_destinations(self.game, Position(4, 0))
+        assert not self.cache.legal_destinations(self.game, Position(4, 6))
+        stats = self.cache.stats()
+        # One miss for destinations and one for check info of the position.
+        assert stats.misses == 2
+        assert stats.size == 1
+
+    def test_is_mate(self):
+        """Test of is_mate() and is_check() methods."""
+
+        board = Board()
+        board.set_piece(Position(0, 1), Pieces.WHITE_PAWN)
+        board.set_piece(Position(1, 1), Pieces.WHITE_PAWN)
+        board.set_piece(Position(0, 0), Pieces.WHITE_KING)
+        board.set_piece(Position(2, 0), Pieces.BLACK_ROOK)
+        game = Game(board, Colour.WHITE, [])
+        assert self.cache.is_mate(game)
+        assert self.cache.is_check(game)
+        assert not self.cache.legal_moves(game)
+        assert self.cache.stats().hits == 2
+
+    def test_board_change_changes_key(self):
+        """Changing the board must not return results of the previous position."""
+
+        assert len(self.cache.legal_moves(self.game)) == 20
+        self.game.board.remove_piece(Position(6, 0))
+        assert len(self.cache.legal_moves(self.game)) == 19
+        assert self.cache.stats().hits == 0
+
+    def test_lru_eviction(self):
+        """Test of eviction of least recently used positions."""
+
+        first = self.game
+        second = GameLogic.make_move(Move(Position(4, 1), Position(4, 3)), first)
+        third = GameLogic.make_move(Move(Position(4, 6), Position(4, 4)), second)
+        self.cache.is_check(first)
+        self.cache.is_check(second)
+        self.cache.is_check(first)
+        self.cache.is_check(third)
+        stats = self.cache.stats()
+        assert stats.evictions == 1
+        assert stats.size == 2
+        # <first> was used recently, so <second> was evicted.
+        self.cache.is_check(first)
+        assert self.cache.stats().hits == 2
+        self.cache.is_check(second)
+        assert self.cache.stats().misses == 4
+
+    def test_invalidate_and_clear(self):
+        """Test of invalidate(), clear() and resize() methods."""
+
+        self.cache.is_check(self.game)
+        self.cache.invalidate(self.game)
+        assert self.cache.stats().size == 0
+        self.cache.is_check(self.game)
+        self.cache.clear()
+        assert self.cache.stats() == (0, 0, 0, 0, 2)
+        self.cache.resize(1)
+        assert self.cache.stats().capacity == 1
+        self.assertRaises(ValueError, PositionCache, 0)
@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List
+
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.move_history import MoveHistory
+from entities.board import Board
+from entities.castling_rights import CastlingRights
+from entities.colour import Colour
+from entities.move import Move
+from entities.pieces import Piece, PieceType
+from entities.position import Position
+
+SIDE = 8
+MAX_PIECES = 32
+OCCUPANCY_SIZE = SIDE * SIDE // 8
+PIECES_SIZE = MAX_PIECES // 2
+# Occupancy bitmap, piece nibbles, state byte and en passant byte.
+SIZE = OCCUPANCY_SIZE + PIECES_SIZE + 2
+_PIECE_TYPES = list(PieceType)
+
+
+class PositionEncoding:
+    """Fixed-size binary encoding of 8x8 positions.
+
+    A position is encoded into SIZE bytes:
+    - occupancy bitmap: 8 bytes, big-endian, bit <y * 8 + x> set for occupied positions
+      (Board.occupancy());
+    - pieces: 16 bytes, one nibble (colour << 3 | PieceType.value) per occupied position in
+      bitmap order from bit 0, first piece in the high nibble, unused nibbles zero;
+    - state: turn (bit 0, set for black) and CastlingRights (bits 1-4);
+    - en passant: file + 1 of the pawn which can be captured en passant, 0 if there is none.
+
+    The encoding covers what GameLogic.position_hash() does, so equal positions have equal
+    codes and different positions different ones. Codes are plain bytes: hashable, sortable
+    and usable as dict, set or database keys. Halfmove clock and history are not encoded,
+    decode() returns a game with the position only.
+
+    Batches are concatenated codes, which are shipped between processes as one buffer.
+    encode_batch() and decode_batch() read and build Game objects, so they go position by
+    position: a Board is filled by set_piece() calls, which cost more than unpacking the
+    code. Array consumers read a batch without Python objects per position by squares().
+    NumPy is needed for the array methods only and is imported on first use.
+    """
+
+    @staticmethod
+    def encode(game: Game) -> bytes:
+        board = game.board
+        if board.width != SIDE or board.height != SIDE:
+            raise ValueError(f"Only {SIDE}x{SIDE} boards can be encoded")
+        occupancy = board.occupancy()
+        pieces = bytearray(PIECES_SIZE)
+        count = 0
+        bits = occupancy
+        while bits:
+            low_bit = bits & -bits
+            index = low_bit.bit_length() - 1
+            bits ^= low_bit
+            if count == MAX_PIECES:
+                raise ValueError(f"More than {MAX_PIECES} pieces cannot be encoded")
+            piece = board.get_piece(Position(index % SIDE, index // SIDE))
+            nibble = piece.colour.value << 3 | piece.type.value
+            pieces[count >> 1] |= nibble << 4 if count % 2 == 0 else nibble
+            count += 1
+        en_passant_file = GameLogic.en_passant_file(game)
+        state = game.turn.value | int(GameLogic.castling_rights(game)) << 1
+        return (
+            occupancy.to_bytes(OCCUPANCY_SIZE, "big")
+            + bytes(pieces)
+            + bytes([state, 0 if en_passant_file is None else en_passant_file + 1])
+        )
+
+    @staticmethod
+    def decode(code: bytes) -> Game:
+        if len(code) != SIZE:
+            raise ValueError(f"Position code must have {SIZE} bytes, got {len(code)}")
+        board = Board(SIDE, SIDE)
+        bits = int.from_bytes(code[:OCCUPANCY_SIZE], "big")
+        count = 0
+        while bits:
+            low_bit = bits & -bits
+            index = low_bit.bit_length() - 1
+            bits ^= low_bit
+            byte = code[OCCUPANCY_SIZE + (count >> 1)]
+            nibble = byte >> 4 if count % 2 == 0 else byte & 0xF
+            board.set_piece(
+                Position(index % SIDE, index // SIDE),
+                Piece(_PIECE_TYPES[nibble & 7], Colour(nibble >> 3)),
+            )
+            count += 1
+        state, en_passant = code[-2], code[-1]
+        turn = Colour(state & 1)
+        history_moves = MoveHistory()
+        if en_passant:
+            # Pawn of the opposite side has just jumped two ranks on the file.
+            x = en_passant - 1
+            y = 4 if turn == Colour.WHITE else 3
+            direction = 1 if turn == Colour.WHITE else -1
+            history_moves = MoveHistory(
+                [Move(Position(x, y + 2 * direction), Position(x, y))]
+            )
+        return Game(board, turn, history_moves, 0, CastlingRights((state >> 1) & 0xF))
+
+    @staticmethod
+    def encode_batch(games: Iterable[Game]) -> bytes:
+        """Return concatenated codes of <games>."""
+
+        return b"".join(PositionEncoding.encode(game) for game in games)
+
+    @staticmethod
+    def split(data: bytes) -> Iterator[bytes]:
+        """Yield codes of a batch."""
+
+        if len(data) % SIZE:
+            raise ValueError(f"Batch size {len(data)} is not a multiple of {SIZE}")
+        view = memoryview(data)
+        for start in range(0, len(data), SIZE):
+            yield bytes(view[start : start + SIZE])
+
+    @staticmethod
+    def decode_batch(data: bytes) -> List[Game]:
+        return [PositionEncoding.decode(code) for code in PositionEncoding.split(data)]
+
+    @staticmethod
+    def to_array(data: bytes):
+        """Return a batch as (count, SIZE) uint8 NumPy array sharing memory with <data>."""
+
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        if len(data) % SIZE:
+            raise ValueError(f"Batch size {len(data)} is not a multiple of {SIZE}")
+        return numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, SIZE)
+
+    @staticmethod
+    def squares(data: bytes):
+        """Return pieces of a batch as (count, 64) int8 NumPy array indexed by
+        y * 8 + x: colour << 3 | PieceType.value of the piece on the position, -1 if it is
+        empty. Occupancy bitmaps and piece nibbles of all codes are unpacked at once.
+        """
+
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        array = PositionEncoding.to_array(data)
+        # Bytes are big-endian and bits of a byte are unpacked from the highest one:
+        # reversed, column i is bit i.
+        occupied = numpy.unpackbits(array[:, :OCCUPANCY_SIZE], axis=1)[:, ::-1]
+        packed = array[:, OCCUPANCY_SIZE : OCCUPANCY_SIZE + PIECES_SIZE]
+        nibbles = numpy.stack([packed >> 4, packed & 0xF], axis=2).reshape(
+            -1, MAX_PIECES
+        )
+        # The n-th occupied position holds the n-th nibble.
+        ranks = numpy.clip(numpy.cumsum(occupied, axis=1) - 1, 0, MAX_PIECES - 1)
+        pieces = numpy.take_along_axis(nibbles, ranks, axis=1).astype(numpy.int8)
+        return numpy.where(occupied.astype(bool), pieces, numpy.int8(-1))
+
+    @staticmethod
+    def unique(data: bytes) -> bytes:
+        """Return sorted batch of distinct codes of <data>. Codes are compared and sorted
+        as whole records by NumPy, without creating a Python object per position.
+        """
+
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        array = PositionEncoding.to_array(data)
+        records = numpy.ascontiguousarray(array).view(numpy.dtype((numpy.void, SIZE)))
+        return numpy.unique(records.ravel()).tobytes()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+
+import importlib.util
+import pickle
+import unittest
+
+from engine.fen import START_FEN, Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.position_encoding import SIZE, PositionEncoding
+from entities.move import Move
+from entities.position import Position
+
+FENS = [
+    START_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "rnbqkbnr/pppp1ppp/8/8/3Pp3/5N2/PPP1PPPP/RNBQKB1R b Kq d3 0 3",
+    "8/8/8/8/8/8/8/k6K b - - 0 1",
+]
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class TestPositionEncoding(unittest.TestCase):
+    """Test of PositionEncoding class."""
+
+    def test_round_trip(self):
+        """Test of encode() and decode() methods."""
+
+        for fen in FENS:
+            game = Fen.parse(fen)
+            code = PositionEncoding.encode(game)
+            assert len(code) == SIZE
+            decoded = PositionEncoding.decode(code)
+            assert GameLogic.position_hash(decoded) == GameLogic.position_hash(game)
+            assert Fen.dump(decoded).split()[:4] == fen.split()[:4]
+            assert PositionEncoding.encode(decoded) == code
+        assert len(PositionEncoding.encode(Fen.parse(START_FEN))) < len(
+            pickle.dumps(Fen.parse(START_FEN).board)
+        )
+
+    def test_canonical(self):
+        """Equal positions reached by different move orders have equal codes, codes differ
+        by turn, castling rights and en passant.
+        """
+
+        first = Game.create_start_game()
+        second = Game.create_start_game()
+        for move in ["g1f3", "g8f6", "b1c3"]:
+            first = GameLogic.make_move(Move.from_uci(move), first)
+        for move in ["b1c3", "g8f6", "g1f3"]:
+            second = GameLogic.make_move(Move.from_uci(move), second)
+        assert PositionEncoding.encode(first) == PositionEncoding.encode(second)
+        codes = {PositionEncoding.encode(Fen.parse(fen)) for fen in FENS}
+        codes.add(PositionEncoding.encode(Fen.parse(FENS[2].replace("f6", "-"))))
+        codes.add(PositionEncoding.encode(Fen.parse(START_FEN.replace(" w ", " b "))))
+        codes.add(PositionEncoding.encode(Fen.parse(START_FEN.replace("KQkq", "Kkq"))))
+        assert len(codes) == len(FENS) + 3
+
+    def test_batch(self):
+        """Test of encode_batch() and decode_batch() methods."""
+
+        games = [Fen.parse(fen) for fen in FENS]
+        data = PositionEncoding.encode_batch(games)
+        assert len(data) == SIZE * len(FENS)
+        decoded = PositionEncoding.decode_batch(data)
+        assert [GameLogic.position_hash(game) for game in decoded] == [
+            GameLogic.position_hash(game) for game in games
+        ]
+        with self.assertRaises(ValueError):
+            PositionEncoding.decode_batch(data[:-1])
+
+    def test_invalid(self):
+        """Other board sizes are not encoded."""
+
+        with self.assertRaises(ValueError):
+            PositionEncoding.encode(Game.create_start_game(6, 6))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_unique(self):
+        """Test of to_array() and unique() methods."""
+
+        codes = [PositionEncoding.encode(Fen.parse(fen)) for fen in FENS]
+        data = b"".join(codes + codes[::-1])
+        assert PositionEncoding.to_array(data).shape == (2 * len(FENS), SIZE)
+        assert list(PositionEncoding.split(PositionEncoding.unique(data))) == sorted(
+            set(codes)
+        )
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_squares(self):
+        """Test of squares() method: the same pieces as decode() gives."""
+
+        games = [Fen.parse(fen) for fen in FENS]
+        squares = PositionEncoding.squares(PositionEncoding.encode_batch(games))
+        assert squares.shape == (len(FENS), 64)
+        for game, row in zip(games, squares):
+            for index, value in enumerate(row):
+                piece = game.board.get_piece(Position(index % 8, index // 8))
+                if piece is None:
+                    assert value == -1
+                else:
+                    assert value == piece.colour.value << 3 | piece.type.value
@@ -0,0 +1,264 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from engine.game import Game
+from engine.game_collection import GameCollection
+from engine.logic import GameLogic
+from entities.colour import Colour
+from entities.game_status import GameStatus
+from entities.move import Move
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS games (
+        id INTEGER PRIMARY KEY,
+        moves TEXT NOT NULL UNIQUE,
+        result INTEGER
+    )""",
+    # Clustered by hash: rows of a position are stored together in hash order, a lookup is
+    # a binary search in the B-tree followed by a sequential read.
+    """CREATE TABLE IF NOT EXISTS positions (
+        hash INTEGER NOT NULL,
+        game_id INTEGER NOT NULL,
+        ply INTEGER NOT NULL,
+        next_move TEXT,
+        PRIMARY KEY (hash, game_id, ply)
+    ) WITHOUT ROWID""",
+]
+
+
+class PositionHit(NamedTuple):
+    """Occurrence of a position: the position is reached in game <game_id> after <ply>
+    moves.
+    """
+
+    game_id: int
+    ply: int
+
+
+class MoveStatistics(NamedTuple):
+    """Games where <move> was played in a position and their results. Games without known
+    result are counted in <games> only.
+    """
+
+    move: Move
+    games: int
+    white_wins: int
+    draws: int
+    black_wins: int
+
+    def to_dict(self) -> dict:
+        return {
+            "move": self.move.to_uci(),
+            "games": self.games,
+            "white_wins": self.white_wins,
+            "draws": self.draws,
+            "black_wins": self.black_wins,
+        }
+
+
+class ReplayedGame(NamedTuple):
+    """Game replayed for indexing. <positions> has (hash, ply, next move in UCI or None at
+    the end) of every position of the game.
+    """
+
+    moves: str
+    result: Optional[int]
+    positions: List[Tuple[int, int, Optional[str]]]
+
+
+class ReplayedGames(NamedTuple):
+    """Chunk of replayed <games>. <rejected> games had malformed or illegal moves."""
+
+    games: List[ReplayedGame]
+    rejected: int
+
+
+class PositionIndex:
+    """Index of positions reached in a game collection, stored in a SQLite file.
+
+    Games are given as lines of UCI moves from the start position, optionally ended by
+    result (1-0, 0-1, 1/2-1/2), and replayed with GameLogic.make_move by a process pool.
+    Every position is recorded under GameLogic.position_hash, so transpositions are found
+    too. The index is incremental: add_games() appends new games to the existing file and
+    skips games already indexed, so a growing archive is indexed by running it again.
+    Games with malformed or illegal moves are skipped and counted in <rejected_games>.
+    Result of a game without explicit one is taken from the final position if the game is
+    over there, otherwise it stays unknown.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        chunk_size: int = 64,
+        max_chunks_in_flight: Optional[int] = None,
+    ) -> None:
+        """<workers> = 0 replays in the calling process, None uses one process per CPU."""
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._max_chunks_in_flight = max_chunks_in_flight
+        self.rejected_games = 0
+
+    def __enter__(self) -> PositionIndex:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def add_games(self, games: Iterable[str]) -> int:
+        """Index <games> which are not indexed yet. Return number of added games, the
+        number of skipped games with malformed or illegal moves is set to <rejected_games>.
+        """
+
+        new_games = (
+            line for line in map(_normalize, games) if line and not self._has_game(line)
+        )
+        added = self.rejected_games = 0
+        for replayed in self._replay_chunks(new_games):
+            self.rejected_games += replayed.rejected
+            with self._connection:
+                for game in replayed.games:
+                    added += self._insert(game)
+        return added
+
+    def games_reaching(self, game: Game) -> List[PositionHit]:
+        """Return occurrences of the position of <game> ordered by game and ply."""
+
+        rows = self._connection.execute(
+            "SELECT game_id, ply FROM positions WHERE hash = ? ORDER BY game_id, ply",
+            (_to_signed(GameLogic.position_hash(game)),),
+        )
+        return [PositionHit(game_id, ply) for game_id, ply in rows]
+
+    def move_statistics(self, game: Game) -> List[MoveStatistics]:
+        """Return moves played in the position of <game>, the most frequent first."""
+
+        rows = self._connection.execute(
+            """SELECT next_move,
+                COUNT(*),
+                COALESCE(SUM(games.result = 1), 0),
+                COALESCE(SUM(games.result = 0), 0),
+                COALESCE(SUM(games.result = -1), 0)
+            FROM positions JOIN games ON games.id = positions.game_id
+            WHERE hash = ? AND next_move IS NOT NULL
+            GROUP BY next_move
+            ORDER BY COUNT(*) DESC, next_move""",
+            (_to_signed(GameLogic.position_hash(game)),),
+        )
+        return [
+            MoveStatistics(Move.from_uci(move), count, wins, draws, losses)
+            for move, count, wins, draws, losses in rows
+        ]
+
+    def game_moves(self, game_id: int) -> str:
+        """Return moves of game <game_id> as they were indexed."""
+
+        row = self._connection.execute(
+            "SELECT moves FROM games WHERE id = ?", (game_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(game_id)
+        return row[0]
+
+    def _has_game(self, moves: str) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM games WHERE moves = ?", (moves,)
+            ).fetchone()
+            is not None
+        )
+
+    def _insert(self, game: ReplayedGame) -> int:
+        """Insert <game> unless it is indexed. Return number of inserted games."""
+
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO games (moves, result) VALUES (?, ?)",
+            (game.moves, game.result),
+        )
+        if cursor.rowcount == 0:
+            # The same game twice in the input.
+            return 0
+        game_id = cursor.lastrowid
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO positions (hash, game_id, ply, next_move) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (position_hash, game_id, ply, next_move)
+                for position_hash, ply, next_move in game.positions
+            ),
+        )
+        return 1
+
+    def _replay_chunks(self, games: Iterable[str]) -> Iterator[ReplayedGames]:
+        return GameCollection.map_chunks(
+            PositionIndex.replay_games,
+            games,
+            self._chunk_size,
+            self._workers,
+            self._max_chunks_in_flight,
+        )
+
+    @staticmethod
+    def replay_games(games: List[str]) -> ReplayedGames:
+        """Replay <games> and collect their positions. Games with malformed or illegal
+        moves are skipped and counted.
+        """
+
+        replayed = []
+        rejected = 0
+        for line in games:
+            try:
+                game_line = GameCollection.parse_line(line)
+                result = game_line.result
+                positions = []
+                for ply, (game, move) in enumerate(GameCollection.replay(game_line)):
+                    positions.append(
+                        (
+                            _to_signed(GameLogic.position_hash(game)),
+                            ply,
+                            move.to_uci() if move is not None else None,
+                        )
+                    )
+                    if move is None and result is None:
+                        result = _final_result(game)
+            except ValueError:
+                rejected += 1
+                continue
+            replayed.append(ReplayedGame(line, result, positions))
+        return ReplayedGames(replayed, rejected)
+
+
+def _final_result(game: Game) -> Optional[int]:
+    status = GameLogic.game_status(game)
+    if status == GameStatus.CHECKMATE:
+        return -1 if game.turn == Colour.WHITE else 1
+    if status.is_draw():
+        return 0
+    return None
+
+
+def _to_signed(key: int) -> int:
+    """Return 64-bit <key> as signed integer: SQLite integers are signed."""
+
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split())
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from engine.fen import Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.position_index import PositionHit, PositionIndex
+from entities.move import Move
+
+GAMES = [
+    "e2e4 e7e5 g1f3 b8c6 1-0",
+    "g1f3 b8c6 e2e4 e7e5 0-1",
+    "e2e4 e7e5 f1c4 1/2-1/2",
+    # Fool's mate, result is taken from the final position.
+    "f2f3 e7e5 g2g4 d8h4",
+    "d2d4",
+]
+
+
+class TestPositionIndex(unittest.TestCase):
+    """Test of PositionIndex class."""
+
+    def setUp(self) -> None:
+        self._directory = tempfile.mkdtemp()
+        self.path = os.path.join(self._directory, "index.sqlite")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._directory)
+
+    def test_games_reaching(self):
+        """Test of games_reaching() method: transpositions are found."""
+
+        with PositionIndex(self.path, workers=0, chunk_size=2) as index:
+            assert index.add_games(GAMES) == len(GAMES)
+            game = Game.create_start_game()
+            assert len(index.games_reaching(game)) == len(GAMES)
+            for uci in ["e2e4", "e7e5", "g1f3", "b8c6"]:
+                game = GameLogic.make_move(Move.from_uci(uci), game)
+            assert index.games_reaching(game) == [PositionHit(1, 4), PositionHit(2, 4)]
+            assert index.game_moves(2) == GAMES[1]
+            assert not index.games_reaching(Fen.parse("4k3/8/8/8/8/8/8/4K3 w - - 0 1"))
+
+    def test_move_statistics(self):
+        """Test of move_statistics() method."""
+
+        with PositionIndex(self.path, workers=0) as index:
+            index.add_games(GAMES)
+            stats = {
+                stats.move.to_uci(): stats
+                for stats in index.move_statistics(Game.create_start_game())
+            }
+            assert stats["e2e4"].games == 2
+            assert (stats["e2e4"].white_wins, stats["e2e4"].draws) == (1, 1)
+            assert stats["g1f3"].black_wins == 1
+            assert stats["f2f3"].black_wins == 1
+            # Unfinished game without result.
+            assert stats["d2d4"].games == 1
+            assert stats["d2d4"].white_wins + stats["d2d4"].draws == 0
+
+    def test_add_games_incremental(self):
+        """Test of add_games() method: known games are skipped, new ones are appended."""
+
+        with PositionIndex(self.path, workers=2, chunk_size=1) as index:
+            assert index.add_games(GAMES[:2]) == 2
+        with PositionIndex(self.path, workers=2, chunk_size=1) as index:
+            assert index.add_games(GAMES + [GAMES[2]]) == 3
+            assert len(index) == len(GAMES)
+            assert len(index.games_reaching(Game.create_start_game())) == len(GAMES)
+
+    def test_add_games_rejected(self):
+        """Test of add_games() method: games with illegal or malformed moves are skipped
+        and counted, the others are indexed.
+        """
+
+        with PositionIndex(self.path, workers=2, chunk_size=1) as index:
+            assert index.add_games(["e2e5", GAMES[0], "e2e4 x"]) == 1
+            assert index.rejected_games == 2
+            assert len(index) == 1
+            assert index.add_games(GAMES[:1]) == 0
+            assert index.rejected_games == 0
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-import itertools
-from typing import List
+from typing import Collection, Iterable, List
 
+from engine.slider_attacks import SliderAttacks
 from entities.board import Board
 from entities.colour import Colour
 from entities.pieces import Piece, PieceType
@@ -25,60 +25,37 @@ class PositionsUnderThreat:
         return piece is not None and piece.colour != colour
 
     @staticmethod
-    def is_position_enemy_or_empty(pos: Position, colour: Colour, board: Board) -> bool:
-        """Check if position occupied with enemy piece or empty.
-        Return False if pos is out of the board.
-        """
-
-        # Check if pos locates on the board.
-        return Board.is_position_on_board(pos, board) and (
-            PositionsUnderThreat.is_position_enemy(pos, colour, board)
-            or board.is_position_empty(pos)
-        )
-
-    @staticmethod
-    def check_positions(
-        pos: Position, colour: Colour, board: Board, shifts: list
+    def check_targets(
+        targets: Iterable[Position], colour: Colour, board: Board
     ) -> List[Position]:
-        """Take input list of shifts and verify which of them are possible."""
+        """Return <targets> which are empty or occupied with enemy piece.
+        Targets must be on the board (taken from BoardGeometry tables).
+        """
 
-        # Init position list.
         positions_under_threat = []
-        # Iterate through shifts.
-        for shift_x, shift_y in shifts:
-            # Check if shift is possible, otherwise break the loop.
-            if PositionsUnderThreat.is_position_enemy_or_empty(
-                Position(pos.x + shift_x, pos.y + shift_y), colour, board
-            ):
-                # Add shift
-                positions_under_threat.append(
-                    Position(pos.x + shift_x, pos.y + shift_y)
-                )
+        for target in targets:
+            piece = board.get_piece(target)
+            if piece is None or piece.colour != colour:
+                positions_under_threat.append(target)
         return positions_under_threat
 
     @staticmethod
-    def check_positions_with_obstacles(
-        pos: Position, colour: Colour, board: Board, shifts: list
+    def check_rays(
+        rays: Iterable[Iterable[Position]], colour: Colour, board: Board
     ) -> List[Position]:
-        """Take input list of shifts and verify which of them are possible.
-        Iterate through shifts till the first obstacle. Obstacle means own or enemy piece.
+        """Walk every ray (taken from BoardGeometry tables) till the first obstacle.
+        Position of an enemy obstacle is included, position of an own one is not.
         """
 
-        # Init position list.
         positions_under_threat = []
-        # Iterates though shifts.
-        for shift_x, shift_y in shifts:
-            # Check if shift is possible, otherwise break the loop.
-            if not PositionsUnderThreat.is_position_enemy_or_empty(
-                Position(pos.x + shift_x, pos.y + shift_y), colour, board
-            ):
-                break
-            # Add shift
-            positions_under_threat.append(Position(pos.x + shift_x, pos.y + shift_y))
-            # Check if position is occupied with enemy piece, otherwise break the loop.
-            if PositionsUnderThreat.is_position_enemy(
-                Position(pos.x + shift_x, pos.y + shift_y), colour, board
-            ):
+        for ray in rays:
+            for ray_pos in ray:
+                piece = board.get_piece(ray_pos)
+                if piece is None:
+                    positions_under_threat.append(ray_pos)
+                    continue
+                if piece.colour != colour:
+                    positions_under_threat.append(ray_pos)
                 break
         return positions_under_threat
 
@@ -95,6 +72,118 @@ class PositionsUnderThreat:
             )
         return positions_under_threat
 
+    @staticmethod
+    def is_position_under_threat(pos: Position, colour: Colour, board: Board) -> bool:
+        """Check if <pos> is under threat for <colour> side.
+        Result is equal to `pos in all_positions_under_threat_for_side(colour, board)` for empty
+        positions and positions occupied with <colour> pieces, but instead of generating all
+        opponent threats look from <pos> outwards and stop at the first attacker.
+        """
+
+        enemy = Colour.change_colour(colour)
+        geometry = board.geometry
+        # Check knights, king and pawns. Enemy pawn attacks <pos> from the positions a pawn
+        # of <colour> side would attack from <pos>.
+        for targets, piece_type in [
+            (geometry.knight_targets[pos], PieceType.KNIGHT),
+            (geometry.king_targets[pos], PieceType.KING),
+            (geometry.pawn_targets[colour.value][pos], PieceType.PAWN),
+        ]:
+            for target in targets:
+                piece = board.get_piece(target)
+                if (
+                    piece is not None
+                    and piece.colour == enemy
+                    and piece.type == piece_type
+                ):
+                    return True
+        return PositionsUnderThreat._is_position_under_slider_threat(pos, enemy, board)
+
+    @staticmethod
+    def _is_position_under_slider_threat(
+        pos: Position, enemy: Colour, board: Board
+    ) -> bool:
+        """Check if a sliding piece of <enemy> side attacks <pos>: look from <pos> till the
+        first obstacle in each direction.
+        """
+
+        if PositionsUnderThreat.has_slider_tables(pos, board):
+            square = SliderAttacks.square(pos)
+            occupancy = board.occupancy()
+            for attacks, slider_type in [
+                (SliderAttacks.rook_attacks(square, occupancy), PieceType.ROOK),
+                (SliderAttacks.bishop_attacks(square, occupancy), PieceType.BISHOP),
+            ]:
+                enemy_attacks = attacks & board.colour_occupancy(enemy)
+                for attacker_pos in SliderAttacks.positions(enemy_attacks):
+                    if board.get_piece(attacker_pos).type in [
+                        slider_type,
+                        PieceType.QUEEN,
+                    ]:
+                        return True
+            return False
+        for rays, slider_type in [
+            (board.geometry.rook_rays[pos], PieceType.ROOK),
+            (board.geometry.bishop_rays[pos], PieceType.BISHOP),
+        ]:
+            for ray in rays:
+                for ray_pos in ray:
+                    piece = board.get_piece(ray_pos)
+                    if piece is not None:
+                        if piece.colour == enemy and piece.type in [
+                            slider_type,
+                            PieceType.QUEEN,
+                        ]:
+                            return True
+                        break
+        return False
+
+    @staticmethod
+    def attackers(
+        pos: Position, colour: Colour, board: Board, ignored: Collection[Position] = ()
+    ) -> List[Position]:
+        """Return positions of <colour> pieces which attack <pos>.
+        Pieces on <ignored> positions are treated as removed from the board, so sliding
+        pieces standing behind them (x-ray attackers) are returned too.
+        """
+
+        attackers = []
+        geometry = board.geometry
+        # Pawn of <colour> side attacks <pos> from the positions a pawn of the opposite side
+        # would attack from <pos>.
+        for targets, piece_type in [
+            (geometry.knight_targets[pos], PieceType.KNIGHT),
+            (geometry.king_targets[pos], PieceType.KING),
+            (
+                geometry.pawn_targets[Colour.change_colour(colour).value][pos],
+                PieceType.PAWN,
+            ),
+        ]:
+            for attacker_pos in targets:
+                piece = board.get_piece(attacker_pos)
+                if (
+                    piece is not None
+                    and piece.colour == colour
+                    and piece.type == piece_type
+                    and attacker_pos not in ignored
+                ):
+                    attackers.append(attacker_pos)
+        for rays, slider_type in [
+            (geometry.rook_rays[pos], PieceType.ROOK),
+            (geometry.bishop_rays[pos], PieceType.BISHOP),
+        ]:
+            for ray in rays:
+                for ray_pos in ray:
+                    piece = board.get_piece(ray_pos)
+                    if piece is not None and ray_pos not in ignored:
+                        if piece.colour == colour and piece.type in [
+                            slider_type,
+                            PieceType.QUEEN,
+                        ]:
+                            attackers.append(ray_pos)
+                        break
+        return attackers
+
     @staticmethod
     def positions_under_threat(
         pos: Position, piece: Piece, board: Board
@@ -111,60 +200,79 @@ class PositionsUnderThreat:
 
         return pos_types[piece.type](pos, piece.colour, board)
 
+    @staticmethod
+    def has_slider_tables(pos: Position, board: Board) -> bool:
+        """Check if attacks of a sliding piece on <pos> can be taken from SliderAttacks
+        tables. Tables cover 8x8 board only, other boards walk rays.
+        """
+
+        side = SliderAttacks.SIDE
+        is_table_size = (board.width, board.height) == (side, side)
+        return is_table_size and Board.is_position_on_board(pos, board)
+
     @staticmethod
     def positions_under_king_threat(
         pos: Position, colour: Colour, board: Board
     ) -> List[Position]:
         """Return list of positions under threat by king."""
 
-        # Init list of shifts
-        shifts = list(itertools.product([-1, 0, 1], repeat=2))
-        return PositionsUnderThreat.check_positions(pos, colour, board, shifts)
+        return PositionsUnderThreat.check_targets(
+            board.geometry.king_targets[pos], colour, board
+        )
 
     @staticmethod
     def positions_under_queen_threat(
+        pos: Position, colour: Colour, board: Board
+    ) -> List[Position]:
+        """Return list of positions under threat by queen."""
+
+        if not PositionsUnderThreat.has_slider_tables(pos, board):
+            return PositionsUnderThreat.positions_under_queen_threat_by_rays(
+                pos, colour, board
+            )
+        return SliderAttacks.positions(
+            SliderAttacks.queen_attacks(SliderAttacks.square(pos), board.occupancy())
+            & ~board.colour_occupancy(colour)
+        )
+
+    @staticmethod
+    def positions_under_queen_threat_by_rays(
         position: Position, colour: Colour, board: Board
     ) -> List[Position]:
         """Return list of positions under threat by queen.
-        Can be calculated by combining returns from bishop and rook methods.
+        Check 8 directions of rook and bishop till the first obstacle.
         """
 
-        return [
-            *PositionsUnderThreat.positions_under_rook_threat(position, colour, board),
-            *PositionsUnderThreat.positions_under_bishop_threat(
-                position, colour, board
-            ),
-        ]
+        return PositionsUnderThreat.check_rays(
+            board.geometry.queen_rays[position], colour, board
+        )
 
     @staticmethod
     def positions_under_bishop_threat(
         pos: Position, colour: Colour, board: Board
+    ) -> List[Position]:
+        """Return list of positions under threat by bishop."""
+
+        if not PositionsUnderThreat.has_slider_tables(pos, board):
+            return PositionsUnderThreat.positions_under_bishop_threat_by_rays(
+                pos, colour, board
+            )
+        return SliderAttacks.positions(
+            SliderAttacks.bishop_attacks(SliderAttacks.square(pos), board.occupancy())
+            & ~board.colour_occupancy(colour)
+        )
+
+    @staticmethod
+    def positions_under_bishop_threat_by_rays(
+        pos: Position, colour: Colour, board: Board
     ) -> List[Position]:
         """Return list of positions under threat by bishop.
         Check 4 directions till the first obstacle: up_right, down_right, down_left and up_left.
         """
 
-        # Init lists of shifts.
-        shifts_up_right = [(shift, shift) for shift in range(1, board.height)]
-        shifts_down_right = [(shift, -shift) for shift in range(1, board.height)]
-        shifts_down_left = [(-shift, -shift) for shift in range(1, board.height)]
-        shifts_up_left = [(-shift, shift) for shift in range(1, board.height)]
-        # Init position list.
-        positions_under_threat = []
-        # Iterate over 4 directions.
-        for shifts in [
-            shifts_up_right,
-            shifts_down_right,
-            shifts_down_left,
-            shifts_up_left,
-        ]:
-            positions_under_threat = [
-                *positions_under_threat,
-                *PositionsUnderThreat.check_positions_with_obstacles(
-                    pos, colour, board, shifts
-                ),
-            ]
-        return positions_under_threat
+        return PositionsUnderThreat.check_rays(
+            board.geometry.bishop_rays[pos], colour, board
+        )
 
     @staticmethod
     def positions_under_knight_threat(
@@ -172,37 +280,36 @@ class PositionsUnderThreat:
     ) -> List[Position]:
         """Return list of positions under threat by knight."""
 
-        # Init list of shifts.
-        shifts = [
-            *list(itertools.product([-1, 1], [-2, 2])),
-            *list(itertools.product([-2, 2], [-1, 1])),
-        ]
-        return PositionsUnderThreat.check_positions(pos, colour, board, shifts)
+        return PositionsUnderThreat.check_targets(
+            board.geometry.knight_targets[pos], colour, board
+        )
 
     @staticmethod
     def positions_under_rook_threat(
         pos: Position, colour: Colour, board: Board
+    ) -> List[Position]:
+        """Return list of positions under threat by rook."""
+
+        if not PositionsUnderThreat.has_slider_tables(pos, board):
+            return PositionsUnderThreat.positions_under_rook_threat_by_rays(
+                pos, colour, board
+            )
+        return SliderAttacks.positions(
+            SliderAttacks.rook_attacks(SliderAttacks.square(pos), board.occupancy())
+            & ~board.colour_occupancy(colour)
+        )
+
+    @staticmethod
+    def positions_under_rook_threat_by_rays(
+        pos: Position, colour: Colour, board: Board
     ) -> List[Position]:
         """Return list of positions under threat by rook.
         Check 4 directions till the first obstacle: up, right, down and left.
         """
 
-        # Init lists of shifts.
-        shifts_up = [(0, shift_y) for shift_y in range(1, board.height)]
-        shifts_right = [(shift_x, 0) for shift_x in range(1, board.width)]
-        shifts_down = [(0, shift_y) for shift_y in range(-1, -board.height, -1)]
-        shifts_left = [(shift_x, 0) for shift_x in range(-1, -board.width, -1)]
-        # Init position list.
-        positions_under_threat = []
-        # Iterate over directions
-        for shifts in [shifts_up, shifts_right, shifts_down, shifts_left]:
-            positions_under_threat = [
-                *positions_under_threat,
-                *PositionsUnderThreat.check_positions_with_obstacles(
-                    pos, colour, board, shifts
-                ),
-            ]
-        return positions_under_threat
+        return PositionsUnderThreat.check_rays(
+            board.geometry.rook_rays[pos], colour, board
+        )
 
     @staticmethod
     def positions_under_pawn_threat(
@@ -210,9 +317,6 @@ class PositionsUnderThreat:
     ) -> List[Position]:
         """Return list of positions under threat by pawn."""
 
-        # Init list of shifts.
-        if colour == Colour.WHITE:
-            shifts = [(-1, 1), (1, 1)]
-        else:
-            shifts = [(-1, -1), (1, -1)]
-        return PositionsUnderThreat.check_positions(pos, colour, board, shifts)
+        return PositionsUnderThreat.check_targets(
+            board.geometry.pawn_targets[colour.value][pos], colour, board
+        )
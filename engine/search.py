@@ -0,0 +1,748 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from engine.evaluation import Evaluation
+from engine.exchange import StaticExchange
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.move_history import MoveHistory
+from engine.transposition import Bound, TableEntry, TranspositionTable
+from entities.colour import Colour
+from entities.move import Move
+from entities.pieces import PieceType
+
+# Score of mate at the root. Mate in N plies is scored MATE_SCORE - N.
+MATE_SCORE = 100000
+INFINITE_SCORE = MATE_SCORE + 1
+# Captures which cannot raise the score to alpha even with this margin are not searched.
+DELTA_MARGIN = 200
+# Scores closer than this to MATE_SCORE are mates and depend on the distance from the root.
+MATE_THRESHOLD = MATE_SCORE - 1000
+# Stop condition is checked once per this number of nodes. Nodes cost milliseconds, so
+# checking often keeps time limits precise.
+STOP_CHECK_NODES = 16
+# Null move is searched this many plies shallower than the moves, at nodes at least
+# NULL_MOVE_MIN_DEPTH plies from the horizon.
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+# Quiet moves after the first LMR_MIN_MOVES in order are searched one ply shallower at
+# nodes at least LMR_MIN_DEPTH plies from the horizon.
+LMR_MIN_MOVES = 3
+LMR_MIN_DEPTH = 3
+# Half width of the window around the score of the previous iteration.
+ASPIRATION_WINDOW = 50
+
+
+class SearchResult(NamedTuple):
+    best_move: Optional[Move]
+    score: int
+    depth: int
+    nodes: int
+    pv: List[Move]
+    # Rank of the line in multi-PV search, 1 for the best one.
+    multipv: int = 1
+
+
+class SearchStats(NamedTuple):
+    nodes: int
+    quiescence_nodes: int
+    # Null move searches and those which caused a cutoff.
+    null_move_searches: int
+    null_move_cutoffs: int
+    # Moves searched with reduced depth and those searched again at full depth.
+    lmr_reductions: int
+    lmr_researches: int
+    # Null window searches which failed high and were searched again with the full window.
+    pvs_researches: int
+    # Iterations searched again after the score fell outside the aspiration window.
+    aspiration_researches: int
+
+
+class SearchStopped(Exception):
+    pass
+
+
+# Search keeps a switch and a counter for every technique.
+class Search:  # pylint: disable=too-many-instance-attributes
+    """Alpha-beta search built on GameLogic rules.
+    Searches iteratively deepening till <depth>, the principal variation of the previous
+    iteration is searched first.
+
+    With <quiescence> enabled leaves are not evaluated statically but resolved by a search of
+    captures and promotions only: the side to move may stand pat on the static evaluation,
+    captures which cannot reach alpha (delta pruning) or lose material by static exchange
+    evaluation are skipped. <nodes> counts all nodes, <quiescence_nodes> those searched in
+    quiescence.
+
+    <transposition_table> stores results of searched positions (it may be shared with other
+    processes, see ParallelSearch). <stop> is polled during search: once it returns True the
+    search returns the result of the last completed iteration. <on_iteration> is called with
+    the result of every completed iteration (of every line in multi_pv()).
+
+    Selective search techniques can be switched off one by one, stats() reports how often
+    each of them was applied:
+    <null_move> - the side to move passes (searched NULL_MOVE_REDUCTION plies shallower); if
+    the score still reaches beta, the node is cut off. Not tried in check, right after another
+    null move, at the root or with king and pawns only, where passing is often better than
+    any move (zugzwang).
+    <late_move_reductions> - quiet moves late in move order which do not give check are
+    searched one ply shallower, and again at full depth if they raise alpha.
+    <pvs> - moves after the first one are searched with a null window (alpha, alpha + 1),
+    and again with the full window only if they raise alpha.
+    <aspiration> - iterations after the first search a window of ASPIRATION_WINDOW around the
+    previous score; the failed side is opened if the score falls outside it.
+    """
+
+    # Search methods take the searched node as arguments: position, depth, window, ply and
+    # principal variation.
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+        self,
+        evaluate: Callable[[Game], int] = Evaluation.evaluate,
+        quiescence: bool = True,
+        transposition_table: Optional[TranspositionTable] = None,
+        stop: Optional[Callable[[], bool]] = None,
+        on_iteration: Optional[Callable[[SearchResult], None]] = None,
+        null_move: bool = True,
+        late_move_reductions: bool = True,
+        pvs: bool = True,
+        aspiration: bool = True,
+    ) -> None:
+        self._evaluate = evaluate
+        self._quiescence_enabled = quiescence
+        self._table = transposition_table
+        self._stop = stop
+        self._on_iteration = on_iteration
+        self._null_move = null_move
+        self._late_move_reductions = late_move_reductions
+        self._pvs = pvs
+        self._aspiration = aspiration
+        self._reset_counters()
+        self._pv: List[Move] = []
+
+    def search(self, game: Game, depth: int) -> SearchResult:
+        """Return best move of <game.turn> side found by searching <depth> plies."""
+
+        return self.multi_pv(game, depth, 1)[0]
+
+    def multi_pv(self, game: Game, depth: int, lines: int) -> List[SearchResult]:
+        """Return best <lines> moves of <game.turn> side (fewer if there are fewer legal
+        moves) with their scores and principal variations, best first.
+
+        Every iteration searches each root move once: lines of the previous iteration
+        first, within aspiration windows around their scores, then the rest against the
+        score of the worst line found so far (with a null window and late move reductions
+        if enabled). A move which beats it replaces the worst line. So the root is searched
+        once per iteration instead of once per line with the best moves excluded, and the
+        lines share the transposition table.
+        """
+
+        self._reset_counters()
+        lines = max(1, min(lines, len(list(GameLogic.legal_moves(game)))))
+        results: List[SearchResult] = []
+        for current_depth in range(1, depth + 1):
+            try:
+                if lines == 1:
+                    previous = (
+                        results[0] if results else SearchResult(None, 0, 0, 0, [])
+                    )
+                    self._pv = previous.pv
+                    found = [self._search_root(game, current_depth, previous)]
+                else:
+                    found = self._search_root_lines(game, current_depth, results, lines)
+            except SearchStopped:
+                if not results or results[0].best_move is None:
+                    # Stopped before the first iteration completed: any legal move.
+                    move = next(iter(GameLogic.legal_moves(game)), None)
+                    results = [SearchResult(move, 0, 0, self.nodes, [])]
+                return [result._replace(nodes=self.nodes) for result in results]
+            results = [
+                SearchResult(
+                    pv[0] if pv else None, score, current_depth, self.nodes, pv, line
+                )
+                for line, (score, pv) in enumerate(found, 1)
+            ]
+            if self._on_iteration is not None:
+                for result in results:
+                    self._on_iteration(result)
+            if all(
+                abs(result.score) >= MATE_SCORE - current_depth for result in results
+            ):
+                # Mates found: deeper search would not change the result.
+                break
+        return results
+
+    def ponder_move(self, game: Game, result: SearchResult) -> Optional[Move]:
+        """Return the expected reply to <result.best_move> in <game>: the second move of the
+        principal variation or, if it is shorter, the best move stored in the transposition
+        table for the position after the best move. None if neither is known.
+        """
+
+        if len(result.pv) >= 2:
+            return result.pv[1]
+        if result.best_move is None or self._table is None:
+            return None
+        replies = self._table_pv(GameLogic.make_move(result.best_move, game), 1)
+        return replies[0] if replies else None
+
+    def stats(self) -> SearchStats:
+        """Return counters of the last search."""
+
+        return SearchStats(
+            self.nodes,
+            self.quiescence_nodes,
+            self.null_move_searches,
+            self.null_move_cutoffs,
+            self.lmr_reductions,
+            self.lmr_researches,
+            self.pvs_researches,
+            self.aspiration_researches,
+        )
+
+    def _reset_counters(self) -> None:
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.null_move_searches = 0
+        self.null_move_cutoffs = 0
+        self.lmr_reductions = 0
+        self.lmr_researches = 0
+        self.pvs_researches = 0
+        self.aspiration_researches = 0
+
+    def _search_root(
+        self, game: Game, depth: int, previous: SearchResult
+    ) -> Tuple[int, List[Move]]:
+        """Search one iteration, within an aspiration window around <previous> score."""
+
+        alpha, beta = -INFINITE_SCORE, INFINITE_SCORE
+        if (
+            self._aspiration
+            and previous.depth > 0
+            and abs(previous.score) < MATE_THRESHOLD
+        ):
+            alpha = previous.score - ASPIRATION_WINDOW
+            beta = previous.score + ASPIRATION_WINDOW
+        while True:
+            pv: List[Move] = []
+            score = self._alpha_beta(game, depth, alpha, beta, 0, pv)
+            if score <= alpha and alpha > -INFINITE_SCORE:
+                alpha = -INFINITE_SCORE
+            elif score >= beta and beta < INFINITE_SCORE:
+                beta = INFINITE_SCORE
+            else:
+                return score, pv
+            self.aspiration_researches += 1
+
+    def _search_root_lines(
+        self, game: Game, depth: int, previous: List[SearchResult], lines: int
+    ) -> List[Tuple[int, List[Move]]]:
+        """Return (score, principal variation) of the best <lines> root moves, best first."""
+
+        self.nodes += 1
+        self._check_stop()
+        self._pv = previous[0].pv if previous else []
+        previous_moves = [result.best_move for result in previous]
+        moves = previous_moves + [
+            move
+            for move in self._order_moves(game, list(GameLogic.legal_moves(game)), 0)
+            if move not in previous_moves
+        ]
+        in_check = GameLogic.is_check(game.board, game.turn)
+        found: List[Tuple[int, List[Move]]] = []
+        for index, move in enumerate(moves):
+            line = self._search_root_move(
+                game,
+                move,
+                index,
+                depth,
+                found[-1][0] if len(found) == lines else -INFINITE_SCORE,
+                previous[index].score if index < len(previous) else None,
+                in_check,
+            )
+            if line is not None:
+                found.append(line)
+                found.sort(key=lambda line: -line[0])
+                del found[lines:]
+
+        if self._table is not None:
+            score, pv = found[0]
+            self._table.store(
+                GameLogic.position_hash(game),
+                depth,
+                _score_to_table(score, 0),
+                Bound.EXACT,
+                pv[0],
+            )
+        return found
+
+    def _search_root_move(
+        self,
+        game: Game,
+        move: Move,
+        index: int,
+        depth: int,
+        bound: int,
+        previous_score: Optional[int],
+        in_check: bool,
+    ) -> Optional[Tuple[int, List[Move]]]:
+        """Return (score, principal variation) of root <move> if it scores above <bound>,
+        None otherwise. Lines of the previous iteration are searched within an aspiration
+        window around <previous_score>, other moves with a null window (reduced if late)
+        once <bound> is set.
+        """
+
+        child = GameLogic.make_move(move, game)
+        alpha, beta = bound, INFINITE_SCORE
+        if (
+            self._aspiration
+            and previous_score is not None
+            and abs(previous_score) < MATE_THRESHOLD
+        ):
+            alpha = max(bound, previous_score - ASPIRATION_WINDOW)
+            beta = max(alpha, previous_score) + ASPIRATION_WINDOW
+        elif bound > -INFINITE_SCORE:
+            if self._pvs:
+                beta = bound + 1
+            if self._reduction(game, move, child, index, depth, in_check):
+                score = self._child_score(child, depth - 2, bound, beta, 0, [])
+                if score <= bound:
+                    return None
+                self.lmr_researches += 1
+        while True:
+            pv: List[Move] = []
+            score = self._child_score(child, depth - 1, alpha, beta, 0, pv)
+            if score <= alpha and alpha > bound:
+                alpha = bound
+            elif score >= beta and beta < INFINITE_SCORE:
+                beta = INFINITE_SCORE
+            else:
+                break
+            if previous_score is None:
+                self.pvs_researches += 1
+            else:
+                self.aspiration_researches += 1
+        return (score, [move, *pv]) if score > bound else None
+
+    def _alpha_beta(
+        self,
+        game: Game,
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+        pv: List[Move],
+        null_move_allowed: bool = True,
+    ) -> int:
+        self.nodes += 1
+        self._check_stop()
+        if ply > 0 and GameLogic.repetition_count(game) >= 3:
+            return 0
+
+        # Table is probed before move generation, so cutoffs do not pay for it. Scores of
+        # positions reached at the fifty-move limit differ from stored ones.
+        key = (
+            GameLogic.position_hash(game)
+            if self._table is not None and depth > 0
+            else None
+        )
+        entry = self._table.probe(key) if key is not None else None
+        if entry is not None and ply > 0 and game.halfmove_clock < 100:
+            score = _table_cutoff(entry, depth, alpha, beta, ply)
+            if score is not None:
+                # Only exact scores fall within the window.
+                if alpha < score < beta:
+                    pv[:] = self._table_pv(game, depth)
+                return score
+
+        moves = list(GameLogic.legal_moves(game))
+        score = _terminal_score(game, moves, ply)
+        if score is not None:
+            return score
+        if depth <= 0:
+            return self._horizon_score(game, alpha, beta, ply, moves)
+        in_check = GameLogic.is_check(game.board, game.turn)
+        if null_move_allowed and self._null_move_cutoff(
+            game, depth, beta, ply, in_check
+        ):
+            return beta
+
+        table_move = entry.move if entry is not None else None
+        score, best_move = self._search_moves(
+            game,
+            self._order_moves(game, moves, ply, table_move),
+            depth,
+            alpha,
+            beta,
+            ply,
+            pv,
+            in_check,
+        )
+        if key is not None:
+            self._table.store(
+                key,
+                depth,
+                _score_to_table(score, ply),
+                _bound(score, alpha, beta),
+                best_move or table_move,
+            )
+        return score
+
+    def _horizon_score(
+        self, game: Game, alpha: int, beta: int, ply: int, moves: List[Move]
+    ) -> int:
+        """Return score of a leaf of the main search with legal <moves>."""
+
+        if self._quiescence_enabled:
+            self.quiescence_nodes += 1
+            return self._quiescence(game, alpha, beta, ply, moves)
+        return self._evaluate(game)
+
+    def _null_move_cutoff(
+        self, game: Game, depth: int, beta: int, ply: int, in_check: bool
+    ) -> bool:
+        """Check if passing the move still scores at least <beta> (see <null_move>)."""
+
+        if not (
+            self._null_move
+            and ply > 0
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and not in_check
+        ):
+            return False
+        if (
+            abs(beta) >= MATE_THRESHOLD
+            or not _has_pieces(game)
+            or self._evaluate(game) < beta
+        ):
+            return False
+        self.null_move_searches += 1
+        score = -self._alpha_beta(
+            _null_move(game),
+            depth - 1 - NULL_MOVE_REDUCTION,
+            -beta,
+            -beta + 1,
+            ply + 1,
+            [],
+            False,
+        )
+        if score < beta:
+            return False
+        self.null_move_cutoffs += 1
+        return True
+
+    def _search_moves(
+        self,
+        game: Game,
+        moves: List[Move],
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+        pv: List[Move],
+        in_check: bool,
+    ) -> Tuple[int, Optional[Move]]:
+        """Search ordered <moves> and return the score with the best move, None if no move
+        raises <alpha>. Moves after the first one are searched as in _late_move_score().
+        """
+
+        best_move = None
+        for index, move in enumerate(moves):
+            child = GameLogic.make_move(move, game)
+            child_pv: List[Move] = []
+            if index == 0:
+                score = self._child_score(child, depth - 1, alpha, beta, ply, child_pv)
+            else:
+                score = self._late_move_score(
+                    child,
+                    depth - 1,
+                    self._reduction(game, move, child, index, depth, in_check),
+                    alpha,
+                    beta,
+                    ply,
+                    child_pv,
+                )
+            if score > alpha:
+                alpha = score
+                best_move = move
+                pv[:] = [move, *child_pv]
+                if alpha >= beta:
+                    break
+        return alpha, best_move
+
+    def _late_move_score(
+        self,
+        child: Game,
+        depth: int,
+        reduction: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+        pv: List[Move],
+    ) -> int:
+        """Return score of <child> reached by a move after the first one: searched
+        <reduction> plies shallower and with a null window (with <pvs>), then again at
+        full <depth> and with the full window while it raises <alpha>.
+        """
+
+        window_beta = alpha + 1 if self._pvs else beta
+        score = self._child_score(child, depth - reduction, alpha, window_beta, ply, pv)
+        if reduction and score > alpha:
+            self.lmr_researches += 1
+            pv.clear()
+            score = self._child_score(child, depth, alpha, window_beta, ply, pv)
+        if window_beta < beta and score > alpha:
+            self.pvs_researches += 1
+            pv.clear()
+            score = self._child_score(child, depth, alpha, beta, ply, pv)
+        return score
+
+    def _table_pv(self, game: Game, depth: int) -> List[Move]:
+        """Return principal variation of <game> cut off by the transposition table: best
+        moves stored for the positions along it, at most <depth> of them.
+        """
+
+        pv: List[Move] = []
+        seen = set()
+        while len(pv) < depth:
+            key = GameLogic.position_hash(game)
+            entry = self._table.probe(key)
+            if (
+                key in seen
+                or entry is None
+                or entry.move is None
+                or entry.move not in GameLogic.legal_moves(game)
+            ):
+                break
+            seen.add(key)
+            pv.append(entry.move)
+            game = GameLogic.make_move(entry.move, game)
+        return pv
+
+    def _reduction(
+        self,
+        game: Game,
+        move: Move,
+        child: Game,
+        index: int,
+        depth: int,
+        in_check: bool,
+    ) -> int:
+        """Return plies <move> (number <index> in move order) is searched shallower."""
+
+        if not (
+            self._late_move_reductions
+            and index >= LMR_MIN_MOVES
+            and depth >= LMR_MIN_DEPTH
+            and not in_check
+        ):
+            return 0
+        if (
+            move.promotion is not None
+            or StaticExchange.captured_piece(game.board, move) is not None
+            or GameLogic.is_check(child.board, child.turn)
+        ):
+            return 0
+        self.lmr_reductions += 1
+        return 1
+
+    def _child_score(
+        self,
+        child: Game,
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+        pv: List[Move],
+    ) -> int:
+        """Return score of <child> position from the point of view of its parent."""
+
+        return -self._alpha_beta(child, depth, -beta, -alpha, ply + 1, pv)
+
+    def _quiescence(
+        self,
+        game: Game,
+        alpha: int,
+        beta: int,
+        ply: int,
+        moves: Optional[List[Move]] = None,
+    ) -> int:
+        """<moves> are given for a leaf of the main search which is already counted."""
+
+        if moves is None:
+            self.nodes += 1
+            self.quiescence_nodes += 1
+            self._check_stop()
+            moves = list(GameLogic.legal_moves(game))
+        in_check = GameLogic.is_check(game.board, game.turn)
+        if not moves:
+            return -(MATE_SCORE - ply) if in_check else 0
+
+        if in_check:
+            # No standing pat in check: every evasion is searched.
+            stand_pat = -INFINITE_SCORE
+            tactical_moves = moves
+        else:
+            stand_pat = self._evaluate(game)
+            if stand_pat >= beta:
+                return beta
+            alpha = max(alpha, stand_pat)
+            tactical_moves = [
+                move
+                for move in moves
+                if move.promotion in [None, PieceType.QUEEN]
+                and (
+                    move.promotion is not None
+                    or StaticExchange.captured_piece(game.board, move) is not None
+                )
+            ]
+
+        for move in self._order_moves(game, tactical_moves, ply):
+            if not in_check:
+                victim = StaticExchange.captured_piece(game.board, move)
+                gain = Evaluation.PIECE_VALUES[victim.type] if victim else 0
+                if move.promotion is not None:
+                    gain += (
+                        Evaluation.PIECE_VALUES[move.promotion]
+                        - Evaluation.PIECE_VALUES[PieceType.PAWN]
+                    )
+                # Delta pruning.
+                if stand_pat + gain + DELTA_MARGIN <= alpha:
+                    continue
+                # Losing captures are not searched.
+                if StaticExchange.evaluate(game.board, move) < 0:
+                    continue
+            score = -self._quiescence(
+                GameLogic.make_move(move, game), -beta, -alpha, ply + 1
+            )
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+    def _check_stop(self) -> None:
+        if (
+            self._stop is not None
+            and self.nodes % STOP_CHECK_NODES == 0
+            and self._stop()
+        ):
+            raise SearchStopped()
+
+    def _order_moves(
+        self,
+        game: Game,
+        moves: List[Move],
+        ply: int,
+        table_move: Optional[Move] = None,
+    ) -> List[Move]:
+        """Principal variation move first, then the best move from transposition table,
+        then captures (most valuable victim first), then the rest.
+        """
+
+        pv_move = self._pv[ply] if ply < len(self._pv) else None
+
+        def key(move: Move) -> int:
+            if move == pv_move:
+                return -INFINITE_SCORE
+            if move == table_move:
+                return -INFINITE_SCORE + 1
+            victim = game.board.get_piece(move.finish)
+            if victim is None:
+                return 0
+            attacker = game.board.get_piece(move.start)
+            return -(
+                10 * Evaluation.PIECE_VALUES[victim.type]
+                - Evaluation.PIECE_VALUES[attacker.type]
+            )
+
+        return sorted(moves, key=key)
+
+
+def _null_move(game: Game) -> Game:
+    """Return <game> with the turn passed to the opponent. History is dropped, so no
+    en passant capture is possible, and so are position counts: a pass does not repeat any
+    position.
+    """
+
+    return Game(
+        game.board,
+        Colour.change_colour(game.turn),
+        MoveHistory(),
+        game.halfmove_clock,
+        GameLogic.castling_rights(game),
+        {},
+    )
+
+
+def _has_pieces(game: Game) -> bool:
+    """Check if <game.turn> side has pieces other than king and pawns."""
+
+    board = game.board
+    return any(
+        board.get_piece(pos).type not in [PieceType.KING, PieceType.PAWN]
+        for pos in board.get_positions_for_side(game.turn)
+    )
+
+
+def _terminal_score(game: Game, moves: List[Move], ply: int) -> Optional[int]:
+    """Return score of <game> with legal <moves> if the game is over by mate, stalemate or
+    the fifty-move rule (not applied at the root), None otherwise.
+    """
+
+    if not moves:
+        if GameLogic.is_check(game.board, game.turn):
+            return -(MATE_SCORE - ply)
+        return 0
+    if ply > 0 and game.halfmove_clock >= 100:
+        return 0
+    return None
+
+
+def _table_cutoff(
+    entry: TableEntry, depth: int, alpha: int, beta: int, ply: int
+) -> Optional[int]:
+    """Return score of table <entry> if it is deep enough and decides the (alpha, beta)
+    window, None otherwise.
+    """
+
+    if entry.depth < depth:
+        return None
+    score = _score_from_table(entry.score, ply)
+    if (
+        entry.bound == Bound.EXACT
+        or (entry.bound == Bound.LOWER and score >= beta)
+        or (entry.bound == Bound.UPPER and score <= alpha)
+    ):
+        return score
+    return None
+
+
+def _bound(score: int, alpha: int, beta: int) -> Bound:
+    """Return bound of <score> searched within (alpha, beta) window."""
+
+    if score >= beta:
+        return Bound.LOWER
+    if score > alpha:
+        return Bound.EXACT
+    return Bound.UPPER
+
+
+def _score_to_table(score: int, ply: int) -> int:
+    """Mate scores are stored as distance from the position instead of from the root."""
+
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_table(score: int, ply: int) -> int:
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
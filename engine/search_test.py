@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.fen import START_FEN, Fen
+from engine.logic import GameLogic
+from engine.parallel_search import ParallelSearch
+from engine.search import MATE_SCORE, Search
+from engine.transposition import TranspositionTable
+from entities.move import Move
+
+
+class TestSearch(unittest.TestCase):
+    """Test of Search class."""
+
+    def test_mate_in_one(self):
+        """Scholar's mate is found."""
+
+        game = Fen.parse(
+            "r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+        )
+        result = Search().search(game, 2)
+        assert result.best_move == Move.from_uci("h5f7")
+        assert result.score == MATE_SCORE - 1
+        assert result.pv == [Move.from_uci("h5f7")]
+
+    def test_wins_material(self):
+        """Hanging queen is captured."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = Search().search(game, 2)
+        assert result.best_move == Move.from_uci("d2d5")
+        assert result.nodes > 0
+
+    def test_promotion(self):
+        """Pawn is promoted to queen."""
+
+        game = Fen.parse("8/P7/8/8/8/8/8/k6K w - - 0 1")
+        assert Search().search(game, 1).best_move == Move.from_uci("a7a8q")
+
+    def test_quiescence(self):
+        """Defended pawn is not taken by the queen at the search horizon."""
+
+        game = Fen.parse("4k3/8/2p5/3p4/8/8/3Q4/4K3 w - - 0 1")
+        assert Search(quiescence=False).search(game, 1).best_move == Move.from_uci(
+            "d2d5"
+        )
+        search = Search()
+        assert search.search(game, 1).best_move != Move.from_uci("d2d5")
+        assert search.quiescence_nodes > 0
+
+    def test_transposition_table(self):
+        """Search with transposition table finds the same move."""
+
+        game = Fen.parse(
+            "r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+        )
+        with TranspositionTable(1 << 12) as table:
+            result = Search(transposition_table=table).search(game, 2)
+            assert result.best_move == Move.from_uci("h5f7")
+            assert result.score == MATE_SCORE - 1
+            assert table.stores > 0
+
+    def test_transposition_table_pv(self):
+        """Principal variation is complete when the table cuts the search off."""
+
+        game = Fen.parse(START_FEN)
+        with TranspositionTable(1 << 14) as table:
+            first = Search(transposition_table=table).search(game, 3)
+            second = Search(transposition_table=table).search(game, 3)
+            assert second.nodes < first.nodes
+            assert len(second.pv) == 3
+            for move in second.pv:
+                assert move in list(GameLogic.legal_moves(game))
+                game = GameLogic.make_move(move, game)
+
+    def test_ponder_move(self):
+        """Reply is taken from the table if the principal variation is too short."""
+
+        game = Fen.parse(START_FEN)
+        with TranspositionTable(1 << 14) as table:
+            search = Search(transposition_table=table)
+            result = search.search(game, 3)
+            assert search.ponder_move(game, result) == result.pv[1]
+            short = result._replace(pv=result.pv[:1])
+            assert search.ponder_move(game, short) == result.pv[1]
+            assert Search().ponder_move(game, short) is None
+
+    def test_selective_search(self):
+        """Each selective technique finds the same move as plain alpha-beta in fewer nodes."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        switches = ["null_move", "late_move_reductions", "pvs", "aspiration"]
+        plain = Search(**{switch: False for switch in switches})
+        plain_result = plain.search(game, 4)
+        assert plain.stats()[2:] == (0, 0, 0, 0, 0, 0)
+        for switch in switches:
+            result = Search(**{other: other == switch for other in switches}).search(
+                game, 4
+            )
+            assert result.best_move == plain_result.best_move == Move.from_uci("d2d5")
+        search = Search()
+        result = search.search(game, 4)
+        assert result.best_move == Move.from_uci("d2d5")
+        stats = search.stats()
+        assert stats.nodes < plain.stats().nodes
+        assert stats.null_move_cutoffs > 0
+        assert stats.lmr_reductions > 0
+
+    def test_null_move_zugzwang(self):
+        """Null move is not tried with king and pawns only."""
+
+        game = Fen.parse("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+        search = Search()
+        search.search(game, 4)
+        assert search.stats().null_move_searches == 0
+
+    def test_multi_pv(self):
+        """Test of multi_pv() method."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        results = []
+        lines = Search(on_iteration=results.append).multi_pv(game, 3, 3)
+        assert [line.multipv for line in lines] == [1, 2, 3]
+        assert lines[0].best_move == Move.from_uci("d2d5")
+        assert lines[0].score == Search().search(game, 3).score
+        assert len({line.best_move for line in lines}) == 3
+        assert lines[0].score > lines[1].score >= lines[2].score
+        assert all(line.pv[0] == line.best_move for line in lines)
+        assert [(result.depth, result.multipv) for result in results] == [
+            (depth, line) for depth in [1, 2, 3] for line in [1, 2, 3]
+        ]
+        # Lines are limited by the number of legal moves.
+        game = Fen.parse("7k/8/8/8/8/8/8/K7 w - - 0 1")
+        assert len(Search().multi_pv(game, 2, 10)) == 3
+
+    def test_stop(self):
+        """Stopped search returns the last completed iteration."""
+
+        game = Fen.parse(START_FEN)
+        result = Search(stop=lambda: True).search(game, 3)
+        assert result.depth < 3
+        assert result.best_move in list(GameLogic.legal_moves(game))
+
+    def test_parallel_search(self):
+        """Test of ParallelSearch.search() method."""
+
+        game = Fen.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = ParallelSearch(workers=2, table_entries=1 << 12).search(game, 2)
+        assert result.best_move == Move.from_uci("d2d5")
+        assert result.depth >= 2
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from entities.position import Position
+
+
+class SliderAttacks:
+    """Attacks of sliding pieces on 8x8 board by table lookup.
+
+    Squares are numbered <y * 8 + x>, sets of squares are 64-bit integers (bitboards).
+    For every square there is a mask of positions which may block the piece (rays without the
+    last position of each ray: piece on the edge blocks nothing) and a table mapping every
+    subset of the mask to the attacked positions. Attacks = table[occupancy & mask], i.e. one
+    masked lookup (PEXT-style indexing; Python dict does the perfect hashing which magic
+    multiplication does in C engines). Attacks include the first blocker in every direction,
+    whichever side it belongs to.
+
+    Tables of a square are built on first use.
+    """
+
+    SIDE = 8
+    ROOK_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
+
+    @staticmethod
+    def square(pos: Position) -> int:
+        return pos.y * SliderAttacks.SIDE + pos.x
+
+    @staticmethod
+    def rook_attacks(square: int, occupancy: int) -> int:
+        entry = _ROOK_TABLES[square]
+        if entry is None:
+            entry = _ROOK_TABLES[square] = SliderAttacks.build_table(
+                square, SliderAttacks.ROOK_DIRECTIONS
+            )
+        return entry[1][occupancy & entry[0]]
+
+    @staticmethod
+    def bishop_attacks(square: int, occupancy: int) -> int:
+        entry = _BISHOP_TABLES[square]
+        if entry is None:
+            entry = _BISHOP_TABLES[square] = SliderAttacks.build_table(
+                square, SliderAttacks.BISHOP_DIRECTIONS
+            )
+        return entry[1][occupancy & entry[0]]
+
+    @staticmethod
+    def queen_attacks(square: int, occupancy: int) -> int:
+        return SliderAttacks.rook_attacks(
+            square, occupancy
+        ) | SliderAttacks.bishop_attacks(square, occupancy)
+
+    @staticmethod
+    def positions(bitboard: int) -> List[Position]:
+        """Return positions of bits set in <bitboard>."""
+
+        positions = []
+        while bitboard:
+            lowest_bit = bitboard & -bitboard
+            positions.append(_POSITIONS[lowest_bit.bit_length() - 1])
+            bitboard ^= lowest_bit
+        return positions
+
+    @staticmethod
+    def ray_attacks(
+        square: int, occupancy: int, directions: List[Tuple[int, int]]
+    ) -> int:
+        """Walk rays from <square> till the first blocker. Used to build tables."""
+
+        attacks = 0
+        start_x, start_y = square % SliderAttacks.SIDE, square // SliderAttacks.SIDE
+        for shift_x, shift_y in directions:
+            x, y = start_x + shift_x, start_y + shift_y
+            while 0 <= x < SliderAttacks.SIDE and 0 <= y < SliderAttacks.SIDE:
+                bit = 1 << (y * SliderAttacks.SIDE + x)
+                attacks |= bit
+                if occupancy & bit:
+                    break
+                x, y = x + shift_x, y + shift_y
+        return attacks
+
+    @staticmethod
+    def blocker_mask(square: int, directions: List[Tuple[int, int]]) -> int:
+        """Return positions which may block a piece on <square>: rays without the edges."""
+
+        mask = 0
+        start_x, start_y = square % SliderAttacks.SIDE, square // SliderAttacks.SIDE
+        for shift_x, shift_y in directions:
+            x, y = start_x + shift_x, start_y + shift_y
+            while 0 <= x + shift_x < SliderAttacks.SIDE and (
+                0 <= y + shift_y < SliderAttacks.SIDE
+            ):
+                mask |= 1 << (y * SliderAttacks.SIDE + x)
+                x, y = x + shift_x, y + shift_y
+        return mask
+
+    @staticmethod
+    def build_table(
+        square: int, directions: List[Tuple[int, int]]
+    ) -> Tuple[int, Dict[int, int]]:
+        """Return (mask, table) for a piece on <square> moving in <directions>.
+        Every subset of the mask is enumerated with the carry-rippler trick.
+        """
+
+        mask = SliderAttacks.blocker_mask(square, directions)
+        table = {}
+        subset = 0
+        while True:
+            table[subset] = SliderAttacks.ray_attacks(square, subset, directions)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        return mask, table
+
+
+_POSITIONS = [
+    Position(square % SliderAttacks.SIDE, square // SliderAttacks.SIDE)
+    for square in range(SliderAttacks.SIDE * SliderAttacks.SIDE)
+]
+_ROOK_TABLES: List[Optional[Tuple[int, Dict[int, int]]]] = [None] * len(_POSITIONS)
+_BISHOP_TABLES: List[Optional[Tuple[int, Dict[int, int]]]] = [None] * len(_POSITIONS)
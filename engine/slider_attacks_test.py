@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+
+import random
+import unittest
+
+from engine.positions_under_threat import PositionsUnderThreat
+from engine.slider_attacks import SliderAttacks
+from entities.board import Board
+from entities.colour import Colour
+from entities.pieces import Pieces
+from entities.position import Position
+
+
+class TestSliderAttacks(unittest.TestCase):
+    """Test of SliderAttacks class."""
+
+    def test_rook_attacks(self):
+        """Test of rook_attacks() method."""
+
+        square = SliderAttacks.square(Position(0, 0))
+        blocker = 1 << SliderAttacks.square(Position(0, 2))
+        assert sorted(
+            SliderAttacks.positions(SliderAttacks.rook_attacks(square, blocker))
+        ) == [
+            Position(0, 1),
+            Position(0, 2),
+            *[Position(x, 0) for x in range(1, 8)],
+        ]
+
+    def test_bishop_attacks(self):
+        """Test of bishop_attacks() method."""
+
+        square = SliderAttacks.square(Position(3, 3))
+        blocker = 1 << SliderAttacks.square(Position(5, 5))
+        assert sorted(
+            SliderAttacks.positions(SliderAttacks.bishop_attacks(square, blocker))
+        ) == sorted(
+            [
+                Position(4, 4),
+                Position(5, 5),
+                Position(2, 2),
+                Position(1, 1),
+                Position(0, 0),
+                Position(4, 2),
+                Position(5, 1),
+                Position(6, 0),
+                Position(2, 4),
+                Position(1, 5),
+                Position(0, 6),
+            ]
+        )
+
+    def test_tables_match_rays(self):
+        """Table lookups return the same positions as ray walking on random boards."""
+
+        rng = random.Random(32)
+        pieces = [Pieces.WHITE_PAWN, Pieces.BLACK_PAWN, Pieces.WHITE_KNIGHT]
+        for _ in range(50):
+            board = Board()
+            for _ in range(rng.randint(0, 20)):
+                board.set_piece(
+                    Position(rng.randint(0, 7), rng.randint(0, 7)), rng.choice(pieces)
+                )
+            pos = Position(rng.randint(0, 7), rng.randint(0, 7))
+            board.remove_piece(pos)
+            for colour in [Colour.WHITE, Colour.BLACK]:
+                for by_tables, by_rays in [
+                    (
+                        PositionsUnderThreat.positions_under_rook_threat,
+                        PositionsUnderThreat.positions_under_rook_threat_by_rays,
+                    ),
+                    (
+                        PositionsUnderThreat.positions_under_bishop_threat,
+                        PositionsUnderThreat.positions_under_bishop_threat_by_rays,
+                    ),
+                    (
+                        PositionsUnderThreat.positions_under_queen_threat,
+                        PositionsUnderThreat.positions_under_queen_threat_by_rays,
+                    ),
+                ]:
+                    assert sorted(by_tables(pos, colour, board)) == sorted(
+                        by_rays(pos, colour, board)
+                    )
+
+    def test_occupancy(self):
+        """Board occupancy follows set_piece() and remove_piece()."""
+
+        board = Board.create_start_board()
+        assert board.colour_occupancy(Colour.WHITE) == 0xFFFF
+        assert board.colour_occupancy(Colour.BLACK) == 0xFFFF << 48
+        snapshot = board.snapshot()
+        board.remove_piece(Position(4, 1))
+        board.set_piece(Position(4, 3), Pieces.WHITE_PAWN)
+        assert board.occupancy() == (0xFFFF ^ (1 << 12) | (1 << 28) | 0xFFFF << 48)
+        assert snapshot.occupancy() == 0xFFFF | 0xFFFF << 48
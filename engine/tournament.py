@@ -0,0 +1,352 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from engine.evaluation import Evaluation
+from engine.fen import Fen
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.search import Search
+from entities.colour import Colour
+from entities.game_status import GameStatus
+
+
+class EngineConfig(NamedTuple):
+    """Settings of one tournament participant. <evaluate> must be picklable."""
+
+    name: str
+    depth: int = 2
+    quiescence: bool = True
+    evaluate: Callable[[Game], int] = Evaluation.evaluate
+
+    def create_search(self) -> Search:
+        return Search(self.evaluate, quiescence=self.quiescence)
+
+
+class GameRecord(NamedTuple):
+    """Result of one game. <score> is from the point of view of the first engine."""
+
+    index: int
+    opening: str
+    first_is_white: bool
+    status: GameStatus
+    score: float
+    plies: int
+    nodes: int
+    seconds: float
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "opening": self.opening,
+            "first_is_white": self.first_is_white,
+            "status": self.status.name.lower(),
+            "score": self.score,
+            "plies": self.plies,
+            "nodes": self.nodes,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class Sprt(NamedTuple):
+    """Sequential probability ratio test of H0: elo = <elo0> against H1: elo = <elo1>.
+    Log-likelihood ratio uses the normal approximation of the game score distribution.
+    """
+
+    elo0: float = 0.0
+    elo1: float = 10.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    def llr(self, wins: int, draws: int, losses: int) -> float:
+        games = wins + draws + losses
+        if games == 0:
+            return 0.0
+        mean = (wins + draws / 2) / games
+        variance = (
+            wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean**2
+        ) / games
+        if variance == 0:
+            return 0.0
+        score0, score1 = expected_score(self.elo0), expected_score(self.elo1)
+        return games * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+    def bounds(self) -> tuple:
+        return (
+            math.log(self.beta / (1 - self.alpha)),
+            math.log((1 - self.beta) / self.alpha),
+        )
+
+    def decision(self, wins: int, draws: int, losses: int) -> Optional[str]:
+        """Return "H0" or "H1" once accepted, None while undecided."""
+
+        lower, upper = self.bounds()
+        llr = self.llr(wins, draws, losses)
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        return None
+
+
+class TournamentReport(NamedTuple):
+    """Summary of played games from the point of view of the first engine.
+    <elo_error> is the half width of the 95% confidence interval.
+    """
+
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    elo: float
+    elo_error: float
+    games_per_second: float
+    nodes_per_second: float
+    llr: Optional[float] = None
+    decision: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            field: round(value, 2) if isinstance(value, float) else value
+            for field, value in self._asdict().items()
+        }
+
+
+class Tournament:
+    """Games between two engine configurations over a process pool.
+
+    Every opening is played twice with colours swapped. Engines are deterministic, so
+    games from the same opening and colours are copies which would count as independent
+    samples: <openings> must have a distinct position for every pair of games. By default
+    pairs start from distinct random openings (see random_openings()).
+    Games end by GameLogic.game_status (mate, stalemate, repetition, fifty-move rule,
+    insufficient material) or are adjudicated a draw after <max_plies>. With <sprt> set
+    the tournament stops as soon as the test accepts one of the hypotheses.
+    """
+
+    def __init__(
+        self,
+        first: EngineConfig,
+        second: EngineConfig,
+        openings: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        max_plies: int = 200,
+        sprt: Optional[Sprt] = None,
+    ) -> None:
+        """<workers> = 0 plays in the calling process, None uses one process per CPU."""
+
+        self._first = first
+        self._second = second
+        self._openings = openings or None
+        self._workers = workers
+        self._max_plies = max_plies
+        self._sprt = sprt
+        self.records: List[GameRecord] = []
+        self._start_time = 0.0
+
+    def play(self, games: int) -> Iterator[GameRecord]:
+        """Play <games> games yielding each one when it finishes. ValueError is raised if
+        <openings> has fewer distinct positions than pairs of games.
+        """
+
+        pairs = (games + 1) // 2
+        if self._openings is not None and len(set(self._openings)) < pairs:
+            raise ValueError(
+                f"{games} games need {pairs} distinct openings,"
+                f" got {len(set(self._openings))}."
+            )
+        self.records = []
+        self._start_time = time.monotonic()
+        tasks = self._tasks(games)
+        players = (self._first, self._second, self._max_plies)
+        if self._workers == 0:
+            for task in tasks:
+                decided = self._record(self.play_game(*players, *task))
+                yield self.records[-1]
+                if decided:
+                    return
+            return
+
+        workers = self._workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight: Set[Future] = set()
+            decided = False
+            for task in tasks:
+                in_flight.add(executor.submit(Tournament.play_game, *players, *task))
+                if len(in_flight) >= 2 * workers:
+                    decided, in_flight = yield from self._collect(in_flight)
+                    if decided:
+                        break
+            while in_flight and not decided:
+                decided, in_flight = yield from self._collect(in_flight)
+            # Games already running are finished, queued ones are dropped.
+            for future in in_flight:
+                future.cancel()
+
+    def _tasks(self, games: int) -> Iterator[tuple]:
+        """Yield (index, opening, first_is_white) of every game."""
+
+        openings = (
+            iter(dict.fromkeys(self._openings))
+            if self._openings is not None
+            else random_openings()
+        )
+        for pair, opening in zip(range((games + 1) // 2), openings):
+            for index in range(2 * pair, min(2 * pair + 2, games)):
+                yield index, opening, index % 2 == 0
+
+    def report(self) -> TournamentReport:
+        """Return summary of games played so far."""
+
+        wins = sum(record.score == 1 for record in self.records)
+        draws = sum(record.score == 0.5 for record in self.records)
+        losses = len(self.records) - wins - draws
+        elo, elo_error = elo_with_error(wins, draws, losses)
+        elapsed = max(time.monotonic() - self._start_time, 1e-9)
+        llr = decision = None
+        if self._sprt is not None:
+            llr = self._sprt.llr(wins, draws, losses)
+            decision = self._sprt.decision(wins, draws, losses)
+        return TournamentReport(
+            len(self.records),
+            wins,
+            draws,
+            losses,
+            elo,
+            elo_error,
+            len(self.records) / elapsed,
+            sum(record.nodes for record in self.records) / elapsed,
+            llr,
+            decision,
+        )
+
+    def _collect(self, in_flight: Set[Future]):
+        """Yield finished games. Return whether SPRT is decided and still running futures."""
+
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        decided = False
+        for future in done:
+            decided = self._record(future.result()) or decided
+            yield self.records[-1]
+        return decided, in_flight
+
+    def _record(self, record: GameRecord) -> bool:
+        """Add <record>. Return True if SPRT is decided."""
+
+        self.records.append(record)
+        return self._sprt is not None and self.report().decision is not None
+
+    @staticmethod
+    def play_game(
+        first: EngineConfig,
+        second: EngineConfig,
+        max_plies: int,
+        index: int,
+        opening: str,
+        first_is_white: bool,
+    ) -> GameRecord:
+        """Play one game from <opening> FEN and return its record."""
+
+        start = time.monotonic()
+        game = Fen.parse(opening)
+        first_colour = Colour.WHITE if first_is_white else Colour.BLACK
+        searches = {
+            first_colour: (first, first.create_search()),
+            Colour.change_colour(first_colour): (second, second.create_search()),
+        }
+        nodes = plies = 0
+        status = GameLogic.game_status(game)
+        while not status.is_over() and plies < max_plies:
+            config, search = searches[game.turn]
+            result = search.search(game, config.depth)
+            nodes += result.nodes
+            game = GameLogic.make_move(result.best_move, game)
+            plies += 1
+            status = GameLogic.game_status(game)
+
+        if status == GameStatus.CHECKMATE:
+            # Side to move is mated.
+            score = 0.0 if game.turn == first_colour else 1.0
+        else:
+            score = 0.5
+        return GameRecord(
+            index,
+            opening,
+            first_is_white,
+            status,
+            score,
+            plies,
+            nodes,
+            time.monotonic() - start,
+        )
+
+
+def expected_score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_difference(score: float) -> float:
+    """Return Elo difference corresponding to expected <score> (0 < score < 1)."""
+
+    return 400 * math.log10(score / (1 - score))
+
+
+def elo_with_error(wins: int, draws: int, losses: int) -> tuple:
+    """Return Elo difference and half width of its 95% confidence interval.
+    Scores of 0 or 1 are clamped, so results stay finite.
+    """
+
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, math.inf
+    mean = (wins + draws / 2) / games
+    deviation = math.sqrt(
+        (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean**2) / games
+    ) / math.sqrt(games)
+    epsilon = 1 / (2 * games + 2)
+
+    def clamp(score: float) -> float:
+        return min(max(score, epsilon), 1 - epsilon)
+
+    elo = elo_difference(clamp(mean))
+    lower = elo_difference(clamp(mean - 1.96 * deviation))
+    upper = elo_difference(clamp(mean + 1.96 * deviation))
+    return elo, (upper - lower) / 2
+
+
+def random_openings(plies: int = 4, seed: int = 0) -> Iterator[str]:
+    """Yield distinct FEN positions after <plies> random legal moves from the start
+    position. Positions where the game is over are skipped. The same <seed> gives the same
+    positions.
+    """
+
+    rng = random.Random(seed)
+    seen: Set[str] = set()
+    while True:
+        game = Game.create_start_game()
+        for _ in range(plies):
+            moves = list(GameLogic.legal_moves(game))
+            if not moves:
+                break
+            game = GameLogic.make_move(rng.choice(moves), game)
+        fen = Fen.dump(game)
+        if fen not in seen and not GameLogic.game_status(game).is_over():
+            seen.add(fen)
+            yield fen
+
+
+def load_openings(lines: Iterable[str]) -> List[str]:
+    """Return FEN/EPD openings from <lines>, skipping empty lines and '#' comments."""
+
+    return [
+        line.strip()
+        for line in lines
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
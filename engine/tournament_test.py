@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+
+import itertools
+import unittest
+
+from engine.tournament import (
+    EngineConfig,
+    Sprt,
+    Tournament,
+    elo_with_error,
+    load_openings,
+    random_openings,
+)
+from entities.game_status import GameStatus
+
+# White mates in one.
+OPENINGS = [
+    "r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+    "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1",
+]
+
+
+class TestTournament(unittest.TestCase):
+    """Test of Tournament class."""
+
+    def check_records(self, tournament, records):
+        assert sorted(record.index for record in records) == [0, 1, 2, 3]
+        for record in records:
+            assert record.status == GameStatus.CHECKMATE
+            assert record.plies == 1
+            # White always mates: the first engine wins with white only.
+            assert record.score == (1.0 if record.first_is_white else 0.0)
+        report = tournament.report()
+        assert (report.games, report.wins, report.draws, report.losses) == (4, 2, 0, 2)
+        assert report.elo == 0
+        assert report.games_per_second > 0
+        assert report.nodes_per_second > 0
+
+    def test_play_in_process(self):
+        """Test of play() method without process pool."""
+
+        tournament = Tournament(
+            EngineConfig("first", 1), EngineConfig("second", 1), OPENINGS, workers=0
+        )
+        self.check_records(tournament, list(tournament.play(4)))
+
+    def test_play_with_pool(self):
+        """Test of play() method with process pool."""
+
+        tournament = Tournament(
+            EngineConfig("first", 1), EngineConfig("second", 1), OPENINGS, workers=2
+        )
+        self.check_records(tournament, list(tournament.play(4)))
+
+    def test_max_plies(self):
+        """Game is adjudicated a draw after max_plies."""
+
+        tournament = Tournament(
+            EngineConfig("first", 1), EngineConfig("second", 1), workers=0, max_plies=2
+        )
+        records = list(tournament.play(1))
+        assert records[0].plies == 2
+        assert records[0].score == 0.5
+
+    def test_openings(self):
+        """Every pair of games has its own opening, repeated openings are rejected."""
+
+        tournament = Tournament(
+            EngineConfig("first", 1), EngineConfig("second", 1), workers=0, max_plies=1
+        )
+        openings = [record.opening for record in tournament.play(6)]
+        assert openings[::2] == openings[1::2]
+        assert len(set(openings)) == 3
+        tournament = Tournament(
+            EngineConfig("first", 1),
+            EngineConfig("second", 1),
+            OPENINGS[:1] * 2,
+            workers=0,
+        )
+        with self.assertRaises(ValueError):
+            list(tournament.play(4))
+
+    def test_random_openings(self):
+        """Test of random_openings() function: positions are distinct and reproducible."""
+
+        openings = list(itertools.islice(random_openings(seed=1), 20))
+        assert len(set(openings)) == 20
+        assert openings[:5] == list(itertools.islice(random_openings(seed=1), 5))
+        assert openings != list(itertools.islice(random_openings(seed=2), 20))
+
+    def test_elo(self):
+        """Test of elo_with_error() function."""
+
+        assert elo_with_error(10, 0, 10)[0] == 0
+        elo, error = elo_with_error(60, 20, 20)
+        assert round(elo) == 147
+        assert 50 < error < 100
+        assert elo_with_error(10, 0, 0)[0] > 400
+
+    def test_sprt(self):
+        """Test of Sprt.decision() method."""
+
+        sprt = Sprt(0, 10)
+        assert sprt.decision(10, 10, 10) is None
+        assert sprt.decision(600, 200, 400) == "H1"
+        assert sprt.decision(400, 200, 600) == "H0"
+
+    def test_load_openings(self):
+        """Test of load_openings() function."""
+
+        assert load_openings(["# comment", "", " fen 1 \n"]) == ["fen 1"]
@@ -0,0 +1,315 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from engine.game import Game
+from engine.game_collection import GameCollection
+from engine.logic import GameLogic
+from entities.castling_rights import CastlingRights
+from entities.colour import Colour
+from entities.game_status import GameStatus
+from entities.pieces import Piece, PieceType
+
+# Order of piece planes: white pieces first, then black ones.
+PLANE_TYPES = [
+    PieceType.PAWN,
+    PieceType.KNIGHT,
+    PieceType.BISHOP,
+    PieceType.ROOK,
+    PieceType.QUEEN,
+    PieceType.KING,
+]
+PLANES = 2 * len(PLANE_TYPES)
+SIDE = 8
+# Columns of metadata array. Flags are 0/1, en passant file is -1 if there is none,
+# result is 1 (white won), 0 (draw) or -1 (black won).
+META_COLUMNS = [
+    "white_to_move",
+    "white_short_castling",
+    "white_long_castling",
+    "black_short_castling",
+    "black_long_castling",
+    "en_passant_file",
+    "result",
+]
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+class EncodedPositions(NamedTuple):
+    """Positions encoded as raw bytes: <planes> has PLANES * SIDE * SIDE uint8 per
+    position, <meta> has len(META_COLUMNS) int8 per position. <games> were encoded,
+    <rejected_games> were skipped for malformed or illegal moves.
+    """
+
+    count: int
+    planes: bytes
+    meta: bytes
+    games: int = 0
+    rejected_games: int = 0
+
+
+class TrainingExporter:
+    """Export of game positions into NumPy training arrays.
+
+    Games are replayed with GameLogic.make_move. Every position before a move and the final
+    one is encoded as a (12, 8, 8) uint8 piece-plane tensor (plane = colour * 6 + index in
+    PLANE_TYPES, then y, then x) and a row of META_COLUMNS. Arrays are written into
+    memory-mapped .npy shards of <shard_size> positions (the last shard is filled partially)
+    described by manifest.json, so datasets larger than RAM are produced and read shard by
+    shard. Games are encoded by a process pool in chunks; at most <max_chunks_in_flight>
+    chunks are held at once, which keeps memory constant. Games with malformed or illegal
+    moves are skipped and counted in the manifest, so one bad line does not stop a long
+    export.
+
+    NumPy is needed for writing and reading shards only and is imported on first use.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shard_size: int = 65536,
+        workers: Optional[int] = None,
+        chunk_size: int = 64,
+        max_chunks_in_flight: Optional[int] = None,
+    ) -> None:
+        """<workers> = 0 encodes in the calling process, None uses one process per CPU."""
+
+        self._directory = directory
+        self._shard_size = shard_size
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._max_chunks_in_flight = max_chunks_in_flight
+
+    def export(self, games: Iterable[str]) -> dict:
+        """Export <games> given as lines of UCI moves from the start position, optionally
+        ended by result (1-0, 0-1, 1/2-1/2). Return the manifest.
+
+        The manifest of a previous export into the directory is removed first. If the
+        export fails, shards written so far are removed too, so the directory never has a
+        manifest describing incomplete shards.
+        """
+
+        os.makedirs(self._directory, exist_ok=True)
+        manifest_path = os.path.join(self._directory, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        writer = _ShardWriter(self._directory, self._shard_size)
+        try:
+            for encoded in self._encode_chunks(games):
+                writer.write(encoded)
+            return writer.close()
+        except BaseException:
+            writer.remove()
+            raise
+
+    def _encode_chunks(self, games: Iterable[str]) -> Iterator[EncodedPositions]:
+        return GameCollection.map_chunks(
+            TrainingExporter.encode_games,
+            games,
+            self._chunk_size,
+            self._workers,
+            self._max_chunks_in_flight,
+        )
+
+    @staticmethod
+    def encode_games(games: List[str]) -> EncodedPositions:
+        """Replay <games> and encode all their positions. Games with malformed or illegal
+        moves are skipped and counted.
+        """
+
+        count = rejected = 0
+        planes = bytearray()
+        meta = bytearray()
+        for line in games:
+            try:
+                game_line = GameCollection.parse_line(line)
+                result = game_line.result
+                rows = []
+                for game, move in GameCollection.replay(game_line):
+                    rows.append(TrainingExporter.encode_position(game))
+                    if move is None and result is None:
+                        result = TrainingExporter.final_result(game)
+            except ValueError:
+                rejected += 1
+                continue
+            for position_planes, position_meta in rows:
+                planes += position_planes
+                meta += bytes(value & 0xFF for value in [*position_meta, result])
+            count += len(rows)
+        return EncodedPositions(
+            count, bytes(planes), bytes(meta), len(games) - rejected, rejected
+        )
+
+    @staticmethod
+    def encode_position(game: Game) -> Tuple[bytearray, List[int]]:
+        """Return piece planes of the position and its metadata without the result."""
+
+        board = game.board
+        if board.width != SIDE or board.height != SIDE:
+            raise ValueError(f"Only {SIDE}x{SIDE} boards can be encoded")
+        planes = bytearray(PLANES * SIDE * SIDE)
+        for colour in [Colour.WHITE, Colour.BLACK]:
+            for type_index, piece_type in enumerate(PLANE_TYPES):
+                plane = colour.value * len(PLANE_TYPES) + type_index
+                for pos in board.get_positions_for_piece(Piece(piece_type, colour)):
+                    planes[(plane * SIDE + pos.y) * SIDE + pos.x] = 1
+        rights = GameLogic.castling_rights(game)
+        en_passant_file = GameLogic.en_passant_file(game)
+        return planes, [
+            int(game.turn == Colour.WHITE),
+            int(bool(rights & CastlingRights.WHITE_SHORT)),
+            int(bool(rights & CastlingRights.WHITE_LONG)),
+            int(bool(rights & CastlingRights.BLACK_SHORT)),
+            int(bool(rights & CastlingRights.BLACK_LONG)),
+            -1 if en_passant_file is None else en_passant_file,
+        ]
+
+    @staticmethod
+    def final_result(game: Game) -> int:
+        """Result of a game without explicit one: mated side loses, anything else is a draw."""
+
+        if GameLogic.game_status(game) == GameStatus.CHECKMATE:
+            return -1 if game.turn == Colour.WHITE else 1
+        return 0
+
+
+class TrainingShards:
+    """Reader of exported shards. Arrays are memory-mapped read-only."""
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        with open(
+            os.path.join(directory, MANIFEST_NAME), encoding="utf-8"
+        ) as manifest_file:
+            self.manifest = json.load(manifest_file)
+        if self.manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version in {directory}")
+
+    def __len__(self) -> int:
+        return self.manifest["positions"]
+
+    def __iter__(self) -> Iterator[tuple]:
+        """Yield (planes, meta) arrays of every shard, trimmed to its filled part."""
+
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        for shard in self.manifest["shards"]:
+            count = shard["count"]
+            yield (
+                numpy.load(
+                    os.path.join(self._directory, shard["planes"]), mmap_mode="r"
+                )[:count],
+                numpy.load(os.path.join(self._directory, shard["meta"]), mmap_mode="r")[
+                    :count
+                ],
+            )
+
+
+# Writer keeps the open shard arrays and running totals of the manifest.
+class _ShardWriter:  # pylint: disable=too-many-instance-attributes
+    """Writer of fixed-size memory-mapped shards."""
+
+    def __init__(self, directory: str, shard_size: int) -> None:
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        self._numpy = numpy
+        self._directory = directory
+        self._shard_size = shard_size
+        self._shards: List[dict] = []
+        self._planes = self._meta = None
+        self._filled = 0
+        self._positions = 0
+        self._games = 0
+        self._rejected_games = 0
+
+    def write(self, encoded: EncodedPositions) -> None:
+        planes = self._numpy.frombuffer(
+            encoded.planes, dtype=self._numpy.uint8
+        ).reshape(encoded.count, PLANES, SIDE, SIDE)
+        meta = self._numpy.frombuffer(encoded.meta, dtype=self._numpy.int8).reshape(
+            encoded.count, len(META_COLUMNS)
+        )
+        written = 0
+        while written < encoded.count:
+            if self._planes is None or self._filled == self._shard_size:
+                self._open_shard()
+            size = min(encoded.count - written, self._shard_size - self._filled)
+            self._planes[self._filled : self._filled + size] = planes[
+                written : written + size
+            ]
+            self._meta[self._filled : self._filled + size] = meta[
+                written : written + size
+            ]
+            self._filled += size
+            self._shards[-1]["count"] = self._filled
+            written += size
+        self._positions += encoded.count
+        self._games += encoded.games
+        self._rejected_games += encoded.rejected_games
+
+    def close(self) -> dict:
+        """Flush the last shard and write the manifest. Return the manifest."""
+
+        self._close_shard()
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "shard_size": self._shard_size,
+            "positions": self._positions,
+            "games": self._games,
+            "rejected_games": self._rejected_games,
+            "planes_shape": [PLANES, SIDE, SIDE],
+            "plane_types": [piece_type.name.lower() for piece_type in PLANE_TYPES],
+            "meta_columns": META_COLUMNS,
+            "shards": self._shards,
+        }
+        path = os.path.join(self._directory, MANIFEST_NAME)
+        with open(path + ".tmp", "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(path + ".tmp", path)
+        return manifest
+
+    def remove(self) -> None:
+        """Remove shards written so far."""
+
+        self._planes = self._meta = None
+        for shard in self._shards:
+            for name in [shard["planes"], shard["meta"]]:
+                path = os.path.join(self._directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+        self._shards = []
+
+    def _open_shard(self) -> None:
+        self._close_shard()
+        index = len(self._shards)
+        shard = {
+            "planes": f"planes-{index:05d}.npy",
+            "meta": f"meta-{index:05d}.npy",
+            "count": 0,
+        }
+        open_memmap = self._numpy.lib.format.open_memmap
+        self._planes = open_memmap(
+            os.path.join(self._directory, shard["planes"]),
+            mode="w+",
+            dtype=self._numpy.uint8,
+            shape=(self._shard_size, PLANES, SIDE, SIDE),
+        )
+        self._meta = open_memmap(
+            os.path.join(self._directory, shard["meta"]),
+            mode="w+",
+            dtype=self._numpy.int8,
+            shape=(self._shard_size, len(META_COLUMNS)),
+        )
+        self._shards.append(shard)
+        self._filled = 0
+
+    def _close_shard(self) -> None:
+        if self._planes is not None:
+            self._planes.flush()
+            self._meta.flush()
+        self._planes = self._meta = None
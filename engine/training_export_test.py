@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from engine.game import Game
+from engine.training_export import (
+    META_COLUMNS,
+    PLANES,
+    SIDE,
+    TrainingExporter,
+    TrainingShards,
+)
+
+GAMES = [
+    "e2e4 e7e5 g1f3 1/2-1/2",
+    "f2f3 e7e5 g2g4 d8h4",
+    "e2e4 d7d5 e4e5 f7f5",
+]
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class TestTrainingExporter(unittest.TestCase):
+    """Test of TrainingExporter class."""
+
+    def test_encode_position(self):
+        """Test of encode_position() method."""
+
+        planes, meta = TrainingExporter.encode_position(Game.create_start_game())
+        assert len(planes) == PLANES * SIDE * SIDE
+        assert sum(planes) == 32
+        # White pawn on e2: plane 0, y = 1, x = 4.
+        assert planes[(0 * SIDE + 1) * SIDE + 4] == 1
+        # Black king on e8: plane 11, y = 7, x = 4.
+        assert planes[(11 * SIDE + 7) * SIDE + 4] == 1
+        assert meta == [1, 1, 1, 1, 1, -1]
+
+    def test_encode_games(self):
+        """Test of encode_games() method: results and en passant flags."""
+
+        encoded = TrainingExporter.encode_games(GAMES)
+        assert encoded.count == 4 + 5 + 5
+        assert len(encoded.planes) == encoded.count * PLANES * SIDE * SIDE
+        rows = [
+            [value - 256 if value > 127 else value for value in encoded.meta[i : i + 7]]
+            for i in range(0, len(encoded.meta), len(META_COLUMNS))
+        ]
+        assert [row[-1] for row in rows] == [0] * 4 + [-1] * 5 + [0] * 5
+        # After f7f5 white pawn on e5 can capture en passant on file f.
+        assert rows[-1][5] == 5
+        assert rows[-2][5] == -1
+        assert (encoded.games, encoded.rejected_games) == (3, 0)
+
+    def test_encode_rejected_games(self):
+        """Games with illegal or malformed moves are skipped and counted."""
+
+        encoded = TrainingExporter.encode_games(["e2e5", GAMES[0], "e2e4 x"])
+        assert encoded.count == 4
+        assert len(encoded.meta) == 4 * len(META_COLUMNS)
+        assert (encoded.games, encoded.rejected_games) == (1, 2)
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_export(self):
+        """Exported shards are read back with the same positions."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = TrainingExporter(
+                directory, shard_size=4, workers=2, chunk_size=1
+            ).export(GAMES)
+            assert manifest["positions"] == 14
+            assert [shard["count"] for shard in manifest["shards"]] == [4, 4, 4, 2]
+            shards = TrainingShards(directory)
+            assert len(shards) == 14
+            arrays = list(shards)
+            assert arrays[0][0].shape == (4, PLANES, SIDE, SIDE)
+            assert arrays[-1][1].shape == (2, len(META_COLUMNS))
+            assert arrays[1][1][0][-1] == -1
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_export_rejected_games(self):
+        """Rejected games are reported in the manifest and do not stop the export."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = TrainingExporter(
+                directory, shard_size=4, workers=0, chunk_size=1
+            ).export(["e2e5", *GAMES])
+            assert manifest["positions"] == 14
+            assert (manifest["games"], manifest["rejected_games"]) == (3, 1)
+            assert TrainingShards(directory).manifest == manifest
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_export_failure(self):
+        """Shards of a failed export are removed together with an old manifest."""
+
+        def games():
+            yield from GAMES
+            raise OSError("Read error")
+
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = TrainingExporter(
+                directory, shard_size=4, workers=0, chunk_size=1
+            )
+            exporter.export(GAMES)
+            with self.assertRaises(OSError):
+                exporter.export(games())
+            assert not os.listdir(directory)
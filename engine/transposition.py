@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from enum import IntEnum
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+from entities.move import Move
+
+
+class Bound(IntEnum):
+    EXACT = 0
+    # Score is at least the stored one (search failed high).
+    LOWER = 1
+    # Score is at most the stored one (search failed low).
+    UPPER = 2
+
+
+class TableEntry(NamedTuple):
+    depth: int
+    score: int
+    bound: Bound
+    move: Optional[Move]
+
+
+class TranspositionTable:
+    """Transposition table in shared memory which can be used by several processes at once.
+
+    Table is an array of 64-bit words: a header word with the number of entries followed by
+    two words per entry, <key ^ data> and <data>. Data packs depth, score, bound and move.
+    Entries are written and read without locks: a reader which sees a half-written entry
+    finds <key ^ data> not matching the data and treats the entry as missing, so a torn write
+    costs a miss and never a wrong score.
+
+    The process which creates the table owns it and unlinks it on close(). Other processes
+    attach by name; a pickled table attaches to the same memory when unpickled.
+    """
+
+    # Bytes per word.
+    WORD_SIZE = 8
+
+    def __init__(self, entries: int = 1 << 16, name: Optional[str] = None) -> None:
+        """Create a table of <entries> (rounded up to a power of 2) or attach to table
+        <name> created by another process.
+        """
+
+        if name is None:
+            entries = 1 << max(entries - 1, 1).bit_length()
+            self._memory = shared_memory.SharedMemory(
+                create=True, size=(1 + 2 * entries) * TranspositionTable.WORD_SIZE
+            )
+            self._owner = True
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._words = self._memory.buf.cast("Q")
+        if self._owner:
+            self._words[0] = entries
+        self._mask = self._words[0] - 1
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    @staticmethod
+    def attach(name: str) -> TranspositionTable:
+        return TranspositionTable(name=name)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def __len__(self) -> int:
+        return self._mask + 1
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        """Return entry stored for position <key> or None."""
+
+        self.probes += 1
+        index = 1 + 2 * (key & self._mask)
+        data = self._words[index + 1]
+        if self._words[index] ^ data != key or data == 0:
+            return None
+        self.hits += 1
+        return TableEntry(
+            (data >> _DEPTH_SHIFT) & 0xFF,
+            (data >> _SCORE_SHIFT) - _SCORE_OFFSET,
+            Bound((data >> _BOUND_SHIFT) & 0b11),
+            _unpack_move(data & _MOVE_MASK),
+        )
+
+    def store(
+        self, key: int, depth: int, score: int, bound: Bound, move: Optional[Move]
+    ) -> None:
+        """Store search result of position <key>. Deeper bounds of the same position are not
+        replaced by shallower ones, any other entry is replaced.
+        """
+
+        index = 1 + 2 * (key & self._mask)
+        old_data = self._words[index + 1]
+        if (
+            bound != Bound.EXACT
+            and self._words[index] ^ old_data == key
+            and (old_data >> _DEPTH_SHIFT) & 0xFF > depth
+        ):
+            return
+        data = (
+            ((score + _SCORE_OFFSET) << _SCORE_SHIFT)
+            | (min(depth, 0xFF) << _DEPTH_SHIFT)
+            | (bound << _BOUND_SHIFT)
+            | _pack_move(move)
+        )
+        self._words[index + 1] = data
+        self._words[index] = key ^ data
+        self.stores += 1
+
+    def clear(self) -> None:
+        for index in range(1, len(self._words)):
+            self._words[index] = 0
+
+    def close(self) -> None:
+        """Detach from the table. Owner also frees the shared memory."""
+
+        if self._words is None:
+            return
+        self._words.release()
+        self._words = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> TranspositionTable:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return TranspositionTable.attach, (self.name,)
+
+
+def _pack_move(move: Optional[Move]) -> int:
+    """Pack move into 20 bits, 0 is no move. Coordinates must be less than 16."""
+
+    return 0 if move is None else 1 + move.pack()
+
+
+def _unpack_move(packed: int) -> Optional[Move]:
+    return None if packed == 0 else Move.unpack(packed - 1)
+
+
+_MOVE_MASK = (1 << 20) - 1
+_BOUND_SHIFT = 20
+_DEPTH_SHIFT = 22
+_SCORE_SHIFT = 32
+_SCORE_OFFSET = 1 << 31
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+
+import pickle
+import unittest
+
+from engine.transposition import Bound, TableEntry, TranspositionTable
+from entities.move import Move
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """Test of TranspositionTable class."""
+
+    def setUp(self):
+        self.table = TranspositionTable(1000)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_store_probe(self):
+        """Test of store() and probe() methods."""
+
+        assert len(self.table) == 1024
+        assert self.table.probe(12345) is None
+        move = Move.from_uci("e7e8n")
+        self.table.store(12345, 3, -150, Bound.UPPER, move)
+        assert self.table.probe(12345) == TableEntry(3, -150, Bound.UPPER, move)
+        # Same index, different key.
+        assert self.table.probe(12345 + 1024) is None
+        self.table.store(2**64 - 1, 0, 99999, Bound.EXACT, None)
+        assert self.table.probe(2**64 - 1) == TableEntry(0, 99999, Bound.EXACT, None)
+
+    def test_replacement(self):
+        """Deeper bound of a position is not replaced by a shallower one."""
+
+        self.table.store(7, 5, 10, Bound.LOWER, None)
+        self.table.store(7, 2, 20, Bound.LOWER, None)
+        assert self.table.probe(7).depth == 5
+        self.table.store(7, 2, 30, Bound.EXACT, None)
+        assert self.table.probe(7).score == 30
+
+    def test_torn_entry(self):
+        """Entry whose data does not match the checksum is not returned."""
+
+        self.table.store(7, 5, 10, Bound.LOWER, None)
+        index = 1 + 2 * 7
+        self.table._words[index + 1] ^= 1 << 40
+        assert self.table.probe(7) is None
+
+    def test_attach(self):
+        """Attached and unpickled tables share entries with the original one."""
+
+        attached = pickle.loads(pickle.dumps(self.table))
+        attached.store(42, 1, 5, Bound.EXACT, Move.from_uci("a2a4"))
+        assert self.table.probe(42).move == Move.from_uci("a2a4")
+        attached.close()
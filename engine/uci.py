@@ -0,0 +1,337 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from engine.fen import Fen, InvalidFenException
+from engine.game import Game
+from engine.logic import GameLogic
+from engine.search import MATE_SCORE, MATE_THRESHOLD, Search, SearchResult
+from engine.transposition import TranspositionTable
+from entities.colour import Colour
+from entities.move import Move
+
+ENGINE_NAME = "light-chess"
+ENGINE_AUTHOR = "amirov-m"
+# Depth searched when no depth limit is given.
+MAX_DEPTH = 64
+MAX_MULTI_PV = 256
+
+
+class SearchLimits(NamedTuple):
+    """Limits of `go` command. Times are in milliseconds."""
+
+    wtime: Optional[int] = None
+    btime: Optional[int] = None
+    winc: int = 0
+    binc: int = 0
+    movestogo: Optional[int] = None
+    movetime: Optional[int] = None
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    infinite: bool = False
+    # Search the position after the predicted reply till `ponderhit` or `stop`.
+    ponder: bool = False
+
+    @staticmethod
+    def parse(
+        tokens: List[str], report: Callable[[str], None] = lambda message: None
+    ) -> SearchLimits:
+        """Parse arguments of `go` command. Unknown arguments are ignored, invalid values
+        are passed to <report> and skipped.
+        """
+
+        values = {}
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token in ["infinite", "ponder"]:
+                values[token] = True
+            elif token in SearchLimits._fields and index + 1 < len(tokens):
+                index += 1
+                try:
+                    values[token] = int(tokens[index])
+                except ValueError:
+                    report(f"invalid {token} value {tokens[index]}")
+            index += 1
+        return SearchLimits(**values)
+
+
+class TimeManager:
+    """Allocation of thinking time per move from the clock."""
+
+    # Moves expected till the end of the game when the clock does not tell.
+    DEFAULT_MOVES_TO_GO = 30
+    # Time kept for communication with GUI, ms.
+    MOVE_OVERHEAD = 50
+    # New iteration is not started after this share of the budget: it would not complete.
+    SOFT_LIMIT_RATIO = 0.5
+
+    @staticmethod
+    def allocate(limits: SearchLimits, colour: Colour) -> Optional[float]:
+        """Return time budget for the move in seconds, None if time is not limited."""
+
+        if limits.movetime is not None:
+            return max(limits.movetime - TimeManager.MOVE_OVERHEAD, 1) / 1000
+        time_left = limits.wtime if colour == Colour.WHITE else limits.btime
+        if time_left is None:
+            return None
+        increment = limits.winc if colour == Colour.WHITE else limits.binc
+        moves_to_go = limits.movestogo or TimeManager.DEFAULT_MOVES_TO_GO
+        budget = time_left / moves_to_go + increment * 3 / 4
+        budget = min(budget, time_left - TimeManager.MOVE_OVERHEAD)
+        return max(budget, 1) / 1000
+
+
+class UciEngine:
+    """Universal Chess Interface protocol front-end.
+
+    Commands are handled by handle(), output lines are passed to <output>. Search runs in a
+    background thread, so `stop` and `isready` are answered while searching. Position is kept
+    between commands: `position` with the moves of the previous command and some more applies
+    only the new moves.
+
+    `bestmove` suggests the reply to ponder on from the principal variation. `go ponder`
+    searches without time limit till `ponderhit`, which starts the clock of the running
+    search (the GUI's prediction was right), or `stop`.
+
+    Option MultiPV sets the number of lines searched (see Search.multi_pv()), each reported
+    in its own `info ... multipv N` line.
+    """
+
+    def __init__(
+        self,
+        output: Callable[[str], None] = lambda line: print(line, flush=True),
+        table_entries: int = 1 << 16,
+    ) -> None:
+        self._output = output
+        self._output_lock = threading.Lock()
+        self._table = TranspositionTable(table_entries)
+        self._game = Game.create_start_game()
+        self._position_base: Optional[str] = None
+        self._position_moves: List[str] = []
+        self._search_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # Set by `stop` and `ponderhit`: the best move may be sent.
+        self._release_event = threading.Event()
+        self._ponderhit: Callable[[], None] = _no_ponderhit
+        self._multi_pv = 1
+
+    def run(self, lines: Iterable[str]) -> None:
+        """Handle commands till `quit` or the end of input."""
+
+        try:
+            for line in lines:
+                if not self.handle(line):
+                    break
+        finally:
+            self.close()
+
+    def handle(self, line: str) -> bool:
+        """Handle one command. Return False on `quit`."""
+
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        if command == "uci":
+            self._send(f"id name {ENGINE_NAME}")
+            self._send(f"id author {ENGINE_AUTHOR}")
+            self._send("option name Ponder type check default false")
+            self._send(
+                f"option name MultiPV type spin default 1 min 1 max {MAX_MULTI_PV}"
+            )
+            self._send("uciok")
+        elif command == "isready":
+            self._send("readyok")
+        elif command == "ucinewgame":
+            self.stop()
+            self._table.clear()
+            self._set_position(None, [])
+        elif command == "position":
+            self.stop()
+            self._position(arguments)
+        elif command == "go":
+            self.stop()
+            self._go(
+                SearchLimits.parse(
+                    arguments, lambda message: self._send(f"info string {message}")
+                )
+            )
+        elif command == "setoption":
+            self._set_option(arguments)
+        elif command == "ponderhit":
+            self._ponderhit()
+        elif command == "stop":
+            self.stop()
+        elif command == "quit":
+            self.stop()
+            return False
+        return True
+
+    def game(self) -> Game:
+        return self._game
+
+    def stop(self) -> None:
+        """Stop search if it is running and wait till `bestmove` is sent."""
+
+        self._stop_event.set()
+        self._release_event.set()
+        self.wait()
+
+    def wait(self) -> None:
+        """Wait till search finishes by itself. Infinite search never does."""
+
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self._table.close()
+
+    def _send(self, line: str) -> None:
+        with self._output_lock:
+            self._output(line)
+
+    def _set_option(self, arguments: List[str]) -> None:
+        """Handle `setoption name <name> value <value>`. Unknown options are ignored."""
+
+        if "name" not in arguments or "value" not in arguments:
+            return
+        name = " ".join(
+            arguments[arguments.index("name") + 1 : arguments.index("value")]
+        )
+        value = " ".join(arguments[arguments.index("value") + 1 :])
+        if name.lower() == "multipv":
+            try:
+                self._multi_pv = min(max(int(value), 1), MAX_MULTI_PV)
+            except ValueError:
+                self._send(f"info string invalid MultiPV value {value}")
+
+    def _position(self, arguments: List[str]) -> None:
+        if "moves" in arguments:
+            split = arguments.index("moves")
+            arguments, moves = arguments[:split], arguments[split + 1 :]
+        else:
+            moves = []
+        if arguments[:1] == ["startpos"]:
+            base = None
+        elif arguments[:1] == ["fen"]:
+            base = " ".join(arguments[1:])
+        else:
+            self._send("info string position must be startpos or fen")
+            return
+        self._set_position(base, moves)
+
+    def _set_position(self, base: Optional[str], moves: List[str]) -> None:
+        """Set position <base> (FEN, None for start position) with <moves> played.
+        If it continues the current position only the new moves are made.
+        """
+
+        known = len(self._position_moves)
+        if base == self._position_base and moves[:known] == self._position_moves:
+            new_moves = moves[known:]
+        else:
+            try:
+                self._game = (
+                    Game.create_start_game() if base is None else Fen.parse(base)
+                )
+            except InvalidFenException as exc:
+                self._send(f"info string {exc}")
+                return
+            self._position_base = base
+            self._position_moves = []
+            new_moves = moves
+        for text in new_moves:
+            try:
+                move = Move.from_uci(text)
+            except ValueError:
+                move = None
+            if move is None or move not in GameLogic.legal_moves(self._game):
+                self._send(f"info string illegal move {text}")
+                return
+            self._game = GameLogic.make_move(move, self._game)
+            self._position_moves.append(text)
+
+    def _go(self, limits: SearchLimits) -> None:
+        game = self._game
+        budget = TimeManager.allocate(limits, game.turn)
+        start = time.monotonic()
+        # Time is counted from `ponderhit` when pondering.
+        clock_start: Optional[float] = None if limits.ponder else start
+        stop_event = self._stop_event = threading.Event()
+        release_event = self._release_event = threading.Event()
+        search: Optional[Search] = None
+
+        def ponderhit() -> None:
+            nonlocal clock_start
+            clock_start = time.monotonic()
+            release_event.set()
+
+        def thinking_time() -> float:
+            return time.monotonic() - clock_start if clock_start is not None else 0.0
+
+        def should_stop() -> bool:
+            return (
+                stop_event.is_set()
+                or (budget is not None and thinking_time() >= budget)
+                or (limits.nodes is not None and search.nodes >= limits.nodes)
+            )
+
+        def report(result: SearchResult) -> None:
+            self._send(
+                UciEngine.info_line(
+                    result, time.monotonic() - start, multi_pv=self._multi_pv > 1
+                )
+            )
+            if (
+                budget is not None
+                and thinking_time() >= budget * TimeManager.SOFT_LIMIT_RATIO
+            ):
+                stop_event.set()
+
+        def run() -> None:
+            result = search.multi_pv(game, limits.depth or MAX_DEPTH, self._multi_pv)[0]
+            if limits.infinite:
+                # Best move is sent only after `stop` in infinite mode.
+                stop_event.wait()
+            elif limits.ponder:
+                # And only after `stop` or `ponderhit` while pondering.
+                release_event.wait()
+            self._ponderhit = _no_ponderhit
+            move = result.best_move.to_uci() if result.best_move else "0000"
+            reply = search.ponder_move(game, result)
+            if reply is not None:
+                move += f" ponder {reply.to_uci()}"
+            self._send(f"bestmove {move}")
+
+        self._ponderhit = ponderhit
+        search = Search(
+            transposition_table=self._table, stop=should_stop, on_iteration=report
+        )
+        self._search_thread = threading.Thread(target=run, daemon=True)
+        self._search_thread.start()
+
+    @staticmethod
+    def info_line(result: SearchResult, elapsed: float, multi_pv: bool = False) -> str:
+        if result.score >= MATE_THRESHOLD:
+            score = f"mate {(MATE_SCORE - result.score + 1) // 2}"
+        elif result.score <= -MATE_THRESHOLD:
+            score = f"mate -{(MATE_SCORE + result.score) // 2}"
+        else:
+            score = f"cp {result.score}"
+        nps = int(result.nodes / elapsed) if elapsed > 0 else 0
+        pv = " ".join(move.to_uci() for move in result.pv)
+        line = f" multipv {result.multipv}" if multi_pv else ""
+        return (
+            f"info depth {result.depth}{line} score {score} nodes {result.nodes} nps {nps} "
+            f"time {int(elapsed * 1000)} pv {pv}"
+        ).rstrip()
+
+
+def _no_ponderhit() -> None:
+    pass
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+
+import unittest
+
+from engine.fen import START_FEN, Fen
+from engine.uci import SearchLimits, TimeManager, UciEngine
+from entities.colour import Colour
+from entities.move import Move
+
+
+class TestUci(unittest.TestCase):
+    """Test of UCI front-end."""
+
+    def setUp(self):
+        self.lines = []
+        self.engine = UciEngine(self.lines.append, table_entries=1 << 10)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_search_limits(self):
+        """Test of SearchLimits.parse() method."""
+
+        limits = SearchLimits.parse("wtime 1000 btime 2000 winc 10 movestogo 5".split())
+        assert limits == SearchLimits(1000, 2000, 10, 0, 5)
+        assert SearchLimits.parse(["infinite", "ponder"]).infinite
+        reported = []
+        assert SearchLimits.parse("wtime abc depth 2".split(), reported.append) == (
+            SearchLimits(depth=2)
+        )
+        assert reported == ["invalid wtime value abc"]
+
+    def test_time_manager(self):
+        """Test of TimeManager.allocate() method."""
+
+        assert TimeManager.allocate(SearchLimits(), Colour.WHITE) is None
+        assert TimeManager.allocate(SearchLimits(movetime=1050), Colour.BLACK) == 1.0
+        limits = SearchLimits(wtime=30000, btime=3000, winc=1000)
+        assert TimeManager.allocate(limits, Colour.WHITE) == 1.75
+        assert TimeManager.allocate(limits, Colour.BLACK) == 0.1
+        assert (
+            TimeManager.allocate(SearchLimits(btime=1000, movestogo=1), Colour.BLACK)
+            == 0.95
+        )
+
+    def test_position(self):
+        """Position commands continuing the current position make only new moves."""
+
+        self.engine.handle("position startpos moves e2e4")
+        game = self.engine.game()
+        self.engine.handle("position startpos moves e2e4 e7e5")
+        assert self.engine.game().history_moves[:-1] == game.history_moves
+        assert self.engine.game().history_moves[-1] == Move.from_uci("e7e5")
+        self.engine.handle(f"position fen {START_FEN} moves e2e4 e7e5")
+        assert (
+            Fen.dump(self.engine.game())
+            == "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+        )
+        self.engine.handle("position startpos moves e2e5")
+        assert self.lines == ["info string illegal move e2e5"]
+
+    def test_go(self):
+        """Search reports info lines and the best move."""
+
+        assert self.engine.handle("uci")
+        assert self.lines[-1] == "uciok"
+        self.engine.handle(
+            "position fen r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+        )
+        self.engine.handle("go depth 1")
+        self.engine.wait()
+        assert self.lines[-1] == "bestmove h5f7"
+        assert self.lines[-2].startswith("info depth 1 score mate 1 nodes ")
+        assert " nps " in self.lines[-2]
+        self.engine.handle("go wtime abc depth 1")
+        self.engine.wait()
+        assert self.lines[-3] == "info string invalid wtime value abc"
+        assert self.lines[-1] == "bestmove h5f7"
+        assert not self.engine.handle("quit")
+
+    def test_multi_pv(self):
+        """Option MultiPV reports several lines."""
+
+        self.engine.handle("setoption name MultiPV value 2")
+        self.engine.handle("position fen 4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        self.engine.handle("go depth 1")
+        self.engine.wait()
+        assert self.lines[-3].startswith("info depth 1 multipv 1 score cp ")
+        assert self.lines[-2].startswith("info depth 1 multipv 2 score cp ")
+        assert self.lines[-1] == "bestmove d2d5"
+
+    def test_ponder(self):
+        """Best move suggests a reply, pondering waits for `ponderhit`."""
+
+        self.engine.handle("position fen 4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        self.engine.handle("go depth 2")
+        self.engine.wait()
+        bestmove = self.lines[-1].split()
+        assert bestmove[:3] == ["bestmove", "d2d5", "ponder"]
+        self.engine.handle(
+            f"position fen 4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1 moves d2d5 {bestmove[3]}"
+        )
+        self.engine.handle("go ponder depth 1 wtime 1000 btime 1000")
+        self.engine.handle("isready")
+        assert sum(line.startswith("bestmove") for line in self.lines) == 1
+        self.engine.handle("ponderhit")
+        self.engine.wait()
+        assert self.lines[-1].startswith("bestmove ")
+        assert self.lines.count("readyok") == 1
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import List, Optional
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+from entities.board_geometry import BoardGeometry
 from entities.colour import Colour
-from entities.pieces import Piece, Pieces
+from entities.pieces import Piece, PieceType
 from entities.position import Position
+from entities.zobrist import Zobrist
 
 
 class SinglePositionNotFoundException(Exception):
@@ -20,31 +22,131 @@ class SinglePositionNotFoundException(Exception):
         return self._actual_positions_count
 
 
-class Board:
+class _PieceData(NamedTuple):
+    colour_index: int
+    is_king: bool
+    is_pawn: bool
+    # Zobrist keys of the piece on every position (see Zobrist.piece_square_keys()).
+    square_keys: array
+
+
+# Data used by every set/remove of a piece, looked up with one hash of the piece. Keys are the
+# same in every process (see Zobrist), so the data is filled on first use and never dropped.
+_PIECE_DATA: Dict[Piece, _PieceData] = {}
+
+
+def _piece_data(piece: Piece) -> _PieceData:
+    data = _PIECE_DATA.get(piece)
+    if data is None:
+        data = _PIECE_DATA[piece] = _PieceData(
+            piece.colour.value,
+            piece.type == PieceType.KING,
+            piece.type == PieceType.PAWN,
+            Zobrist.piece_square_keys(piece),
+        )
+    return data
+
+
+# Besides the piece maps, a board keeps incrementally updated indexes, keys and
+# copy-on-write state for each of them.
+class Board:  # pylint: disable=too-many-instance-attributes
     """
     Represents a chess board.
     """
 
-    def __init__(self) -> None:
+    # Maximum number of snapshots in a row without evaluation data which keep links to
+    # their parents. Longer chains are cut, so a board keeps at most this many ancestors
+    # alive.
+    MAX_CHANGE_CHAIN = 8
+
+    # Changes are tracked for incremental evaluators (see NnueEvaluation) only: once data is
+    # stored by set_evaluation_cache(), the board and its snapshots count and log their
+    # changes. Other boards keep the defaults below and pay nothing for it.
+    _tracks_changes = False
+    # Stores data of an incremental evaluator valid for the current pieces only: cleared on
+    # every set/remove.
+    evaluation_cache: Any = None
+    # Board this one is a snapshot of and log of (added, piece, position) changes made
+    # after the snapshot, so an evaluator updates the parent data instead of computing
+    # it anew. Links form chains of at most MAX_CHANGE_CHAIN snapshots: a board with
+    # evaluation data starts a new chain.
+    parent: Optional[Board] = None
+    changes: Optional[List[Tuple[bool, Piece, Position]]] = None
+    # Number of changes made to the board, to detect changes of the parent.
+    _version = 0
+    _parent_version = 0
+    _chain_length = 0
+
+    def __init__(self, width: int = 8, height: int = 8) -> None:
         # Stores mapping from unique pairs of (piece_type, colour)
         # to a set of positions.
         # Used for getting all positions for a specific piece type.
-        self._piece_to_pos = defaultdict(set)
+        self._piece_to_pos = dict()
         # Stores mapping from position to a piece description.
         # Used for getting a piece standing on a position.
         self._pos_to_piece = dict()
+        # Containers may be shared with snapshots (see snapshot()). Board copies a shared
+        # container before the first write into it.
+        # Is _pos_to_piece (and the _piece_to_pos dict itself) owned by this board.
+        self._owns_squares = True
+        # Pieces whose position sets in _piece_to_pos are owned by this board.
+        # None means all sets are owned.
+        self._owned_sets = None
+        # Stores positions of pieces of each colour (indexed by Colour.value) and the index
+        # (slot) of every position in its list. A removed position is replaced by the last
+        # one of the list, so other pieces keep their slots. Shared with snapshots like the
+        # containers above: copied before the first write if not owned.
+        self._side_positions: List[List[Position]] = [[], []]
+        self._slots: Dict[Position, int] = {}
+        self._owns_lists = True
+        # Stores king position of each colour (indexed by Colour.value), None if there is no
+        # king.
+        self._kings: List[Optional[Position]] = [None, None]
+        # Stores XOR of Zobrist keys of all pieces on the board.
+        # Updated incrementally on every set/remove.
+        self.zobrist_key = 0
+        # Stores XOR of Zobrist keys of pawns only: the same for all positions with the same
+        # pawn structure. Updated incrementally on every set/remove of a pawn.
+        self.pawn_key = 0
+        # Stores occupied positions of each colour (indexed by Colour.value) as bitboards:
+        # position (x, y) is bit <y * width + x>. Updated incrementally on every set/remove.
+        self._occupancy = [0, 0]
         # Stores board characteristic
-        self.x_corners = {"min": 0, "max": 7}
-        self.y_corners = {"min": 0, "max": 7}
-        self.width = self.x_corners["max"] - self.x_corners["min"] + 1
-        self.height = self.y_corners["max"] - self.y_corners["min"] + 1
+        # Tables of the board size, shared by all boards of that size.
+        self.geometry = BoardGeometry.of(width, height)
+        self.x_corners = {"min": 0, "max": width - 1}
+        self.y_corners = {"min": 0, "max": height - 1}
+        self.width = width
+        self.height = height
 
     # Set a provided piece on a specified position.
     def set_piece(self, pos: Position, piece: Piece) -> None:
-        self.remove_piece(pos)
+        if pos in self._pos_to_piece:
+            self.remove_piece(pos)
 
-        self._piece_to_pos[piece].add(pos)
+        positions = self._piece_to_pos.get(piece) if self._owned_sets is None else None
+        if positions is None:
+            self._prepare_write(piece)
+            positions = self._piece_to_pos[piece]
+        positions.add(pos)
         self._pos_to_piece[pos] = piece
+        data = _PIECE_DATA.get(piece) or _piece_data(piece)
+        if not self._owns_lists:
+            self._copy_lists()
+        side_positions = self._side_positions[data.colour_index]
+        self._slots[pos] = len(side_positions)
+        side_positions.append(pos)
+        if data.is_king:
+            self._kings[data.colour_index] = pos
+        if self._tracks_changes:
+            self._record_change(True, piece, pos)
+        x, y = pos
+        key = data.square_keys[y * Zobrist.MAX_SIDE + x]
+        self.zobrist_key ^= key
+        if data.is_pawn:
+            self.pawn_key ^= key
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._occupancy[data.colour_index] |= 1 << (y * self.width + x)
 
     # Return a piece on a specified position.
     #
@@ -61,8 +163,127 @@ class Board:
     def remove_piece(self, pos) -> None:
         piece_to_remove = self._pos_to_piece.get(pos)
         if piece_to_remove is not None:
+            if self._owned_sets is not None:
+                self._prepare_write(piece_to_remove)
             self._piece_to_pos[piece_to_remove].remove(pos)
             del self._pos_to_piece[pos]
+            data = _PIECE_DATA.get(piece_to_remove) or _piece_data(piece_to_remove)
+            if not self._owns_lists:
+                self._copy_lists()
+            side_positions = self._side_positions[data.colour_index]
+            slot = self._slots.pop(pos)
+            last = side_positions.pop()
+            if last != pos:
+                side_positions[slot] = last
+                self._slots[last] = slot
+            if data.is_king and self._kings[data.colour_index] == pos:
+                self._kings[data.colour_index] = next(
+                    iter(self._piece_to_pos[piece_to_remove]), None
+                )
+            if self._tracks_changes:
+                self._record_change(False, piece_to_remove, pos)
+            x, y = pos
+            key = data.square_keys[y * Zobrist.MAX_SIDE + x]
+            self.zobrist_key ^= key
+            if data.is_pawn:
+                self.pawn_key ^= key
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self._occupancy[data.colour_index] &= ~(1 << (y * self.width + x))
+
+    # Return a snapshot of the board: a board with the same pieces which shares
+    # containers with this one.
+    #
+    # Snapshot costs O(1). Whichever board is written first copies the position
+    # map and only the position sets of the pieces it touches, so a move copies
+    # nothing but what it changes. Boards never write into shared containers,
+    # therefore a snapshot can be read from other threads while the original
+    # board keeps changing.
+    def snapshot(self) -> Board:
+        # The snapshot is a board of the same class which takes over the containers.
+        # pylint: disable=protected-access
+        board = Board.__new__(Board)
+        board._piece_to_pos = self._piece_to_pos
+        board._pos_to_piece = self._pos_to_piece
+        board._owns_squares = False
+        board._owned_sets = set()
+        self._owns_squares = False
+        self._owned_sets = set()
+        board._side_positions = self._side_positions
+        board._slots = self._slots
+        board._owns_lists = False
+        self._owns_lists = False
+        board._kings = list(self._kings)
+        board.zobrist_key = self.zobrist_key
+        board.pawn_key = self.pawn_key
+        board.geometry = self.geometry
+        board._occupancy = list(self._occupancy)
+        board.x_corners = self.x_corners
+        board.y_corners = self.y_corners
+        board.width = self.width
+        board.height = self.height
+        if self._tracks_changes:
+            board._tracks_changes = True
+            if self._chain_length < Board.MAX_CHANGE_CHAIN:
+                board.parent = self
+                board.changes = []
+                board._parent_version = self._version
+                board._chain_length = self._chain_length + 1
+        return board
+
+    # Return the board this one is a snapshot of if it has not changed since the snapshot.
+    #
+    # Pieces of this board = pieces of the base with <changes> applied.
+    def base(self) -> Optional[Board]:
+        # Versions are compared between boards of the same class.
+        # pylint: disable=protected-access
+        if self.parent is None or self.parent._version != self._parent_version:
+            return None
+        return self.parent
+
+    # Store data of an incremental evaluator and drop the link to the parent: the data of
+    # this board is the base for its snapshots now.
+    def set_evaluation_cache(self, data: Any) -> None:
+        self.evaluation_cache = data
+        self.parent = None
+        self.changes = None
+        self._chain_length = 0
+        self._tracks_changes = True
+
+    # Count a change, drop evaluation data and log the change for the evaluator.
+    def _record_change(self, added: bool, piece: Piece, pos: Position) -> None:
+        self._version += 1
+        self.evaluation_cache = None
+        if self.changes is not None:
+            self.changes.append((added, piece, pos))
+
+    # Return bitboard of positions occupied by pieces of both colours.
+    def occupancy(self) -> int:
+        return self._occupancy[0] | self._occupancy[1]
+
+    # Return bitboard of positions occupied by pieces of a specified colour.
+    def colour_occupancy(self, colour: Colour) -> int:
+        return self._occupancy[colour.value]
+
+    # Copy shared containers which are going to be changed for a piece.
+    def _prepare_write(self, piece: Piece) -> None:
+        if not self._owns_squares:
+            self._pos_to_piece = dict(self._pos_to_piece)
+            self._piece_to_pos = dict(self._piece_to_pos)
+            self._owns_squares = True
+        if self._owned_sets is not None and piece not in self._owned_sets:
+            self._piece_to_pos[piece] = set(self._piece_to_pos.get(piece, ()))
+            self._owned_sets.add(piece)
+            # All sets are copied: nothing is shared anymore.
+            if len(self._owned_sets) == len(self._piece_to_pos):
+                self._owned_sets = None
+        elif piece not in self._piece_to_pos:
+            self._piece_to_pos[piece] = set()
+
+    # Copy shared piece lists before changing them.
+    def _copy_lists(self) -> None:
+        self._side_positions = [list(positions) for positions in self._side_positions]
+        self._slots = dict(self._slots)
+        self._owns_lists = True
 
     # Return the position of a specific piece.
     #
@@ -72,21 +293,27 @@ class Board:
 
     # Return positions of a specific piece.
     def get_positions_for_piece(self, piece: Piece) -> List[Position]:
-        return list(self._piece_to_pos[piece])
-
-    # Return all positions for one side
-    def get_positions_for_side(self, colour: Colour):
-        side_positions = []
-        for _, positions in self._piece_to_pos.items():
-            side_positions.extend(
-                [
-                    pos
-                    for pos in positions
-                    if self.get_piece(pos) is not None
-                    and self.get_piece(pos).colour == colour
-                ]
-            )
-        return side_positions
+        return list(self._piece_to_pos.get(piece, ()))
+
+    # Return all positions for one side.
+    #
+    # The list is the piece list of the board, nothing is copied: it must not be changed
+    # and is valid till the next change of the board. Changes of a snapshot do not affect it.
+    def get_positions_for_side(self, colour: Colour) -> List[Position]:
+        return self._side_positions[colour.value]
+
+    # Return slot of the piece on a specified position: its index in the list returned by
+    # get_positions_for_side(). Slot does not change till the piece is removed.
+    #
+    # Method returns None if there is no piece on a specified position.
+    def get_slot(self, pos: Position) -> Optional[int]:
+        return self._slots.get(pos)
+
+    # Return position of the king of a specified colour in O(1).
+    #
+    # Method returns None if there is no king of that colour.
+    def king_position(self, colour: Colour) -> Optional[Position]:
+        return self._kings[colour.value]
 
     # Check if position locates inside board
     @staticmethod
@@ -97,46 +324,20 @@ class Board:
         )
 
     # Create a chess board with a default start position.
+    #
+    # Boards of other sizes get the layout of BoardGeometry: pawns on the second rank from
+    # each side, pieces of BoardGeometry.back_rank behind them.
     @staticmethod
-    def create_start_board() -> Board:
-        board = Board()
-
-        # Set white pieces.
-        board.set_piece(Position(0, 0), Pieces.WHITE_ROOK)
-        board.set_piece(Position(1, 0), Pieces.WHITE_KNIGHT)
-        board.set_piece(Position(2, 0), Pieces.WHITE_BISHOP)
-        board.set_piece(Position(3, 0), Pieces.WHITE_QUEEN)
-        board.set_piece(Position(4, 0), Pieces.WHITE_KING)
-        board.set_piece(Position(5, 0), Pieces.WHITE_BISHOP)
-        board.set_piece(Position(6, 0), Pieces.WHITE_KNIGHT)
-        board.set_piece(Position(7, 0), Pieces.WHITE_ROOK)
-
-        board.set_piece(Position(0, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(1, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(2, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(3, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(4, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(5, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(6, 1), Pieces.WHITE_PAWN)
-        board.set_piece(Position(7, 1), Pieces.WHITE_PAWN)
-
-        # Set black pieces.
-        board.set_piece(Position(0, 7), Pieces.BLACK_ROOK)
-        board.set_piece(Position(1, 7), Pieces.BLACK_KNIGHT)
-        board.set_piece(Position(2, 7), Pieces.BLACK_BISHOP)
-        board.set_piece(Position(3, 7), Pieces.BLACK_QUEEN)
-        board.set_piece(Position(4, 7), Pieces.BLACK_KING)
-        board.set_piece(Position(5, 7), Pieces.BLACK_BISHOP)
-        board.set_piece(Position(6, 7), Pieces.BLACK_KNIGHT)
-        board.set_piece(Position(7, 7), Pieces.BLACK_ROOK)
-
-        board.set_piece(Position(0, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(1, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(2, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(3, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(4, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(5, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(6, 6), Pieces.BLACK_PAWN)
-        board.set_piece(Position(7, 6), Pieces.BLACK_PAWN)
+    def create_start_board(width: int = 8, height: int = 8) -> Board:
+        board = Board(width, height)
+        geometry = board.geometry
+
+        for colour, pawn_shift in [(Colour.WHITE, 1), (Colour.BLACK, -1)]:
+            y = geometry.home_rank(colour)
+            for x, piece_type in enumerate(geometry.back_rank):
+                board.set_piece(Position(x, y), Piece(piece_type, colour))
+                board.set_piece(
+                    Position(x, y + pawn_shift), Piece(PieceType.PAWN, colour)
+                )
 
         return board
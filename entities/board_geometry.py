@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from entities.castling_rights import CastlingRights
+from entities.colour import Colour
+from entities.pieces import PieceType
+from entities.position import Position
+from entities.zobrist import Zobrist
+
+ROOK_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
+KNIGHT_SHIFTS = [(-1, -2), (-1, 2), (1, -2), (1, 2), (-2, -1), (-2, 1), (2, -1), (2, 1)]
+KING_SHIFTS = [
+    (shift_x, shift_y)
+    for shift_x in [-1, 0, 1]
+    for shift_y in [-1, 0, 1]
+    if (shift_x, shift_y) != (0, 0)
+]
+
+Ray = Tuple[Position, ...]
+
+
+class BoardGeometry:
+    """Tables of a board size: neighbours, knight jumps, pawn attacks and rays of every
+    position, castling and start positions.
+
+    Tables are computed once per size: BoardGeometry.of() returns the same instance for every
+    board of that size, so move generation on any size only looks positions up.
+
+    Start position and castling follow standard chess on any width: rooks in the corners,
+    king on file <width // 2>, queen next to it on the left, knights and bishops fill the rest
+    from the rooks inwards. King castles two files towards a rook which lands next to it on
+    the other side. Castling on a wing is possible only if the king target lies strictly
+    between the king and the rook.
+    """
+
+    MIN_SIDE = 4
+    # Zobrist keys are generated for boards up to this side.
+    MAX_SIDE = Zobrist.MAX_SIDE
+
+    def __init__(self, width: int, height: int) -> None:
+        if not (
+            BoardGeometry.MIN_SIDE <= width <= BoardGeometry.MAX_SIDE
+            and BoardGeometry.MIN_SIDE <= height <= BoardGeometry.MAX_SIDE
+        ):
+            raise ValueError(
+                f"Board {width}x{height} is not supported: sides must be between "
+                f"{BoardGeometry.MIN_SIDE} and {BoardGeometry.MAX_SIDE}"
+            )
+        self.width = width
+        self.height = height
+        self.positions = [Position(x, y) for y in range(height) for x in range(width)]
+        self.king_targets = self._jump_table(KING_SHIFTS)
+        self.knight_targets = self._jump_table(KNIGHT_SHIFTS)
+        # Positions attacked by a pawn, indexed by Colour.value.
+        self.pawn_targets = [
+            self._jump_table([(-1, 1), (1, 1)]),
+            self._jump_table([(-1, -1), (1, -1)]),
+        ]
+        self.rook_rays = self._ray_table(ROOK_DIRECTIONS)
+        self.bishop_rays = self._ray_table(BISHOP_DIRECTIONS)
+        self.queen_rays = {
+            pos: self.rook_rays[pos] + self.bishop_rays[pos] for pos in self.positions
+        }
+
+        self.king_start_x = width // 2
+        self.short_rook_x = width - 1
+        self.long_rook_x = 0
+        self.back_rank = self._back_rank()
+        self._lost_castling_rights: Dict[Position, CastlingRights] = {}
+        for y, short_right, long_right in [
+            (0, CastlingRights.WHITE_SHORT, CastlingRights.WHITE_LONG),
+            (height - 1, CastlingRights.BLACK_SHORT, CastlingRights.BLACK_LONG),
+        ]:
+            self._lost_castling_rights[Position(self.king_start_x, y)] = (
+                short_right | long_right
+            )
+            self._lost_castling_rights[Position(self.short_rook_x, y)] = short_right
+            self._lost_castling_rights[Position(self.long_rook_x, y)] = long_right
+
+    @staticmethod
+    def of(width: int, height: int) -> BoardGeometry:
+        """Return geometry of <width>x<height> board. Tables are built on the first call."""
+
+        geometry = _GEOMETRIES.get((width, height))
+        if geometry is None:
+            geometry = _GEOMETRIES[(width, height)] = BoardGeometry(width, height)
+        return geometry
+
+    def is_on_board(self, pos: Position) -> bool:
+        return 0 <= pos.x < self.width and 0 <= pos.y < self.height
+
+    def home_rank(self, colour: Colour) -> int:
+        """Return rank (y) of king and rooks of <colour> side at the start."""
+
+        return 0 if colour == Colour.WHITE else self.height - 1
+
+    def castling_rook_x(self, short: bool) -> int:
+        return self.short_rook_x if short else self.long_rook_x
+
+    def castling_king_x(self, short: bool) -> int:
+        """Return file the king castles to."""
+
+        return self.king_start_x + (2 if short else -2)
+
+    def can_castle(self, short: bool) -> bool:
+        """Check if castling on the wing fits on the board."""
+
+        return (
+            self.castling_king_x(True) < self.short_rook_x
+            if short
+            else self.castling_king_x(False) > self.long_rook_x
+        )
+
+    def castling_rights_lost_by_touching(self, pos: Position) -> CastlingRights:
+        """Return rights lost if a move starts or finishes at <pos>.
+        Touching king start position loses both rights of the side, touching rook start position
+        loses the right on that wing.
+        """
+
+        return self._lost_castling_rights.get(pos, CastlingRights.NONE)
+
+    def _jump_table(
+        self, shifts: List[Tuple[int, int]]
+    ) -> Dict[Position, Tuple[Position, ...]]:
+        return {
+            pos: tuple(
+                Position(pos.x + shift_x, pos.y + shift_y)
+                for shift_x, shift_y in shifts
+                if self.is_on_board(Position(pos.x + shift_x, pos.y + shift_y))
+            )
+            for pos in self.positions
+        }
+
+    def _ray_table(
+        self, directions: List[Tuple[int, int]]
+    ) -> Dict[Position, Tuple[Ray, ...]]:
+        """Return for every position positions along each direction till the edge."""
+
+        table = {}
+        for pos in self.positions:
+            rays = []
+            for shift_x, shift_y in directions:
+                ray = []
+                ray_pos = Position(pos.x + shift_x, pos.y + shift_y)
+                while self.is_on_board(ray_pos):
+                    ray.append(ray_pos)
+                    ray_pos = Position(ray_pos.x + shift_x, ray_pos.y + shift_y)
+                rays.append(tuple(ray))
+            table[pos] = tuple(rays)
+        return table
+
+    def _back_rank(self) -> List[PieceType]:
+        back_rank: List[Optional[PieceType]] = [None] * self.width
+        back_rank[0] = back_rank[-1] = PieceType.ROOK
+        back_rank[self.king_start_x] = PieceType.KING
+        back_rank[self.king_start_x - 1] = PieceType.QUEEN
+        # Knights next to the rooks, bishops next to the knights, and so on inwards.
+        fillers = [PieceType.KNIGHT, PieceType.BISHOP]
+        for distance in range(1, self.width):
+            for x in [distance, self.width - 1 - distance]:
+                if back_rank[x] is None:
+                    back_rank[x] = fillers[(distance - 1) % 2]
+        return back_rank
+
+
+_GEOMETRIES: Dict[Tuple[int, int], BoardGeometry] = {}
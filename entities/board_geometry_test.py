@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+
+import unittest
+
+from entities.board import Board
+from entities.board_geometry import BoardGeometry
+from entities.castling_rights import CastlingRights
+from entities.colour import Colour
+from entities.pieces import PieceType
+from entities.position import Position
+
+
+class TestBoardGeometry(unittest.TestCase):
+    def test_of(self):
+        """Test of of() method: geometry is built once per size."""
+
+        assert BoardGeometry.of(8, 8) is BoardGeometry.of(8, 8)
+        assert BoardGeometry.of(10, 8) is not BoardGeometry.of(8, 8)
+        assert Board().geometry is Board().geometry
+        with self.assertRaises(ValueError):
+            BoardGeometry.of(3, 8)
+        with self.assertRaises(ValueError):
+            BoardGeometry.of(8, BoardGeometry.MAX_SIDE + 1)
+
+    def test_jump_tables(self):
+        """Test of king, knight and pawn tables."""
+
+        geometry = BoardGeometry.of(10, 8)
+        assert len(geometry.king_targets[Position(0, 0)]) == 3
+        assert len(geometry.king_targets[Position(5, 4)]) == 8
+        assert set(geometry.knight_targets[Position(9, 0)]) == {
+            Position(8, 2),
+            Position(7, 1),
+        }
+        assert set(geometry.pawn_targets[Colour.WHITE.value][Position(9, 1)]) == {
+            Position(8, 2)
+        }
+        assert set(geometry.pawn_targets[Colour.BLACK.value][Position(4, 6)]) == {
+            Position(3, 5),
+            Position(5, 5),
+        }
+        assert not geometry.pawn_targets[Colour.WHITE.value][Position(4, 7)]
+
+    def test_ray_tables(self):
+        """Test of rook, bishop and queen rays: ordered from the position to the edge."""
+
+        geometry = BoardGeometry.of(6, 6)
+        rays = geometry.rook_rays[Position(1, 2)]
+        assert rays[0] == (Position(1, 3), Position(1, 4), Position(1, 5))
+        assert rays[3] == (Position(0, 2),)
+        assert sum(len(ray) for ray in rays) == 10
+        assert sum(len(ray) for ray in geometry.bishop_rays[Position(0, 0)]) == 5
+        assert len(geometry.queen_rays[Position(2, 2)]) == 8
+
+    def test_back_rank(self):
+        """Test of back_rank: standard layout on 8 files, the same pattern on others."""
+
+        letters = {
+            PieceType.ROOK: "R",
+            PieceType.KNIGHT: "N",
+            PieceType.BISHOP: "B",
+            PieceType.QUEEN: "Q",
+            PieceType.KING: "K",
+        }
+        for width, expected in [(8, "RNBQKBNR"), (6, "RNQKNR"), (10, "RNBNQKNBNR")]:
+            back_rank = BoardGeometry.of(width, 8).back_rank
+            assert "".join(letters[piece_type] for piece_type in back_rank) == expected
+
+    def test_castling(self):
+        """Test of castling squares and rights lost by touching them."""
+
+        geometry = BoardGeometry.of(10, 8)
+        assert geometry.king_start_x == 5
+        assert geometry.castling_rook_x(True) == 9
+        assert geometry.castling_king_x(False) == 3
+        assert geometry.can_castle(True) and geometry.can_castle(False)
+        assert (
+            geometry.castling_rights_lost_by_touching(Position(9, 7))
+            == CastlingRights.BLACK_SHORT
+        )
+        assert (
+            geometry.castling_rights_lost_by_touching(Position(5, 0))
+            == CastlingRights.WHITE_SHORT | CastlingRights.WHITE_LONG
+        )
+        assert (
+            geometry.castling_rights_lost_by_touching(Position(7, 0))
+            == CastlingRights.NONE
+        )
+        # King on file 3 of 6 castles short to the rook position itself.
+        assert not BoardGeometry.of(6, 6).can_castle(True)
+        assert BoardGeometry.of(6, 6).can_castle(False)
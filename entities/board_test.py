@@ -3,6 +3,7 @@
 import unittest
 
 from entities.board import Board
+from entities.colour import Colour
 from entities.pieces import Pieces
 from entities.position import Position
 
@@ -90,3 +91,83 @@ class TestBoard(unittest.TestCase):
     def test_create_start_board(self):
         start_board = Board.create_start_board()
         assert start_board is not None
+
+    def test_snapshot(self):
+        board = Board.create_start_board()
+        snapshot = board.snapshot()
+        # Changes of the board are not visible in the snapshot and vice versa.
+        board.remove_piece(Position(4, 1))
+        board.set_piece(Position(4, 3), Pieces.WHITE_PAWN)
+        snapshot.set_piece(Position(0, 2), Pieces.BLACK_QUEEN)
+        assert snapshot.get_piece(Position(4, 1)) == Pieces.WHITE_PAWN
+        assert snapshot.get_piece(Position(4, 3)) is None
+        assert board.get_piece(Position(0, 2)) is None
+        assert Position(4, 3) not in snapshot.get_positions_for_piece(Pieces.WHITE_PAWN)
+        assert len(board.get_positions_for_piece(Pieces.WHITE_PAWN)) == 8
+        assert board.get_positions_for_piece(Pieces.BLACK_QUEEN) == [Position(3, 7)]
+        assert snapshot.zobrist_key != board.zobrist_key
+        # Snapshot of a snapshot.
+        second = snapshot.snapshot()
+        second.remove_piece(Position(0, 2))
+        assert snapshot.get_piece(Position(0, 2)) == Pieces.BLACK_QUEEN
+        assert second.zobrist_key == Board.create_start_board().zobrist_key
+
+    def test_snapshot_changes(self):
+        """Test of base() and changes of a snapshot."""
+
+        board = Board.create_start_board()
+        # Changes are not tracked without evaluation data.
+        untracked = board.snapshot()
+        untracked.remove_piece(Position(4, 1))
+        assert untracked.parent is None and untracked.changes is None
+        board.set_evaluation_cache("data")
+        snapshot = board.snapshot()
+        snapshot.remove_piece(Position(4, 1))
+        snapshot.set_piece(Position(4, 3), Pieces.WHITE_PAWN)
+        assert snapshot.base() is board
+        assert snapshot.changes == [
+            (False, Pieces.WHITE_PAWN, Position(4, 1)),
+            (True, Pieces.WHITE_PAWN, Position(4, 3)),
+        ]
+        # Changed parent is not a base any more.
+        board.remove_piece(Position(0, 0))
+        assert snapshot.base() is None
+        # Evaluation data is dropped on change.
+        snapshot.set_evaluation_cache("data")
+        assert snapshot.base() is None
+        snapshot.remove_piece(Position(4, 3))
+        assert snapshot.evaluation_cache is None
+
+    def test_piece_lists(self):
+        """Test of get_positions_for_side(), get_slot() and king_position() methods."""
+
+        board = Board.create_start_board()
+        white = board.get_positions_for_side(Colour.WHITE)
+        assert len(white) == 16
+        assert all(board.get_piece(pos).colour == Colour.WHITE for pos in white)
+        assert board.king_position(Colour.WHITE) == Position(4, 0)
+        assert board.king_position(Colour.BLACK) == Position(4, 7)
+        slots = {pos: board.get_slot(pos) for pos in white}
+        assert [white[slot] for slot in slots.values()] == list(slots)
+        # Removed piece is replaced by the last one, others keep their slots.
+        last = white[-1]
+        board.remove_piece(Position(0, 1))
+        white = board.get_positions_for_side(Colour.WHITE)
+        assert len(white) == 15 and Position(0, 1) not in white
+        assert board.get_slot(Position(0, 1)) is None
+        assert board.get_slot(last) == slots[Position(0, 1)]
+        for pos in white:
+            if pos != last:
+                assert board.get_slot(pos) == slots[pos]
+        # King moves and captures.
+        snapshot = board.snapshot()
+        snapshot.remove_piece(Position(4, 0))
+        snapshot.set_piece(Position(4, 1), Pieces.WHITE_KING)
+        assert snapshot.king_position(Colour.WHITE) == Position(4, 1)
+        assert board.king_position(Colour.WHITE) == Position(4, 0)
+        assert len(board.get_positions_for_side(Colour.WHITE)) == 15
+        assert len(snapshot.get_positions_for_side(Colour.WHITE)) == 14
+        snapshot.set_piece(Position(4, 7), Pieces.WHITE_QUEEN)
+        assert snapshot.king_position(Colour.BLACK) is None
+        assert len(snapshot.get_positions_for_side(Colour.BLACK)) == 15
+        assert len(board.get_positions_for_side(Colour.BLACK)) == 16
@@ -0,0 +1,16 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from enum import IntFlag
+
+
+class CastlingRights(IntFlag):
+    """Bitmask of castling rights which are still available."""
+
+    NONE = 0
+    WHITE_SHORT = 1
+    WHITE_LONG = 2
+    BLACK_SHORT = 4
+    BLACK_LONG = 8
+    ALL = 15
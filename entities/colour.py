@@ -6,6 +6,10 @@ from enum import Enum
 
 
 class Colour(Enum):
+    # Members are singletons compared by identity: identity hash is computed in C, while
+    # Enum.__hash__ hashes the name in Python. Pieces are hashed on every board change.
+    __hash__ = object.__hash__
+
     WHITE = 0
     BLACK = 1
 
@@ -0,0 +1,18 @@
+#!/usr/bin/python3
+
+from enum import Enum
+
+
+class GameStatus(Enum):
+    ONGOING = 0
+    CHECKMATE = 1
+    STALEMATE = 2
+    THREEFOLD_REPETITION = 3
+    FIFTY_MOVE_RULE = 4
+    INSUFFICIENT_MATERIAL = 5
+
+    def is_over(self) -> bool:
+        return self != GameStatus.ONGOING
+
+    def is_draw(self) -> bool:
+        return self not in (GameStatus.ONGOING, GameStatus.CHECKMATE)
@@ -0,0 +1,12 @@
+#!/usr/bin/python3
+
+from enum import Enum
+
+
+class MateStatus(Enum):
+    # Forced mate is found.
+    MATE = 0
+    # It is proven that there is no forced mate within the asked number of moves.
+    NO_MATE = 1
+    # Node budget or time limit ran out before the answer was found.
+    UNKNOWN = 2
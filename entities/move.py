@@ -1,10 +1,78 @@
 #!/usr/bin/python3
 
-from typing import NamedTuple
+from __future__ import annotations
 
+import re
+from typing import NamedTuple, Optional
+
+from entities.pieces import PieceType
 from entities.position import Position
 
+_UCI_MOVE = re.compile(r"([a-z]\d+)([a-z]\d+)([qrbn]?)")
+# Order of promotions in packed moves.
+_PROMOTIONS = [PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT]
+_PROMOTION_LETTERS = {
+    PieceType.QUEEN: "q",
+    PieceType.ROOK: "r",
+    PieceType.BISHOP: "b",
+    PieceType.KNIGHT: "n",
+}
+
 
 class Move(NamedTuple):
     start: Position
     finish: Position
+    # Piece type a pawn is promoted to. None for all other moves.
+    promotion: Optional[PieceType] = None
+
+    @staticmethod
+    def from_uci(text: str) -> Move:
+        """Create move from UCI notation, e.g. 'e2e4' or 'e7e8q'."""
+
+        match = _UCI_MOVE.fullmatch(text)
+        if match is None:
+            raise ValueError(f"Invalid move notation: {text!r}.")
+        promotion = None
+        for piece_type, letter in _PROMOTION_LETTERS.items():
+            if match.group(3) == letter:
+                promotion = piece_type
+        return Move(
+            Position.from_algebraic(match.group(1)),
+            Position.from_algebraic(match.group(2)),
+            promotion,
+        )
+
+    def to_uci(self) -> str:
+        """Return UCI notation of the move, e.g. 'e2e4' or 'e7e8q'."""
+
+        text = self.start.to_algebraic() + self.finish.to_algebraic()
+        if self.promotion is not None:
+            text += _PROMOTION_LETTERS[self.promotion]
+        return text
+
+    def pack(self) -> int:
+        """Pack the move into 19 bits: 4 bits per coordinate, 3 bits of promotion.
+        Coordinates must be less than 16.
+        """
+
+        promotion = (
+            0 if self.promotion is None else _PROMOTIONS.index(self.promotion) + 1
+        )
+        return (
+            self.start.x
+            | self.start.y << 4
+            | self.finish.x << 8
+            | self.finish.y << 12
+            | promotion << 16
+        )
+
+    @staticmethod
+    def unpack(packed: int) -> Move:
+        """Create move packed by pack()."""
+
+        promotion = packed >> 16
+        return Move(
+            Position(packed & 0xF, (packed >> 4) & 0xF),
+            Position((packed >> 8) & 0xF, (packed >> 12) & 0xF),
+            _PROMOTIONS[promotion - 1] if promotion else None,
+        )
@@ -7,6 +7,10 @@ from entities.colour import Colour
 
 
 class PieceType(Enum):
+    # Members are singletons compared by identity: identity hash is computed in C, while
+    # Enum.__hash__ hashes the name in Python. Pieces are hashed on every board change.
+    __hash__ = object.__hash__
+
     KING = 0
     QUEEN = 1
     BISHOP = 2
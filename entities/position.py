@@ -1,8 +1,21 @@
 #!/usr/bin/python3
 
+from __future__ import annotations
+
 from typing import NamedTuple
 
 
 class Position(NamedTuple):
     x: int
     y: int
+
+    @staticmethod
+    def from_algebraic(square: str) -> Position:
+        """Create position from algebraic notation, e.g. 'e2' -> Position(4, 1)."""
+
+        return Position(ord(square[0]) - ord("a"), int(square[1:]) - 1)
+
+    def to_algebraic(self) -> str:
+        """Return algebraic notation of the position, e.g. Position(4, 1) -> 'e2'."""
+
+        return f"{chr(ord('a') + self.x)}{self.y + 1}"
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+from array import array
+from typing import NamedTuple, Optional
+
+from entities.colour import Colour
+from entities.pieces import Piece, Pieces
+from entities.position import Position
+
+
+class Zobrist:
+    """Random 64-bit keys used for incremental position hashing.
+    Position hash = XOR of keys of all (piece, position) pairs on the board plus keys of the
+    game state (turn, castling rights, en passant file). XOR is its own inverse, so setting and
+    removing a piece updates the hash in O(1).
+
+    Keys are built on first use, not on import. If LIGHT_CHESS_CACHE_DIR environment variable is
+    set, keys are loaded from (and on the first run saved to) a versioned file in that directory.
+    """
+
+    # Maximum supported board side. Square index is <y * MAX_SIDE + x>.
+    MAX_SIDE = 16
+    # Bump if the layout or generation of keys changes: old cache files are ignored.
+    VERSION = 1
+    SEED = 0x1C4E55
+    CACHE_DIR_ENV = "LIGHT_CHESS_CACHE_DIR"
+
+    @staticmethod
+    def piece_key(piece: Piece, pos: Position) -> int:
+        """Return key of <piece> standing on <pos>."""
+
+        keys = _keys if _keys is not None else Zobrist.load()
+        return keys.table[keys.piece_offsets[piece] + pos.y * Zobrist.MAX_SIDE + pos.x]
+
+    @staticmethod
+    def piece_square_keys(piece: Piece) -> array:
+        """Return keys of <piece> standing on every position, indexed by
+        <y * MAX_SIDE + x>.
+        """
+
+        keys = _keys if _keys is not None else Zobrist.load()
+        offset = keys.piece_offsets[piece]
+        return keys.table[offset : offset + _SQUARES]
+
+    @staticmethod
+    def turn_key(colour: Colour) -> int:
+        """Return key of side to move. White to move contributes nothing."""
+
+        if colour != Colour.BLACK:
+            return 0
+        keys = _keys if _keys is not None else Zobrist.load()
+        return keys.table[_TURN_OFFSET]
+
+    @staticmethod
+    def castling_key(castling_rights: int) -> int:
+        """Return key of castling rights bitmask (see CastlingRights)."""
+
+        keys = _keys if _keys is not None else Zobrist.load()
+        return keys.table[_CASTLING_OFFSET + castling_rights]
+
+    @staticmethod
+    def en_passant_key(x: int) -> int:
+        """Return key of en passant file <x>."""
+
+        keys = _keys if _keys is not None else Zobrist.load()
+        return keys.table[_EN_PASSANT_OFFSET + x]
+
+    @staticmethod
+    def is_loaded() -> bool:
+        return _keys is not None
+
+    @staticmethod
+    def cache_path(cache_dir: str) -> str:
+        return os.path.join(
+            cache_dir,
+            f"zobrist-v{Zobrist.VERSION}-{Zobrist.SEED:x}-{Zobrist.MAX_SIDE}"
+            f"-{sys.byteorder}.bin",
+        )
+
+    @staticmethod
+    def load(cache_dir: Optional[str] = None) -> _ZobristKeys:
+        """Build keys or load them from <cache_dir> (LIGHT_CHESS_CACHE_DIR by default).
+        Cache file is written if it does not exist or is damaged.
+        """
+
+        global _keys  # pylint: disable=global-statement,invalid-name
+
+        if cache_dir is None:
+            cache_dir = os.environ.get(Zobrist.CACHE_DIR_ENV)
+        table = None
+        if cache_dir:
+            table = _read_table(Zobrist.cache_path(cache_dir))
+        if table is None:
+            table = _generate_table()
+            if cache_dir:
+                _write_table(Zobrist.cache_path(cache_dir), table)
+        _keys = _ZobristKeys(table, _piece_offsets())
+        return _keys
+
+    @staticmethod
+    def unload() -> None:
+        """Forget keys. Next use builds or loads them again."""
+
+        global _keys  # pylint: disable=global-statement,invalid-name
+
+        _keys = None
+
+
+class _ZobristKeys(NamedTuple):
+    # All keys in one flat table: piece-square keys, turn key, castling keys, en passant keys.
+    table: array
+    # Offset of the first piece-square key of each piece in the table.
+    piece_offsets: dict
+
+
+_PIECES_ORDER = [
+    Pieces.WHITE_KING,
+    Pieces.WHITE_QUEEN,
+    Pieces.WHITE_BISHOP,
+    Pieces.WHITE_KNIGHT,
+    Pieces.WHITE_ROOK,
+    Pieces.WHITE_PAWN,
+    Pieces.BLACK_KING,
+    Pieces.BLACK_QUEEN,
+    Pieces.BLACK_BISHOP,
+    Pieces.BLACK_KNIGHT,
+    Pieces.BLACK_ROOK,
+    Pieces.BLACK_PAWN,
+]
+_SQUARES = Zobrist.MAX_SIDE * Zobrist.MAX_SIDE
+_TURN_OFFSET = len(_PIECES_ORDER) * _SQUARES
+_CASTLING_OFFSET = _TURN_OFFSET + 1
+_EN_PASSANT_OFFSET = _CASTLING_OFFSET + 16
+_TABLE_SIZE = _EN_PASSANT_OFFSET + Zobrist.MAX_SIDE
+
+# Keys of this process, set by Zobrist.load(): state, not a constant.
+_keys: Optional[_ZobristKeys] = None  # pylint: disable=invalid-name
+
+
+def _piece_offsets() -> dict:
+    return {piece: index * _SQUARES for index, piece in enumerate(_PIECES_ORDER)}
+
+
+def _generate_table() -> array:
+    # Seed is fixed, so hashes are stable between processes and runs.
+    rng = random.Random(Zobrist.SEED)
+    return array("Q", (rng.getrandbits(64) for _ in range(_TABLE_SIZE)))
+
+
+def _read_table(path: str) -> Optional[array]:
+    table = array("Q")
+    try:
+        with open(path, "rb") as cache_file:
+            table.frombytes(cache_file.read())
+    except (OSError, ValueError):
+        return None
+    return table if len(table) == _TABLE_SIZE else None
+
+
+def _write_table(path: str, table: array) -> None:
+    # Write to a temporary file and rename, so concurrent processes never read a partial file.
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(file_descriptor, "wb") as cache_file:
+            cache_file.write(table.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache is an optimization only.
+        pass
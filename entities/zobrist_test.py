@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+
+import os
+import tempfile
+import unittest
+
+from entities.board import Board
+from entities.pieces import Pieces
+from entities.position import Position
+from entities.zobrist import Zobrist
+
+
+class TestZobrist(unittest.TestCase):
+    def tearDown(self) -> None:
+        Zobrist.unload()
+
+    def test_keys_are_built_lazily(self):
+        Zobrist.unload()
+        assert not Zobrist.is_loaded()
+        key = Zobrist.piece_key(Pieces.WHITE_KING, Position(4, 0))
+        assert Zobrist.is_loaded()
+        # Keys are deterministic.
+        Zobrist.unload()
+        assert Zobrist.piece_key(Pieces.WHITE_KING, Position(4, 0)) == key
+
+    def test_disk_cache(self):
+        expected = Board.create_start_board().zobrist_key
+        with tempfile.TemporaryDirectory() as cache_dir:
+            Zobrist.load(cache_dir)
+            assert os.path.exists(Zobrist.cache_path(cache_dir))
+            # Second load reads the file.
+            Zobrist.load(cache_dir)
+            assert Board.create_start_board().zobrist_key == expected
+            # Damaged file is rebuilt.
+            with open(Zobrist.cache_path(cache_dir), "wb") as cache_file:
+                cache_file.write(b"damaged")
+            Zobrist.load(cache_dir)
+            assert Board.create_start_board().zobrist_key == expected
+            assert os.path.getsize(Zobrist.cache_path(cache_dir)) > len(b"damaged")
+
+    def test_incremental_key(self):
+        board = Board()
+        board.set_piece(Position(1, 2), Pieces.BLACK_BISHOP)
+        board.set_piece(Position(1, 2), Pieces.WHITE_QUEEN)
+        board.set_piece(Position(3, 3), Pieces.WHITE_PAWN)
+        board.remove_piece(Position(3, 3))
+        expected = Board()
+        expected.set_piece(Position(1, 2), Pieces.WHITE_QUEEN)
+        assert board.zobrist_key == expected.zobrist_key
+        board.remove_piece(Position(1, 2))
+        assert board.zobrist_key == 0
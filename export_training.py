@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+
+"""Export positions of games into NumPy training arrays.
+
+Usage:
+    python export_training.py OUTPUT_DIR [FILE] [--shard-size N] [--workers N]
+        [--chunk-size N]
+
+Reads games from FILE (stdin by default), one game per line as UCI moves from the start
+position optionally ended by the result (1-0, 0-1, 1/2-1/2). Empty lines and lines
+starting with '#' are skipped, games with malformed or illegal moves are skipped and
+counted as rejected_games in the manifest. Writes memory-mapped .npy shards and manifest.json into
+OUTPUT_DIR and prints the manifest. Needs NumPy.
+"""
+
+import argparse
+import json
+import sys
+
+from engine.training_export import TrainingExporter
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="directory for shards and manifest")
+    parser.add_argument("file", nargs="?", help="games file, stdin by default")
+    parser.add_argument("--shard-size", type=int, default=65536)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="0 = no pool, default = CPU count"
+    )
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") if args.file else sys.stdin as lines:
+        games = (
+            line.strip()
+            for line in lines
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+        exporter = TrainingExporter(
+            args.output,
+            shard_size=args.shard_size,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        print(json.dumps(exporter.export(games), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,14 @@
 
 import sys
 
-from PyQt5.QtWidgets import QApplication, QMainWindow
-
 
 class LightChessApp(object):
     def run(self) -> None:
+        # PyQt5 is imported here, so importing the module costs nothing for processes
+        # which never show a window.
+        # pylint: disable=import-outside-toplevel
+        from PyQt5.QtWidgets import QApplication, QMainWindow
+
         app = QApplication(sys.argv)
         win = QMainWindow()
         win.setGeometry(400, 400, 300, 300)
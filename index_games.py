@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+
+"""Index positions of a game collection and query games reaching a position.
+
+Usage:
+    python index_games.py INDEX add [FILE] [--workers N] [--chunk-size N]
+    python index_games.py INDEX query FEN [--limit N]
+
+`add` reads games from FILE (stdin by default), one game per line as UCI moves from the
+start position optionally ended by the result (1-0, 0-1, 1/2-1/2). Empty lines, lines
+starting with '#' and games already in INDEX are skipped, games with malformed or illegal
+moves are skipped and counted as rejected. `query` prints JSON with the moves
+played in the position and the games reaching it.
+"""
+
+import argparse
+import json
+import sys
+
+from engine.fen import Fen
+from engine.position_index import PositionIndex
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("index", help="SQLite index file, created if missing")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="index new games")
+    add.add_argument("file", nargs="?", help="games file, stdin by default")
+    add.add_argument(
+        "--workers", type=int, default=None, help="0 = no pool, default = CPU count"
+    )
+    add.add_argument("--chunk-size", type=int, default=64)
+    query = commands.add_parser("query", help="look a position up")
+    query.add_argument("fen", help="FEN of the position")
+    query.add_argument("--limit", type=int, default=20, help="games to list")
+    args = parser.parse_args()
+
+    if args.command == "add":
+        with PositionIndex(
+            args.index, workers=args.workers, chunk_size=args.chunk_size
+        ) as index, (
+            open(args.file, encoding="utf-8") if args.file else sys.stdin
+        ) as lines:
+            games = (line for line in lines if not line.lstrip().startswith("#"))
+            added = index.add_games(games)
+            print(
+                json.dumps(
+                    {
+                        "added": added,
+                        "rejected": index.rejected_games,
+                        "games": len(index),
+                    }
+                )
+            )
+        return 0
+
+    with PositionIndex(args.index) as index:
+        game = Fen.parse(args.fen)
+        hits = index.games_reaching(game)
+        print(
+            json.dumps(
+                {
+                    "games": len(hits),
+                    "moves": [stats.to_dict() for stats in index.move_statistics(game)],
+                    "hits": [hit._asdict() for hit in hits[: args.limit]],
+                },
+                indent=2,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
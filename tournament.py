@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+
+"""Play games between two engine configurations and report the Elo difference.
+
+Usage:
+    python tournament.py [--openings FILE | --seed N] [--games N] [--workers N]
+        [--max-plies N] [--first-depth N] [--second-depth N] [--first-no-quiescence]
+        [--second-no-quiescence] [--sprt ELO0 ELO1]
+
+Every opening is played twice with colours swapped. The openings file (FEN/EPD lines) must
+have a distinct position for every pair of games; by default pairs start from distinct
+positions after four random plies, made with --seed. One JSON object per finished game is
+written to stdout, followed by the report: wins/draws/losses of the first engine, Elo with
+95% error bars, games/sec and nodes/sec.
+With --sprt the run stops as soon as the test accepts H0 (elo <= ELO0) or H1 (elo >= ELO1).
+"""
+
+import argparse
+import itertools
+import json
+import sys
+
+from engine.tournament import (
+    EngineConfig,
+    Sprt,
+    Tournament,
+    load_openings,
+    random_openings,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--openings", help="FEN/EPD file, random openings by default")
+    parser.add_argument("--seed", type=int, default=0, help="seed of random openings")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="0 = no pool, default = CPU count"
+    )
+    parser.add_argument("--max-plies", type=int, default=200)
+    for engine in ["first", "second"]:
+        parser.add_argument(f"--{engine}-depth", type=int, default=2)
+        parser.add_argument(f"--{engine}-no-quiescence", action="store_true")
+    parser.add_argument("--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"))
+    args = parser.parse_args()
+
+    if args.openings:
+        with open(args.openings, encoding="utf-8") as lines:
+            openings = load_openings(lines)
+    else:
+        openings = list(
+            itertools.islice(random_openings(seed=args.seed), (args.games + 1) // 2)
+        )
+    tournament = Tournament(
+        EngineConfig("first", args.first_depth, not args.first_no_quiescence),
+        EngineConfig("second", args.second_depth, not args.second_no_quiescence),
+        openings=openings,
+        workers=args.workers,
+        max_plies=args.max_plies,
+        sprt=Sprt(*args.sprt) if args.sprt else None,
+    )
+    try:
+        for record in tournament.play(args.games):
+            print(json.dumps(record.to_dict()), flush=True)
+    except ValueError as error:
+        parser.error(str(error))
+    print(json.dumps(tournament.report().to_dict()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+#!/usr/bin/python3
+
+"""Run the engine as a UCI engine on stdin/stdout.
+
+Usage:
+    python uci.py
+"""
+
+import sys
+
+from engine.uci import UciEngine
+
+
+def main() -> int:
+    UciEngine().run(sys.stdin)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())